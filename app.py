@@ -4,7 +4,9 @@ import eventlet
 if os.getenv('FAMILY_GAMES_SKIP_EVENTLET_PATCH') != '1':
     eventlet.monkey_patch()
 
-from flask import Flask, redirect, render_template, session, request, copy_current_request_context, url_for, make_response, flash
+from flask import Flask, redirect, render_template, session, request, copy_current_request_context, url_for, make_response, flash, jsonify
+from flask.globals import request_ctx
+from flask.sessions import SecureCookieSession
 from flask_socketio import SocketIO, emit, join_room, leave_room
 import logging
 import json
@@ -12,10 +14,22 @@ import random
 from datetime import datetime, timedelta
 from games.charades.models import CharadesGame
 from games.rapid_fire.models import RapidFireGame
+from games.bus_complete.wordlists import compact_validated_words
 from games.registry import get_game_metadata
+from services.answer_patches import AnswerPatchThrottle
+from services.answer_validation import AnswerValidationService, GroqJudge, VerdictCache
+from services.connection_registry import ConnectionRegistry
 from services.data_manager import DataManager
+from services.data_service import DataService, get_data_service
+from services.fetchers.http_cache import get_http_cache
 from services.game_room_service import GameRoomService
-from services.realtime_sync import RealtimeSyncService
+from services.realtime_sync import PreEncodedJSON, RealtimeSyncService
+from services.room_executor import RoomExecutor
+from services.room_reaper import RoomReaper
+from services.room_scheduler import RoomScheduler
+from services.room_store import create_room_store
+from services.worker_routing import LocalPubSubManager, RoomAffinity, RoomEventForwarder, create_message_bus
+import functools
 import time
 import uuid
 from dotenv import load_dotenv
@@ -48,6 +62,19 @@ app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=5)
 # Push application context
 app.app_context().push()
 
+# Multi-worker mode: each worker owns a share of the rooms, emits travel over the message queue
+WORKER_ID = int(os.getenv('FAMILY_GAMES_WORKER_ID', '0'))
+WORKER_COUNT = int(os.getenv('FAMILY_GAMES_WORKER_COUNT', '1'))
+MESSAGE_QUEUE = os.getenv('FAMILY_GAMES_MESSAGE_QUEUE', '')
+if WORKER_COUNT > 1 and not MESSAGE_QUEUE:
+    raise RuntimeError('FAMILY_GAMES_WORKER_COUNT > 1 requires FAMILY_GAMES_MESSAGE_QUEUE')
+
+queue_options = {}
+if MESSAGE_QUEUE.startswith('local://'):
+    queue_options['client_manager'] = LocalPubSubManager()
+elif MESSAGE_QUEUE:
+    queue_options['message_queue'] = MESSAGE_QUEUE
+
 # Initialize SocketIO
 socketio = SocketIO(
     app,
@@ -55,17 +82,201 @@ socketio = SocketIO(
     cors_allowed_origins="*",
     async_mode='threading' if os.getenv('FAMILY_GAMES_SKIP_EVENTLET_PATCH') == '1' else 'eventlet',
     ping_timeout=15000,
-    ping_interval=25000
+    ping_interval=25000,
+    json=PreEncodedJSON,
+    **queue_options
 )
 
 # Game rooms storage
-game_rooms = {}
-player_sids = {}
+game_rooms = create_room_store(
+    os.getenv('FAMILY_GAMES_ROOM_STORE', 'memory'),
+    # Pending round / buzz / reveal timers are saved with each snapshot
+    timers=lambda gid: {name: left for name, left in room_scheduler.deadlines(gid).items() if name in RESTORABLE_TIMERS},
+)
+# Seconds between periodic snapshots of changed rooms (durable stores only)
+SNAPSHOT_INTERVAL = float(os.getenv('FAMILY_GAMES_SNAPSHOT_INTERVAL', '5'))
+connections = ConnectionRegistry()
 room_service = GameRoomService(game_rooms)
-sync_service = RealtimeSyncService(game_rooms)
+sync_service = RealtimeSyncService(game_rooms, patch_mode=os.getenv('FAMILY_GAMES_STATE_PATCHES', '1') == '1')
+# Bumps within this window share one game_state broadcast; 0 broadcasts on every bump
+STATE_FLUSH_WINDOW = float(os.getenv('FAMILY_GAMES_STATE_FLUSH_MS', '16')) / 1000
+# Pause between revealing an answer and loading the next question
+REVEAL_DELAY_SECONDS = 2
+
+room_executor = RoomExecutor(is_tracked=lambda gid: gid in game_rooms)
+room_affinity = RoomAffinity(WORKER_ID, WORKER_COUNT)
+room_forwarder = RoomEventForwarder(room_affinity, create_message_bus(MESSAGE_QUEUE)) if WORKER_COUNT > 1 else None
+# handler name -> undecorated room handler, for events forwarded from other workers
+room_handlers = {}
+
+def room_task(handler):
+    """Apply a Socket.IO handler through the room's executor, in arrival order.
+
+    Events for rooms owned by another worker are forwarded to that worker.
+    """
+    room_handlers[handler.__name__] = handler
+
+    @functools.wraps(handler)
+    def wrapper(data=None, *args):
+        game_id = (data.get('game_id') or data.get('roomId')) if isinstance(data, dict) else None
+        if not game_id:
+            return handler(data, *args)
+        if room_forwarder and not room_affinity.is_local(game_id):
+            room_forwarder.forward_event(game_id, handler.__name__, [data, *args], request.sid, request.namespace, dict(session))
+            return
+        return room_executor.run(str(game_id), handler, data, *args)
+    return wrapper
+
+def run_forwarded_event(message):
+    """Replay an event another worker received for one of our rooms."""
+    handler = room_handlers.get(message['handler'])
+    if not handler:
+        return
+    with app.test_request_context('/'):
+        request_ctx.session = SecureCookieSession(message['session'])
+        request.sid = message['sid']
+        request.namespace = message['namespace']
+        room_executor.run(message['game_id'], handler, *message['args'])
+        if dict(session) != message['session']:
+            room_forwarder.send_session(message['origin'], message['sid'], message['namespace'], dict(session))
+
+def apply_forwarded_session(message):
+    environ = socketio.server.get_environ(message['sid'], namespace=message['namespace'])
+    if environ and 'saved_session' in environ:
+        environ['saved_session'].clear()
+        environ['saved_session'].update(message['session'])
+
+def get_room_summary(game_id):
+    """Who is in a room and what it plays, wherever the room lives."""
+    game_id = str(game_id)
+    if room_forwarder and not room_affinity.is_local(game_id):
+        return room_forwarder.query(game_id, 'room_summary')
+    game_obj = game_rooms.get(game_id)
+    if not game_obj:
+        return None
+    return {'game_type': game_obj.game_type, 'host': game_obj.host, 'players': [p['name'] for p in game_obj.players]}
+
+if room_forwarder:
+    socketio.start_background_task(
+        room_forwarder.serve,
+        lambda message: socketio.start_background_task(run_forwarded_event, message),
+        apply_forwarded_session,
+        {'room_summary': get_room_summary},
+    )
+
+def run_room_timer(game_id, callback, *args):
+    # Timers fire on their own greenlet and queue behind the room's pending events
+    def task():
+        with app.app_context():
+            room_executor.run(game_id, callback, *args)
+    socketio.start_background_task(task)
+
+room_scheduler = RoomScheduler(socketio.sleep, socketio.start_background_task, dispatch=run_room_timer)
+
+def snapshot_rooms_periodically():
+    while True:
+        socketio.sleep(SNAPSHOT_INTERVAL)
+        try:
+            game_rooms.flush()
+        except Exception as e:
+            logger.warning(f"Room snapshot flush failed: {e}")
+
+if os.getenv('FAMILY_GAMES_ROOM_STORE', 'memory') != 'memory':
+    socketio.start_background_task(snapshot_rooms_periodically)
+
+# Bus Complete answers from every room share AI requests and a persistent verdict cache
+answer_validator = AnswerValidationService(
+    GroqJudge(),
+    VerdictCache(),
+    socketio.start_background_task,
+    sleep=socketio.sleep,
+    window=float(os.getenv('FAMILY_GAMES_AI_BATCH_MS', '250')) / 1000,
+    # Keep the HTTP call and JSON parsing off the event loop
+    run_blocking=None if os.getenv('FAMILY_GAMES_SKIP_EVENTLET_PATCH') == '1' else eventlet.tpool.execute,
+)
+
+def request_ai_verdicts(game_obj):
+    """Attach cached AI verdicts now (before the state goes out); queue the rest."""
+    pairs = game_obj.ai_validation_pairs()
+    if not pairs:
+        return
+    gid = game_obj.game_id
+    cached = answer_validator.submit(pairs, lambda verdicts: run_room_timer(gid, apply_ai_verdicts, gid, verdicts))
+    game_obj.apply_ai_verdicts(cached)
+
+def apply_ai_verdicts(game_id, verdicts):
+    game_obj = game_rooms.get(str(game_id))
+    if not game_obj or game_obj.game_type != 'bus_complete':
+        return
+    changed = game_obj.apply_ai_verdicts(verdicts)
+    if not changed:
+        return
+    statuses = game_obj.get_all_validation_statuses()
+    for answer_key in changed:
+        socketio.emit('validation_updated', {'answer_key': answer_key, 'status': statuses[answer_key]}, to=game_obj.game_id)
+    sync_service.bump_game_version(game_obj)
+
+# Seconds between folding the validated-words journal into validated_words.json
+WORDS_COMPACT_INTERVAL = float(os.getenv('FAMILY_GAMES_WORDS_COMPACT_INTERVAL', '300'))
+
+def compact_validated_words_periodically():
+    while True:
+        socketio.sleep(WORDS_COMPACT_INTERVAL)
+        try:
+            compact_validated_words()
+        except Exception as e:
+            logger.warning(f"Validated words compaction failed: {e}")
+
+socketio.start_background_task(compact_validated_words_periodically)
+
+# Seconds between writing served-item usage back to SQLite, and between
+# reloading the in-memory item pools from it
+ITEM_USAGE_FLUSH_INTERVAL = float(os.getenv('FAMILY_GAMES_ITEM_FLUSH_INTERVAL', '2'))
+ITEM_POOL_REFRESH_INTERVAL = float(os.getenv('FAMILY_GAMES_ITEM_POOL_REFRESH', '60'))
+
+def maintain_item_pool():
+    item_pool = get_data_service().item_pool
+    try:
+        item_pool.warm(DataService.GAME_TYPES)
+    except Exception as e:
+        logger.warning(f"Item pool warm-up failed: {e}")
+    last_refresh = time.monotonic()
+    while True:
+        socketio.sleep(ITEM_USAGE_FLUSH_INTERVAL)
+        try:
+            item_pool.flush_usage()
+            if time.monotonic() - last_refresh >= ITEM_POOL_REFRESH_INTERVAL:
+                last_refresh = time.monotonic()
+                item_pool.refresh()
+        except Exception as e:
+            logger.warning(f"Item pool maintenance failed: {e}")
+
+socketio.start_background_task(maintain_item_pool)
+
+# Item-cache refills run on a background task between these watermarks
+# (items per game type and category); a room that runs out waits at most
+# FAMILY_GAMES_PREFETCH_WAIT_MS for the refill
+get_data_service().configure_prefetch(
+    spawn=socketio.start_background_task,
+    low=int(os.getenv('FAMILY_GAMES_PREFETCH_LOW', str(DataManager.REFETCH_THRESHOLD))),
+    high=int(os.getenv('FAMILY_GAMES_PREFETCH_HIGH', '60')),
+    wait_timeout=float(os.getenv('FAMILY_GAMES_PREFETCH_WAIT_MS', '3000')) / 1000,
+)
 
-def get_player_sid(player_name):
-    return player_sids.get(player_name)
+# Seconds between checking the in-memory cache-status counters against the database
+CACHE_RECONCILE_INTERVAL = float(os.getenv('FAMILY_GAMES_CACHE_RECONCILE_INTERVAL', '300'))
+
+def reconcile_cache_status_periodically():
+    while True:
+        socketio.sleep(CACHE_RECONCILE_INTERVAL)
+        try:
+            drift = get_data_service().data_manager.reconcile_cache_status()
+            if drift:
+                logger.info(f"Cache status counters drifted: {drift}")
+        except Exception as e:
+            logger.warning(f"Cache status reconciliation failed: {e}")
+
+socketio.start_background_task(reconcile_cache_status_periodically)
 
 def bump_and_emit_game_state(game_id):
     game_obj = game_rooms.get(str(game_id))
@@ -74,13 +285,148 @@ def bump_and_emit_game_state(game_id):
     sync_service.bump_game_version(game_obj)
     emit_game_state(game_id)
 
+def discard_room(game_id):
+    game_obj = game_rooms.pop(str(game_id), None)
+    if game_obj and hasattr(game_obj, 'data_service'):
+        # Cleanup data service cache for this room
+        game_obj.data_service.cleanup_room(str(game_id))
+    sync_service.forget_room(game_id)
+    connections.forget_room(game_id)
+    room_scheduler.cancel(game_id)
+    room_executor.forget_room(game_id)
+    answer_patches.forget_room(str(game_id))
+
+def close_idle_room(game_id):
+    # Events queued ahead of the eviction may have brought the room back to life
+    if not room_reaper.still_idle(str(game_id)):
+        return False
+    socketio.emit('room_closed', {'message': 'تم إغلاق الغرفة لعدم النشاط'}, to=str(game_id))
+    discard_room(game_id)
+    return True
+
+# Abandoned rooms are evicted after ROOM_TTL seconds without a state change, or
+# least recently used first once the room count / memory budget is exceeded
+ROOM_TTL = float(os.getenv('FAMILY_GAMES_ROOM_TTL', '3600'))
+REAP_INTERVAL = float(os.getenv('FAMILY_GAMES_REAP_INTERVAL', '60'))
+room_reaper = RoomReaper(
+    game_rooms,
+    lambda gid: room_executor.run(gid, close_idle_room, gid),
+    ttl_seconds=ROOM_TTL,
+    max_rooms=int(os.getenv('FAMILY_GAMES_MAX_ROOMS', '0')),
+    max_bytes=int(float(os.getenv('FAMILY_GAMES_ROOM_MEMORY_MB', '0')) * 1024 * 1024),
+    owns=room_affinity.is_local,
+)
+
+def reap_rooms_periodically():
+    while True:
+        socketio.sleep(REAP_INTERVAL)
+        try:
+            with app.app_context():
+                room_reaper.sweep()
+        except Exception as e:
+            logger.warning(f"Room reaper sweep failed: {e}")
+
+socketio.start_background_task(reap_rooms_periodically)
+
+def start_round_timer(game_obj, default_limit):
+    """Announce the round timer to the room and arm its server-side expiry."""
+    limit = game_obj.settings.get('time_limit', default_limit)
+    socketio.emit('timer_start', {'duration': limit}, to=game_obj.game_id)
+    room_scheduler.schedule(game_obj.game_id, 'round', limit, expire_round, game_obj.game_id)
+
+def schedule_next_question(game_obj):
+    """Leave the revealed answer on screen, then advance trivia / rapid fire."""
+    room_scheduler.cancel(game_obj.game_id, 'round')
+    room_scheduler.cancel(game_obj.game_id, 'buzz')
+    room_scheduler.schedule(game_obj.game_id, 'advance', REVEAL_DELAY_SECONDS, advance_question, game_obj.game_id)
+
+def advance_question(game_id):
+    game_obj = game_rooms.get(str(game_id))
+    if not game_obj:
+        return
+    if game_obj.game_type == 'rapid_fire':
+        game_obj.next_question()
+    else:
+        game_obj.next_round()
+    start_round_timer(game_obj, 30)
+    bump_and_emit_game_state(game_obj.game_id)
+
+def expire_round(game_id):
+    """The room's round timer ran out."""
+    game_obj = game_rooms.get(str(game_id))
+    if not game_obj:
+        return
+    gid = game_obj.game_id
+    if game_obj.game_type in ['charades', 'pictionary']:
+        socketio.emit('reveal_item', game_obj.current_item, to=gid)
+        game_obj.next_round(game_obj.get_item())
+        game_obj.status = 'playing'
+        socketio.emit('round_timeout', {'next_player': game_obj.current_player, 'game_status': game_obj.status}, to=gid)
+        emit_private_state(gid, game_obj.current_player)
+        if game_obj.game_type == 'pictionary':
+            game_obj.clear_canvas()
+            socketio.emit('clear_canvas', to=gid)
+    elif game_obj.game_type == 'rapid_fire':
+        # Reveal the answer now; the next question follows after the reveal delay
+        if game_obj.current_question:
+            correct_ans = game_obj.current_question['options'][game_obj.current_question['answer']]
+            socketio.emit('question_timeout', {'correct_answer': correct_ans}, to=gid)
+        game_obj.question_timeout()
+        socketio.emit('round_timeout', {'game_status': game_obj.status}, to=gid)
+        schedule_next_question(game_obj)
+    elif game_obj.game_type == 'riddles':
+        if game_obj.riddle_active:
+            socketio.emit('riddle_skipped', game_obj.skip_riddle(), to=gid)
+        socketio.emit('round_timeout', {'game_status': game_obj.status}, to=gid)
+    elif game_obj.game_type == 'trivia':
+        game_obj.next_round()
+        socketio.emit('round_timeout', {'game_status': game_obj.status}, to=gid)
+        start_round_timer(game_obj, 30)
+    else:
+        return
+
+    bump_and_emit_game_state(gid)
+
+def expire_buzz(game_id):
+    """The buzzed rapid fire player ran out of time to answer."""
+    game_obj = game_rooms.get(str(game_id))
+    if not game_obj or game_obj.game_type != 'rapid_fire' or not game_obj.buzzed_player:
+        return
+    gid = game_obj.game_id
+    timed_out_player = game_obj.buzzed_player
+    game_obj.buzz_timeout()
+    socketio.emit('buzz_timed_out', {'player': timed_out_player}, to=gid)
+
+    if not game_obj.question_active:
+        correct_ans = game_obj.current_question['options'][game_obj.current_question['answer']]
+        socketio.emit('all_buzzed_wrong', {
+            'message': 'كل اللاعبين جاوبوا غلط!',
+            'correct_answer': correct_ans
+        }, to=gid)
+        schedule_next_question(game_obj)
+
+    bump_and_emit_game_state(gid)
+
+# Timers saved with room snapshots; a restored room's pending ones are re-armed
+RESTORABLE_TIMERS = {'round': expire_round, 'buzz': expire_buzz, 'advance': advance_question}
+
+def rearm_room_timers(game_obj, timers):
+    for name, left in timers.items():
+        if name in RESTORABLE_TIMERS:
+            room_scheduler.schedule(game_obj.game_id, name, left, RESTORABLE_TIMERS[name], game_obj.game_id)
+
+# Each worker restores only the rooms it owns; the others restore theirs
+restored_rooms = game_rooms.restore(accept=room_affinity.is_local, rearm=rearm_room_timers)
+if restored_rooms:
+    logger.info(f"Restored {restored_rooms} room(s) from snapshots")
+
 def emit_private_state(game_id, player_name, sid=None):
     private_state = sync_service.build_private_state(game_id, player_name)
     if not private_state:
         return
-    target_sid = sid or get_player_sid(player_name)
+    target_sid = sid or connections.sid_for(game_id, player_name)
     if target_sid:
-        emit(private_state['event'], private_state['payload'], room=target_sid)
+        socketio.emit(private_state['event'], private_state['payload'], to=target_sid)
 
 @app.before_request
 def make_session_permanent():
@@ -92,29 +438,49 @@ def index():
         game_type: get_game_metadata(game_type) for game_type in ['charades', 'pictionary', 'trivia', 'rapid_fire', 'twenty_questions', 'riddles', 'bus_complete']
     }.items()})
 
+@app.route('/metrics/rooms')
+def room_metrics():
+    metrics = {**room_reaper.stats(), 'connections': len(connections), 'executor': room_executor.stats()}
+    if room_forwarder:
+        metrics['forwarding'] = room_forwarder.stats()
+    return jsonify(metrics)
+
+@app.route('/metrics/cache')
+def cache_metrics():
+    """Cached item counters; ?reconcile=1 checks them against the database first."""
+    data_manager = get_data_service().data_manager
+    if request.args.get('reconcile') == '1':
+        data_manager.reconcile_cache_status()
+    return jsonify({
+        **data_manager.cache_status_report(),
+        'prefetch': get_data_service().prefetcher.stats(),
+        'http_cache': get_http_cache().stats(),
+        'translation': get_data_service().trivia_fetcher.translator.stats(),
+    })
+
 @app.route('/game/<game_id>')
 def game(game_id):
     try:
         game_id = str(game_id)
-        if game_id not in game_rooms:
+        room = get_room_summary(game_id)
+        if not room:
             flash('الغرفة غير موجودة', 'error')
             return redirect(url_for('index'))
             
-        game_obj = game_rooms[game_id]
         player_name = request.args.get('player_name') or session.get('player_name')
         
-        if not player_name or not any(p['name'] == player_name for p in game_obj.players):
+        if not player_name or player_name not in room['players']:
             flash('انت مش في اللعبة دي', 'error')
             return redirect(url_for('index'))
             
         session['game_id'] = game_id
         session['player_name'] = player_name
-        session['is_host'] = (game_obj.host == player_name)
+        session['is_host'] = (room['host'] == player_name)
         
         return render_template('game.html', 
                             game_id=game_id,
                             player_name=player_name,
-                            game_type=game_obj.game_type,
+                            game_type=room['game_type'],
                             is_host=session['is_host'],
                             player_type='host' if session['is_host'] else 'guest')
     except Exception as e:
@@ -124,10 +490,17 @@ def game(game_id):
 @socketio.on('connect')
 def handle_connect():
     player_name = session.get('player_name')
-    if player_name:
-        player_sids[player_name] = request.sid
+    game_id = session.get('game_id')
+    if player_name and game_id and room_affinity.is_local(game_id):
+        connections.bind(request.sid, game_id, player_name)
+
+@socketio.on('disconnect')
+def handle_disconnect(*args):
+    # Players stay in their room (a refresh reconnects); only the socket goes
+    connections.unbind(request.sid)
 
 @socketio.on('create_game')
+@room_task
 def handle_create_game(data):
     try:
         game_id = str(data.get('game_id'))
@@ -143,6 +516,7 @@ def handle_create_game(data):
         session['game_id'] = game_id
         session['player_name'] = player_name
         session['is_host'] = True
+        connections.bind(request.sid, game_id, player_name)
         
         preview = room_service.get_room_preview(game_id)
         emit('game_created', {'game_id': game_id, 'host': player_name, 'players': game_obj.players, 'preview': preview})
@@ -151,15 +525,19 @@ def handle_create_game(data):
         emit('error', {'message': str(e)})
 
 @socketio.on('preview_room')
+@room_task
 def handle_preview_room(data):
     try:
         game_id = str(data.get('game_id'))
-        preview = room_service.get_room_preview(game_id)
+        preview = sync_service.get_encoded_room_preview(game_id, room_service.get_room_preview)
+        if preview is None:
+            raise ValueError('الغرفة غير موجودة')
         emit('room_preview', preview)
     except Exception as e:
         emit('error', {'message': str(e)})
 
 @socketio.on('join_game')
+@room_task
 def handle_join_game(data):
     try:
         game_id = str(data['game_id'])
@@ -169,6 +547,7 @@ def handle_join_game(data):
         session['game_id'] = game_id
         session['player_name'] = player_name
         session['is_host'] = False
+        connections.bind(request.sid, game_id, player_name)
         join_room(game_id)
         preview = room_service.get_room_preview(game_id)
         emit('join_success', {'game_id': game_id, 'players': game_obj.players, 'host': game_obj.host, 'preview': preview})
@@ -178,6 +557,7 @@ def handle_join_game(data):
         emit('error', {'message': str(e)})
 
 @socketio.on('start_game')
+@room_task
 def handle_start_game(data):
     try:
         game_id = str(data['game_id'])
@@ -208,26 +588,27 @@ def handle_start_game(data):
                 }, room=game_id)
             elif game_obj.game_type == 'riddles':
                 emit('riddles_started', {}, room=game_id)
-                emit('timer_start', {'duration': game_obj.settings.get('time_limit', 60)}, room=game_id)
+                start_round_timer(game_obj, 60)
 
             # Start timer for question-based games after redirect
             if game_obj.game_type in ['trivia', 'rapid_fire']:
-                emit('timer_start', {'duration': game_obj.settings.get('time_limit', 30)}, room=game_id)
+                start_round_timer(game_obj, 30)
     except Exception as e:
         emit('error', {'message': str(e)})
 
 @socketio.on('player_ready')
+@room_task
 def handle_player_ready(data):
     game_obj = game_rooms.get(str(data.get('game_id')))
     if game_obj and game_obj.game_type != 'trivia' and game_obj.current_player == session.get('player_name'):
         game_obj.status = 'round_active'
         if hasattr(game_obj, 'start_round_timer'): game_obj.start_round_timer()
         emit('force_reset_timer', {'current_player': game_obj.current_player, 'game_status': game_obj.status}, room=game_obj.game_id)
-        limit = game_obj.settings.get('time_limit', 90)
-        emit('timer_start', {'duration': limit}, room=game_obj.game_id)
+        start_round_timer(game_obj, 90)
         bump_and_emit_game_state(game_obj.game_id)
 
 @socketio.on('guess_correct')
+@room_task
 def handle_guess_correct(data):
     game_obj = game_rooms.get(str(data.get('game_id')))
     guesser = data.get('player_name')
@@ -242,6 +623,7 @@ def handle_guess_correct(data):
                 if p1: game_obj.team_scores[str(p1['team'])] += points
                 if p2: game_obj.team_scores[str(p2['team'])] += points
 
+        room_scheduler.cancel(game_obj.game_id, 'round')
         game_obj.next_round(game_obj.get_item())
         game_obj.status = 'playing'
         emit('correct_guess', {'guesser': guesser, 'performer': game_obj.current_player}, room=game_obj.game_id)
@@ -254,6 +636,7 @@ def handle_guess_correct(data):
         emit_private_state(game_obj.game_id, game_obj.current_player)
 
 @socketio.on('submit_answer')
+@room_task
 def handle_submit_answer(data):
     game_obj = game_rooms.get(str(data.get('game_id')))
     ans_idx = int(data.get('answer_idx'))
@@ -276,9 +659,7 @@ def handle_submit_answer(data):
             }, room=game_obj.game_id)
 
             # Move to next question after a short delay for everyone to see result
-            eventlet.sleep(2)
-            game_obj.next_round()
-            emit('timer_start', {'duration': game_obj.settings.get('time_limit', 30)}, room=game_obj.game_id)
+            schedule_next_question(game_obj)
             bump_and_emit_game_state(game_obj.game_id)
         else:
             # Track wrong answer
@@ -296,58 +677,26 @@ def handle_submit_answer(data):
             if len(game_obj.players_answered_wrong) == total_players:
                 # All players answered wrong, move to next question without revealing answer
                 game_obj.question_active = False
-                eventlet.sleep(2)
-                game_obj.next_round()
                 emit('all_wrong', {'message': 'كل اللاعبين جاوبوا غلط! السؤال التالي...'}, room=game_obj.game_id)
-                emit('timer_start', {'duration': game_obj.settings.get('time_limit', 30)}, room=game_obj.game_id)
+                schedule_next_question(game_obj)
                 bump_and_emit_game_state(game_obj.game_id)
 
-@socketio.on('round_timeout')
-def handle_round_timeout(data):
-    game_obj = game_rooms.get(str(data.get('game_id')))
-    if game_obj:
-        if game_obj.game_type in ['charades', 'pictionary']:
-            emit('reveal_item', game_obj.current_item, room=game_obj.game_id)
-            game_obj.next_round(game_obj.get_item())
-            game_obj.status = 'playing'
-            emit('round_timeout', {'next_player': game_obj.current_player, 'game_status': game_obj.status}, room=game_obj.game_id)
-            emit_private_state(game_obj.game_id, game_obj.current_player)
-            if game_obj.game_type == 'pictionary':
-                game_obj.clear_canvas()
-                emit('clear_canvas', room=game_obj.game_id)
-        elif game_obj.game_type == 'rapid_fire':
-            # Rapid Fire question timeout — reveal answer and move on
-            if game_obj.current_question:
-                correct_ans = game_obj.current_question['options'][game_obj.current_question['answer']]
-                emit('question_timeout', {
-                    'correct_answer': correct_ans
-                }, room=game_obj.game_id)
-            game_obj.question_timeout()
-            eventlet.sleep(2)
-            game_obj.next_question()
-            emit('round_timeout', {'game_status': game_obj.status}, room=game_obj.game_id)
-            emit('timer_start', {'duration': game_obj.settings.get('time_limit', 30)}, room=game_obj.game_id)
-        else:
-            # Trivia timeout
-            game_obj.next_round()
-            emit('round_timeout', {'game_status': game_obj.status}, room=game_obj.game_id)
-            emit('timer_start', {'duration': game_obj.settings.get('time_limit', 30)}, room=game_obj.game_id)
-
-        bump_and_emit_game_state(game_obj.game_id)
-
 @socketio.on('player_passed')
+@room_task
 def handle_player_passed(data):
     game_obj = game_rooms.get(str(data.get('game_id')))
     if game_obj and game_obj.game_type != 'trivia' and game_obj.current_player == session.get('player_name'):
         handle_turn_skip(game_obj, session.get('player_name'))
 
 @socketio.on('force_next_turn')
+@room_task
 def handle_force_next_turn(data):
     game_obj = game_rooms.get(str(data.get('game_id')))
     if game_obj and game_obj.host == session.get('player_name'):
         handle_turn_skip(game_obj, "المضيف")
 
 def handle_turn_skip(game_obj, skipper_name):
+    room_scheduler.cancel(game_obj.game_id, 'round')
     if game_obj.game_type in ['charades', 'pictionary']:
         emit('reveal_item', game_obj.current_item, room=game_obj.game_id)
         item = game_obj.get_item()
@@ -362,30 +711,36 @@ def handle_turn_skip(game_obj, skipper_name):
         # Trivia forced next
         game_obj.next_round()
         emit('pass_turn', {'player': skipper_name, 'game_status': game_obj.status}, room=game_obj.game_id)
-        emit('timer_start', {'duration': game_obj.settings.get('time_limit', 30)}, room=game_obj.game_id)
+        start_round_timer(game_obj, 30)
         
     sync_service.bump_game_version(game_obj)
     emit_game_state(game_obj.game_id)
 
 @socketio.on('draw')
+@room_task
 def handle_draw(data):
     rid = str(data.get('game_id'))
     game_obj = game_rooms.get(rid)
     if game_obj and game_obj.game_type == 'pictionary' and game_obj.current_player == session.get('player_name'):
         game_obj.add_stroke(data['stroke'])
+        # Strokes are not part of the broadcast state; mark the room for the next snapshot
+        game_rooms.touch(game_obj)
         emit('draw', data['stroke'], room=rid, include_self=False)
 
 @socketio.on('clear_canvas')
+@room_task
 def handle_clear_canvas(data):
     rid = str(data.get('game_id'))
     game_obj = game_rooms.get(rid)
     if game_obj and game_obj.game_type == 'pictionary' and game_obj.current_player == session.get('player_name'):
         game_obj.clear_canvas()
+        game_rooms.touch(game_obj)
         emit('clear_canvas', room=rid)
 
 # ── Twenty Questions Events ────────────────────────────────────────────
 
 @socketio.on('set_secret_word')
+@room_task
 def handle_set_secret_word(data):
     """Thinker sets the secret word."""
     game_id = str(data.get('game_id'))
@@ -403,6 +758,7 @@ def handle_set_secret_word(data):
                 emit('error', {'message': 'لا يمكنك تحديد الكلمة الآن'})
 
 @socketio.on('ask_question')
+@room_task
 def handle_ask_question(data):
     """Player asks a yes/no question."""
     game_id = str(data.get('game_id'))
@@ -419,10 +775,12 @@ def handle_ask_question(data):
                     'question_number': game_obj.question_count
                 }, room=game_id)
                 emit('waiting_for_answer', {'question': question}, room=game_id)
+                sync_service.bump_game_version(game_obj)
             else:
                 emit('error', {'message': 'لا يمكنك طرح سؤال الآن'})
 
 @socketio.on('answer_question')
+@room_task
 def handle_answer_question(data):
     """Thinker answers the latest question."""
     game_id = str(data.get('game_id'))
@@ -453,6 +811,7 @@ def handle_answer_question(data):
                 emit('error', {'message': 'لا يمكنك الإجابة الآن'})
 
 @socketio.on('make_guess')
+@room_task
 def handle_make_guess(data):
     """Player makes a final guess."""
     game_id = str(data.get('game_id'))
@@ -480,6 +839,7 @@ def handle_make_guess(data):
             bump_and_emit_game_state(game_id)
 
 @socketio.on('twenty_questions_next_round')
+@room_task
 def handle_twenty_questions_next_round(data):
     """Host moves to next round."""
     game_id = str(data.get('game_id'))
@@ -500,6 +860,7 @@ def handle_twenty_questions_next_round(data):
 # ── Riddles Events ───────────────────────────────────────────────────
 
 @socketio.on('submit_riddle_answer')
+@room_task
 def handle_submit_riddle_answer(data):
     """Player submits an answer to the riddle."""
     game_id = str(data.get('game_id'))
@@ -518,9 +879,14 @@ def handle_submit_riddle_answer(data):
             }, room=game_id)
 
             if result['correct']:
+                room_scheduler.cancel(game_id, 'round')
                 bump_and_emit_game_state(game_id)
+            else:
+                # players_answered changed; keep the cached public state in step
+                sync_service.bump_game_version(game_obj)
 
 @socketio.on('reveal_hint')
+@room_task
 def handle_reveal_hint(data):
     """Reveal a hint for the current riddle."""
     game_id = str(data.get('game_id'))
@@ -529,12 +895,14 @@ def handle_reveal_hint(data):
         if game_obj.game_type == 'riddles':
             hint = game_obj.reveal_hint()
             if hint:
+                sync_service.bump_game_version(game_obj)
                 emit('hint_revealed', {
                     'hint': hint,
                     'hints_remaining': 3 - game_obj.hints_revealed
                 }, room=game_id)
 
 @socketio.on('skip_riddle')
+@room_task
 def handle_skip_riddle(data):
     """Skip the current riddle."""
     game_id = str(data.get('game_id'))
@@ -545,10 +913,12 @@ def handle_skip_riddle(data):
         if (game_obj.game_type == 'riddles' and
             game_obj.host == player_name):
             result = game_obj.skip_riddle()
+            room_scheduler.cancel(game_id, 'round')
             emit('riddle_skipped', result, room=game_id)
             bump_and_emit_game_state(game_id)
 
 @socketio.on('next_riddle')
+@room_task
 def handle_next_riddle(data):
     """Host moves to next riddle."""
     game_id = str(data.get('game_id'))
@@ -560,12 +930,13 @@ def handle_next_riddle(data):
             game_obj.host == player_name):
             game_obj.next_riddle()
             emit('new_riddle', {}, room=game_id)
-            emit('timer_start', {'duration': game_obj.settings.get('time_limit', 60)}, room=game_id)
+            start_round_timer(game_obj, 60)
             bump_and_emit_game_state(game_id)
 
 # ── Rapid Fire Events ─────────────────────────────────────────────────
 
 @socketio.on('buzz_in')
+@room_task
 def handle_buzz_in(data):
     """Handle player buzzing in for Rapid Fire."""
     game_id = str(data.get('game_id'))
@@ -578,11 +949,13 @@ def handle_buzz_in(data):
                     'player': player_name,
                     'buzz_timeout': RapidFireGame.BUZZ_TIMEOUT_SECONDS
                 }, room=game_id)
+                room_scheduler.schedule(game_id, 'buzz', RapidFireGame.BUZZ_TIMEOUT_SECONDS, expire_buzz, game_id)
                 bump_and_emit_game_state(game_id)
             else:
                 emit('buzz_rejected', {'message': 'لا يمكنك الضغط الآن'})
 
 @socketio.on('submit_buzz_answer')
+@room_task
 def handle_submit_buzz_answer(data):
     """Handle answer from the buzzed player in Rapid Fire."""
     game_id = str(data.get('game_id'))
@@ -593,6 +966,7 @@ def handle_submit_buzz_answer(data):
         game_obj = game_rooms[game_id]
         if game_obj.game_type == 'rapid_fire' and game_obj.buzzed_player == player_name:
             correct = game_obj.submit_answer(player_name, answer_idx)
+            room_scheduler.cancel(game_id, 'buzz')
             if correct:
                 emit('buzz_answer_result', {
                     'player': player_name,
@@ -600,9 +974,7 @@ def handle_submit_buzz_answer(data):
                     'correct_answer': game_obj.current_question['options'][game_obj.current_question['answer']]
                 }, room=game_id)
                 # Auto-advance after short delay
-                eventlet.sleep(2)
-                game_obj.next_question()
-                emit('timer_start', {'duration': game_obj.settings.get('time_limit', 30)}, room=game_id)
+                schedule_next_question(game_obj)
                 bump_and_emit_game_state(game_id)
             else:
                 emit('buzz_answer_result', {
@@ -617,37 +989,13 @@ def handle_submit_buzz_answer(data):
                         'message': 'كل اللاعبين جاوبوا غلط!',
                         'correct_answer': correct_ans
                     }, room=game_id)
-                    eventlet.sleep(2)
-                    game_obj.next_question()
-                    emit('timer_start', {'duration': game_obj.settings.get('time_limit', 30)}, room=game_id)
+                    schedule_next_question(game_obj)
                 bump_and_emit_game_state(game_id)
 
-@socketio.on('buzz_timeout')
-def handle_buzz_timeout(data):
-    """Handle buzzed player timeout in Rapid Fire."""
-    game_id = str(data.get('game_id'))
-    if game_id in game_rooms:
-        game_obj = game_rooms[game_id]
-        if game_obj.game_type == 'rapid_fire' and game_obj.buzzed_player:
-            timed_out_player = game_obj.buzzed_player
-            game_obj.buzz_timeout()
-            emit('buzz_timed_out', {'player': timed_out_player}, room=game_id)
-
-            if not game_obj.question_active:
-                correct_ans = game_obj.current_question['options'][game_obj.current_question['answer']]
-                emit('all_buzzed_wrong', {
-                    'message': 'كل اللاعبين جاوبوا غلط!',
-                    'correct_answer': correct_ans
-                }, room=game_id)
-                eventlet.sleep(2)
-                game_obj.next_question()
-                emit('timer_start', {'duration': game_obj.settings.get('time_limit', 30)}, room=game_id)
-
-            bump_and_emit_game_state(game_id)
-
 # ── Bus Complete Events ───────────────────────────────────────────────
 
 @socketio.on('submit_bus_answers')
+@room_task
 def handle_submit_bus_answers(data):
     """Silently sync a player's current answers to the server.
 
@@ -662,24 +1010,73 @@ def handle_submit_bus_answers(data):
         if game_obj.game_type == 'bus_complete' and game_obj.status == 'round_active':
             if not game_obj.submit_answers(player_name, answers):
                 emit('error', {'message': 'إجابات غير صالحة'})
+            else:
+                # Not broadcast, but submitted_players changed for the next snapshot
+                sync_service.bump_game_version(game_obj)
+
+# Each player's answer patches are applied at most once per interval; faster
+# ones are coalesced (latest value per category) and applied when it ends
+answer_patches = AnswerPatchThrottle(float(os.getenv('FAMILY_GAMES_ANSWER_PATCH_MS', '200')) / 1000)
+
+def apply_answer_patches(game_obj, player_name, patches):
+    """Apply ``(category, answer, seq)`` patches; bump the version only if submitted_players changed."""
+    first_submission = player_name not in game_obj.player_submissions
+    changed = False
+    for category, answer, seq in patches:
+        changed = game_obj.patch_answer(player_name, category, answer, seq) or changed
+    if changed and first_submission:
+        sync_service.bump_game_version(game_obj)
+
+def flush_answer_patches(game_id, player_name):
+    game_obj = game_rooms.get(game_id)
+    patches = answer_patches.drain((game_id, player_name))
+    if game_obj and patches and game_obj.game_type == 'bus_complete' and game_obj.status == 'round_active':
+        apply_answer_patches(game_obj, player_name, patches)
+
+@socketio.on('patch_bus_answer')
+@room_task
+def handle_patch_bus_answer(data):
+    """Sync one category of a player's answers: ``{game_id, category, answer, seq}``.
+
+    Like submit_bus_answers this is silent: nothing is broadcast.
+    """
+    game_id = str(data.get('game_id'))
+    player_name = session.get('player_name')
+    game_obj = game_rooms.get(game_id)
+    if not game_obj or game_obj.game_type != 'bus_complete' or game_obj.status != 'round_active':
+        return
+    category, answer, seq = data.get('category'), data.get('answer'), data.get('seq')
+    key = (game_id, player_name)
+    if answer_patches.admit(key, category, answer, seq):
+        apply_answer_patches(game_obj, player_name, [(category, answer, seq)])
+    else:
+        room_scheduler.schedule(game_id, f'answers:{player_name}', answer_patches.delay(key),
+                                flush_answer_patches, game_id, player_name)
 
 @socketio.on('stop_bus')
+@room_task
 def handle_stop_bus(data):
     game_id = str(data.get('game_id'))
     player_name = session.get('player_name')
     if game_id in game_rooms:
         game_obj = game_rooms[game_id]
         if game_obj.game_type == 'bus_complete' and game_obj.status == 'round_active':
+            # Held answer patches still belong to this round
+            for pname, patches in answer_patches.drain_room(game_id).items():
+                room_scheduler.cancel(game_id, f'answers:{pname}')
+                apply_answer_patches(game_obj, pname, patches)
             # Capture the current player's answers when they click Stop Bus
             # Other players' answers are already in partial_submissions via real-time updates
             if 'answers' in data:
                 game_obj.submit_answers(player_name, data['answers'])
             # Stop the bus (collects all players' submissions from partial_submissions)
             game_obj.stop_bus(player_name)
+            request_ai_verdicts(game_obj)
             emit('bus_stopped', {'player': player_name}, room=game_id)
             bump_and_emit_game_state(game_id)
 
 @socketio.on('submit_validation_vote')
+@room_task
 def handle_submit_validation_vote(data):
     """Handle player vote for answer validation."""
     game_id = str(data.get('game_id'))
@@ -692,14 +1089,16 @@ def handle_submit_validation_vote(data):
         if game_obj.game_type == 'bus_complete' and game_obj.status == 'validating':
             result = game_obj.submit_validation_vote(player_name, answer_key, is_valid)
             if result:
-                # Emit updated validation state to all players
+                # Only the voted word changed: send its row, not the whole state
                 emit('validation_updated', {
                     'answer_key': answer_key,
                     'status': result
                 }, room=game_id)
-                bump_and_emit_game_state(game_id)
+                # The next snapshot / patch still carries the new counts
+                sync_service.bump_game_version(game_obj)
 
 @socketio.on('finalize_validation')
+@room_task
 def handle_finalize_validation(data):
     """Handle host finalizing the validation phase and calculating scores."""
     game_id = str(data.get('game_id'))
@@ -715,6 +1114,7 @@ def handle_finalize_validation(data):
                 bump_and_emit_game_state(game_id)
 
 @socketio.on('confirm_bus_scores')
+@room_task
 def handle_confirm_bus_scores(data):
     game_id = str(data.get('game_id'))
     player_name = session.get('player_name')
@@ -725,6 +1125,7 @@ def handle_confirm_bus_scores(data):
             bump_and_emit_game_state(game_id)
 
 @socketio.on('verify_game')
+@room_task
 def handle_verify_game(data):
     gid = str(data.get('game_id'))
     pname = data.get('player_name')
@@ -732,69 +1133,90 @@ def handle_verify_game(data):
         game_obj = game_rooms[gid]
         if any(p['name'] == pname for p in game_obj.players):
             join_room(gid)
-            player_sids[pname] = request.sid
-            emit_game_state(gid)
+            connections.bind(request.sid, gid, pname)
+            # Full snapshot for this client only; the room's patch stream continues from here
+            emit('game_state', sync_service.get_encoded_public_state(gid))
             if game_obj.game_type in ['trivia', 'rapid_fire'] and game_obj.status in ['round_active', 'buzzed']:
-                # Start timer for the person who just joined/refreshed
-                emit('timer_start', {'duration': game_obj.settings.get('time_limit', 30)})
+                # Start timer for the person who just joined/refreshed, with the time actually left
+                remaining = room_scheduler.remaining(gid, 'round')
+                emit('timer_start', {'duration': round(remaining) if remaining is not None else game_obj.settings.get('time_limit', 30)})
                 # Also ensure they have the latest question
-                emit('new_question', game_obj.to_dict(include_answer=False).get('current_question'))
+                emit('new_question', game_obj.public_question())
             elif game_obj.game_type == 'twenty_questions' and game_obj.status in ['thinking', 'asking']:
                 emit('new_question', game_obj.to_dict(for_player=pname).get('current_question'))
             elif game_obj.game_type == 'riddles' and game_obj.status == 'round_active':
-                emit('new_question', game_obj.to_dict().get('current_riddle'))
+                emit('new_question', game_obj.public_riddle())
             elif game_obj.current_player == pname:
                 emit_private_state(gid, pname, request.sid)
             
             if game_obj.game_type == 'pictionary' and hasattr(game_obj, 'canvas_data'):
                 emit('sync_canvas', game_obj.canvas_data)
 
+@socketio.on('request_game_state')
+@room_task
+def handle_request_game_state(data):
+    """Client detected a gap in state_version and needs a full snapshot."""
+    gid = str(data.get('game_id'))
+    pname = session.get('player_name') or data.get('player_name')
+    game_obj = game_rooms.get(gid)
+    if game_obj and any(p['name'] == pname for p in game_obj.players):
+        emit('game_state', sync_service.get_encoded_public_state(gid))
+
 @socketio.on('leave_game')
 @socketio.on('host_withdraw')
+@room_task
 def handle_leave(data):
     rid = str(data.get('roomId') or data.get('game_id'))
     pname = data.get('playerName') or session.get('player_name')
     if rid in game_rooms:
         game_obj = game_rooms[rid]
         game_obj.remove_player(pname)
-        player_sids.pop(pname, None)
+        connections.forget_player(rid, pname)
         
         # If no players left, delete the room
         if not game_obj.players:
-            # Cleanup data service cache for this room
-            if hasattr(game_obj, 'data_service'):
-                game_obj.data_service.cleanup_room(rid)
-            del game_rooms[rid]
+            discard_room(rid)
         # If only 1 player left, force close the room
         elif len(game_obj.players) == 1:
             logger.info(f"Only 1 player left in room {rid}, force closing room")
             emit('player_left', {'message': f'{pname} غادر', 'player_name': pname, 'players': game_obj.players}, room=rid)
             emit('room_closed', {'message': 'اللاعب الآخر غادر، تم إغلاق الغرفة'}, room=rid)
-            # Cleanup data service cache for this room
-            if hasattr(game_obj, 'data_service'):
-                game_obj.data_service.cleanup_room(rid)
-            del game_rooms[rid]
+            discard_room(rid)
         else:
             emit('player_left', {'message': f'{pname} غادر', 'player_name': pname, 'players': game_obj.players}, room=rid)
             bump_and_emit_game_state(rid)
         leave_room(rid)
 
 @socketio.on('close_room')
+@room_task
 def handle_close(data):
     room_id = str(data.get('roomId'))
     actor_name = data.get('playerName') or session.get('player_name')
     if room_id in game_rooms and game_rooms[room_id].host == actor_name:
         logger.info(f"Closing room {room_id}")
-        # Cleanup data service cache for this room
-        if hasattr(game_rooms[room_id], 'data_service'):
-            game_rooms[room_id].data_service.cleanup_room(room_id)
-        del game_rooms[room_id]
+        discard_room(room_id)
         socketio.emit('room_closed', {'message': 'تم إغلاق الغرفة من قبل المضيف'}, room=room_id)
 
 def emit_game_state(gid):
+    gid = str(gid)
+    if gid not in game_rooms:
+        return
+    if STATE_FLUSH_WINDOW <= 0:
+        broadcast_game_state(gid)
+    elif sync_service.mark_dirty(gid):
+        socketio.start_background_task(flush_game_state, gid)
+
+def flush_game_state(gid):
+    socketio.sleep(STATE_FLUSH_WINDOW)
+    if sync_service.take_dirty(gid):
+        room_executor.run(gid, broadcast_game_state, gid)
+
+def broadcast_game_state(gid):
     if gid in game_rooms:
-        state = sync_service.build_public_state(gid)
-        emit('game_state', state, room=gid)
+        update = sync_service.build_state_update(gid)
+        if update:
+            event, payload = update
+            socketio.emit(event, payload, to=gid)
 
 # Cleanup old room usage records on startup
 try:
@@ -814,4 +1236,5 @@ if __name__ == '__main__':
         socketio.run(app, host='127.0.0.1', port=5005, debug=False)
     except KeyboardInterrupt:
         logger.info('\nShutting down server...')
+        get_data_service().item_pool.flush_usage()
         sys.exit(0)
@@ -0,0 +1,41 @@
+"""
+Arabic text normalization shared by the word games.
+
+Answers are compared after folding hamza/alef variants, taa marbuta and
+alef maqsura, and dropping tashkeel (harakat) and tatweel. Normalized forms
+are kept in an LRU cache, so the same answer is only normalized once.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any
+
+# Harakat, Quranic marks, superscript alef and tatweel
+_MARKS = re.compile('[\u064B-\u065F\u0670\u0640]')
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+
+@lru_cache(maxsize=65536)
+def _normalize(text: str, strip_punctuation: bool) -> str:
+    # On CPython a short chain of str.replace beats str.translate with a
+    # non-ASCII table, and most words carry no marks to strip
+    normalized = text.strip().lower()
+    normalized = normalized.replace('أ', 'ا').replace('إ', 'ا').replace('آ', 'ا').replace('ٱ', 'ا')
+    normalized = normalized.replace('ة', 'ه').replace('ى', 'ي').replace('ئ', 'ي').replace('ؤ', 'و')
+    if _MARKS.search(normalized):
+        normalized = _MARKS.sub('', normalized)
+    if strip_punctuation:
+        normalized = _PUNCTUATION.sub('', normalized)
+    return normalized
+
+
+def normalize_arabic(text: Any, strip_punctuation: bool = False) -> str:
+    """Comparison form of ``text``; '' for None or empty input."""
+    if not text:
+        return ''
+    return _normalize(str(text), strip_punctuation)
+
+
+def normalization_cache_info() -> Any:
+    return _normalize.cache_info()
@@ -4,7 +4,41 @@ from datetime import datetime
 from typing import Any, Optional
 
 
+def _encode_snapshot_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return {'__set__': [_encode_snapshot_value(item) for item in value]}
+    if isinstance(value, dict):
+        return {str(key): _encode_snapshot_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_snapshot_value(item) for item in value]
+    return value
+
+
+def _decode_snapshot_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {'__datetime__'}:
+            return datetime.fromisoformat(value['__datetime__'])
+        if set(value) == {'__set__'}:
+            return {_decode_snapshot_value(item) for item in value['__set__']}
+        return {key: _decode_snapshot_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode_snapshot_value(item) for item in value]
+    return value
+
+
 class BaseGame:
+    # Game-specific attributes persisted by to_snapshot on top of the shared room state
+    SNAPSHOT_FIELDS: tuple[str, ...] = ()
+    _BASE_SNAPSHOT_FIELDS = (
+        'host', 'players', 'status', 'scores', 'team_scores', 'current_player',
+        'state_version', 'created_at', 'updated_at',
+    )
+    # True while from_snapshot runs the constructor: per-room warm-up (item
+    # prefetch, pool loads) is skipped since the snapshot carries the state
+    _restoring = False
+
     def __init__(self, game_id: str, host: str, game_type: str, settings: Optional[dict[str, Any]] = None) -> None:
         self.game_id = game_id
         self.host = host
@@ -19,6 +53,26 @@ class BaseGame:
         self.created_at = datetime.now()
         self.updated_at = self.created_at
 
+    def to_snapshot(self) -> dict[str, Any]:
+        """JSON-safe copy of everything needed to rebuild this room after a restart."""
+        snapshot = {'game_id': self.game_id, 'game_type': self.game_type, 'settings': self.settings}
+        for field in self._BASE_SNAPSHOT_FIELDS + self.SNAPSHOT_FIELDS:
+            snapshot[field] = getattr(self, field)
+        return _encode_snapshot_value(snapshot)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict[str, Any]) -> 'BaseGame':
+        data = _decode_snapshot_value(snapshot)
+        game = cls.__new__(cls)
+        game._restoring = True
+        game.__init__(data['game_id'], data['host'], data['settings'])
+        del game._restoring
+        game.game_type = data['game_type']
+        for field in cls._BASE_SNAPSHOT_FIELDS + cls.SNAPSHOT_FIELDS:
+            if field in data:
+                setattr(game, field, data[field])
+        return game
+
     def bump_state_version(self) -> int:
         self.state_version += 1
         self.updated_at = datetime.now()
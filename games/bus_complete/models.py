@@ -1,29 +1,25 @@
 from datetime import datetime
-import json
 import logging
-import os
 import random
 
 from dotenv import load_dotenv
-from groq import Groq
 from games.charades.models import CharadesGame
+from games.arabic_text import normalize_arabic
+from games.bus_complete.wordlists import (
+    get_letter_index, get_validated_words_store, load_answer_dictionary, load_general_wordlist, normalize_dictionary,
+)
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-GROQ_MODEL = 'llama-3.3-70b-versatile'
-CATEGORIES_DESCRIPTION = {
-    'اسم': 'human first name (Arabic or common)',
-    'حيوان': 'animal (mammal, bird, fish, insect, reptile)',
-    'نبات': 'plant, flower, tree, fruit, or vegetable',
-    'جماد': 'inanimate physical object',
-    'بلاد': 'country or city',
-    'أكلة': 'food or dish',
-    'مهنة': 'job or profession title',
-}
-
 
 class BusCompleteGame(CharadesGame):
+    SNAPSHOT_FIELDS = CharadesGame.SNAPSHOT_FIELDS + (
+        'current_letter', 'player_submissions', 'partial_submissions', 'round_scores',
+        'stopped_by', 'invalid_answers', 'wrong_letter_answers', 'player_votes', 'ai_verdicts',
+        'answer_sequences',
+    )
+
     def __init__(self, game_id, host, settings=None):
         super().__init__(game_id, host, settings)
         self.game_type = 'bus_complete'
@@ -41,9 +37,27 @@ class BusCompleteGame(CharadesGame):
         self.wrong_letter_answers = {}  # {player_name: {category: answer}}
         self.validation_cache = {}
         self.player_votes = {}  # {answer_key: {player_name: True/False}} - manual validation votes
+        self._validation_table = None  # {answer_key: status row}, built once per validation phase
+        self._validation_player_count = 0
         self.partial_submissions = {}  # {player_name: {category: answer}} - real-time submissions
-        self.validated_words = self._load_validated_words()  # Tier 3: previously validated words
-        self._groq_client = None  # lazy-initialized
+        self.answer_sequences = {}  # {player_name: {category: seq}} - last answer patch applied
+        # Tier 3: previously validated words, shared by every room using the same file
+        self._validated_store = get_validated_words_store(
+            self.settings.get('validated_words_path', 'static/data/validated_words.json'), self.categories
+        )
+        self._validated_words_override = None
+        self.ai_verdicts = {}  # {answer_key: True/False} - AI opinion shown next to the votes
+
+    @property
+    def validated_words(self):
+        """{category: frozenset(normalized_words)} that passed manual validation."""
+        if self._validated_words_override is not None:
+            return self._validated_words_override
+        return self._validated_store.words
+
+    @validated_words.setter
+    def validated_words(self, words):
+        self._validated_words_override = words
 
     def start_game(self):
         if len(self.players) < 2:
@@ -52,16 +66,28 @@ class BusCompleteGame(CharadesGame):
 
     def next_round(self, item=None):
         self.status = 'round_active'
-        self.current_letter = random.choice(self.alphabet)
+        self.current_letter = random.choice(self.playable_letters())
         self.player_submissions = {}
         self.partial_submissions = {}  # Reset partial submissions
+        self.answer_sequences = {}
         self.round_scores = {}
         self.stopped_by = None
         self.invalid_answers = {}
         self.wrong_letter_answers = {}
         self.player_votes = {}  # Reset votes for new round
+        self._validation_table = None
+        self.ai_verdicts = {}
         self.round_start_time = datetime.now()
 
+    def playable_letters(self):
+        """Letters with at least ``min_letter_words`` dictionary words (all letters if none qualify)."""
+        min_words = self.settings.get('min_letter_words', 1)
+        if not self.answer_dictionary or min_words <= 0:
+            return self.alphabet
+        index = self._letter_index()
+        letters = [letter for letter in self.alphabet if index.coverage(self._normalize_text(letter)) >= min_words]
+        return letters or self.alphabet
+
     def submit_answers(self, player_name, answers):
         """Store player answers after checking the starting letter only.
         
@@ -83,25 +109,10 @@ class BusCompleteGame(CharadesGame):
             if k is None:
                 continue
             key = str(k)
-
-            if v is None:
-                value = ''
-            elif isinstance(v, str):
-                value = v.strip()
-            else:
-                value = str(v).strip()
-
-            if not value:
-                normalized_answers[key] = ''
-                continue
-
-            # Only check: must start with the current letter
-            if not self._starts_with_letter(value):
-                wrong_letter[key] = value
-                normalized_answers[key] = ''
-                continue
-
+            value, rejected = self._check_answer(v)
             normalized_answers[key] = value
+            if rejected:
+                wrong_letter[key] = rejected
 
         self.player_submissions[player_name] = normalized_answers
         
@@ -115,6 +126,54 @@ class BusCompleteGame(CharadesGame):
         self.wrong_letter_answers[player_name] = wrong_letter
         return True
 
+    def patch_answer(self, player_name, category, answer, seq=None):
+        """Apply one category of a player's answers; True if anything changed.
+
+        The client sends only the category that changed, tagged with an
+        increasing ``seq``. Patches older than the last one applied to that
+        category (resent after a reconnect) and values equal to the stored
+        one are dropped, so only the patched category is re-checked.
+        """
+        if self.status != 'round_active' or category not in self.categories:
+            return False
+
+        sequences = self.answer_sequences.setdefault(player_name, {})
+        if seq is not None:
+            if not isinstance(seq, int) or seq <= sequences.get(category, -1):
+                return False
+            sequences[category] = seq
+
+        value, rejected = self._check_answer(answer)
+        submitted = self.player_submissions.setdefault(player_name, {})
+        wrong_letter = self.wrong_letter_answers.setdefault(player_name, {})
+        if category in submitted and submitted[category] == value and wrong_letter.get(category) == rejected:
+            return False
+
+        submitted[category] = value
+        if rejected:
+            wrong_letter[category] = rejected
+        else:
+            wrong_letter.pop(category, None)
+        if value:
+            self.partial_submissions.setdefault(player_name, {})[category] = value
+        return True
+
+    def _check_answer(self, answer):
+        """(accepted answer, rejected answer) after the starting-letter check."""
+        if answer is None:
+            value = ''
+        elif isinstance(answer, str):
+            value = answer.strip()
+        else:
+            value = str(answer).strip()
+
+        if not value:
+            return '', None
+        # Only check: must start with the current letter
+        if not self._starts_with_letter(value):
+            return '', value
+        return value, None
+
     def stop_bus(self, player_name):
         """Stop the bus and transition to manual validation phase.
 
@@ -138,6 +197,7 @@ class BusCompleteGame(CharadesGame):
 
         # Run only Tier 1 validation (letter check) and Tier 2 (dictionary) - NOT auto-scoring
         self._validate_all_answers()
+        self._build_validation_table()
         return True
 
     def _validate_all_answers(self):
@@ -228,13 +288,66 @@ class BusCompleteGame(CharadesGame):
             self.player_votes[answer_key] = {}
 
         # Toggle vote: if clicking same state, remove vote
-        current_vote = self.player_votes[answer_key].get(voter_name)
+        votes = self.player_votes[answer_key]
+        current_vote = votes.get(voter_name)
         if current_vote == is_valid:
-            del self.player_votes[answer_key][voter_name]
+            del votes[voter_name]
         else:
-            self.player_votes[answer_key][voter_name] = is_valid
+            votes[voter_name] = is_valid
+
+        if self._validation_table is None:
+            self._build_validation_table()
+        row = self._validation_table.get(answer_key)
+        if row is None:
+            return self._get_validation_status(answer_key)
+
+        # Adjust the word's counts by this one vote instead of recounting
+        self._count_vote(row, current_vote, -1)
+        self._count_vote(row, votes.get(voter_name), 1)
+        row['votes'] = votes
+        self._update_majority(row)
+        return row
+
+    def ai_validation_pairs(self):
+        """(category, normalized, answer) for words still waiting on an AI verdict."""
+        if not (self.validate_answers and self.use_online_validation) or self.status != 'validating':
+            return []
+        return [
+            (row['category'], row['normalized'], row['answer'])
+            for key, row in self.get_all_validation_statuses().items()
+            if key not in self.ai_verdicts
+        ]
+
+    def apply_ai_verdicts(self, verdicts):
+        """Record AI verdicts {(category, normalized): bool}; returns the answer_keys that changed."""
+        if self.status != 'validating':
+            return []
+        table = self.get_all_validation_statuses()
+        changed = []
+        for (category, normalized), valid in verdicts.items():
+            key = f"{category}|{normalized}"
+            if key in table and self.ai_verdicts.get(key) != valid:
+                self.ai_verdicts[key] = valid
+                table[key]['ai_valid'] = valid
+                changed.append(key)
+        return changed
+
+    @staticmethod
+    def _count_vote(row, vote, delta):
+        if vote is None:
+            return
+        row['valid_count' if vote else 'invalid_count'] += delta
 
-        return self._get_validation_status(answer_key)
+    def _update_majority(self, row):
+        # Need majority (> 50%) to determine validity
+        total_players = len(self.players)
+        row['total_players'] = total_players
+        if row['valid_count'] > total_players / 2:
+            row['is_valid'] = True
+        elif row['invalid_count'] > total_players / 2:
+            row['is_valid'] = False
+        else:
+            row['is_valid'] = None
 
     def _get_validation_status(self, answer_key):
         """Get the current validation status for a word.
@@ -247,25 +360,13 @@ class BusCompleteGame(CharadesGame):
                        None if no clear majority
         """
         votes = self.player_votes.get(answer_key, {})
-        valid_count = sum(1 for v in votes.values() if v)
-        invalid_count = sum(1 for v in votes.values() if not v)
-        total_players = len(self.players)
-
-        # Need majority (> 50%) to determine validity
-        if valid_count > total_players / 2:
-            is_valid = True
-        elif invalid_count > total_players / 2:
-            is_valid = False
-        else:
-            is_valid = None
-
-        return {
-            'valid_count': valid_count,
-            'invalid_count': invalid_count,
-            'total_players': total_players,
-            'is_valid': is_valid,
+        status = {
+            'valid_count': sum(1 for v in votes.values() if v),
+            'invalid_count': sum(1 for v in votes.values() if not v),
             'votes': votes
         }
+        self._update_majority(status)
+        return status
 
     def finalize_validation(self):
         """Finalize validation and calculate scores based on majority votes.
@@ -337,38 +438,9 @@ class BusCompleteGame(CharadesGame):
             words_to_add: {category: [normalized_words]} to add
             words_to_remove: {category: [normalized_words]} to remove (overridden)
         """
-        validated_path = self.settings.get('validated_words_path', 'static/data/validated_words.json')
-
-        # Load current data
-        try:
-            if os.path.exists(validated_path):
-                with open(validated_path, 'r', encoding='utf-8') as handle:
-                    data = json.load(handle)
-            else:
-                data = {cat: [] for cat in self.categories}
-        except (OSError, json.JSONDecodeError):
-            data = {cat: [] for cat in self.categories}
-
-        # Update each category
-        for cat in self.categories:
-            current_words = set(data.get(cat, []))
-            # Add new validated words
-            current_words.update(words_to_add.get(cat, []))
-            # Remove overridden words
-            current_words.difference_update(words_to_remove.get(cat, []))
-            data[cat] = list(current_words)
-
-            # Update in-memory cache
-            self.validated_words[cat] = current_words
-
-        # Save to file
-        try:
-            os.makedirs(os.path.dirname(validated_path), exist_ok=True)
-            with open(validated_path, 'w', encoding='utf-8') as handle:
-                json.dump(data, handle, ensure_ascii=False, indent=2)
-            logger.info(f"Updated validated_words.json")
-        except OSError as e:
-            logger.error(f"Failed to save validated_words.json: {e}")
+        self._validated_store.update(words_to_add, words_to_remove)
+        # Follow the shared store again once it reflects this round
+        self._validated_words_override = None
 
     def get_unique_words_for_validation(self):
         """Get unique words per category for validation (deduplicated, no player names).
@@ -413,7 +485,18 @@ class BusCompleteGame(CharadesGame):
         """Get validation status for unique words per category.
 
         Returns dict mapping answer_key (category|normalized_word) to validation status.
+        The table is built once per validation phase and kept current by votes.
         """
+        if self._validation_table is None:
+            return self._build_validation_table()
+        if self._validation_player_count != len(self.players):
+            # Someone joined or left: the majority threshold moved for every word
+            for row in self._validation_table.values():
+                self._update_majority(row)
+            self._validation_player_count = len(self.players)
+        return self._validation_table
+
+    def _build_validation_table(self):
         statuses = {}
         unique_words = self.get_unique_words_for_validation()
 
@@ -421,32 +504,19 @@ class BusCompleteGame(CharadesGame):
             for word_data in words:
                 # Key is category|normalized_word (no player name)
                 key = f"{cat}|{word_data['normalized']}"
-                votes = self.player_votes.get(key, {})
-                valid_count = sum(1 for v in votes.values() if v)
-                invalid_count = sum(1 for v in votes.values() if not v)
-                total_players = len(self.players)
-
-                # Determine validity
-                if valid_count > total_players / 2:
-                    is_valid = True
-                elif invalid_count > total_players / 2:
-                    is_valid = False
-                else:
-                    is_valid = None
-
-                statuses[key] = {
+                row = {
                     'category': cat,
                     'answer': word_data['word'],
                     'normalized': word_data['normalized'],
                     'players': word_data['players'],
                     'previously_validated': word_data['previously_validated'],
-                    'valid_count': valid_count,
-                    'invalid_count': invalid_count,
-                    'total_players': total_players,
-                    'is_valid': is_valid,
-                    'votes': votes
+                    'ai_valid': self.ai_verdicts.get(key),
                 }
+                row.update(self._get_validation_status(key))
+                statuses[key] = row
 
+        self._validation_table = statuses
+        self._validation_player_count = len(self.players)
         return statuses
 
     def to_dict(self, **kwargs):
@@ -476,91 +546,25 @@ class BusCompleteGame(CharadesGame):
 
     def _load_answer_dictionary(self):
         if isinstance(self.settings, dict) and self.settings.get('answer_dictionary'):
-            return self._normalize_dictionary(self.settings['answer_dictionary'])
+            return normalize_dictionary(self.settings['answer_dictionary'])
 
         dictionary_path = self.settings.get('answer_dictionary_path', 'static/data/bus_complete_dictionary.json')
-        if not os.path.exists(dictionary_path):
-            return {}
-
-        try:
-            with open(dictionary_path, 'r', encoding='utf-8') as handle:
-                data = json.load(handle)
-                return self._normalize_dictionary(data)
-        except (OSError, json.JSONDecodeError):
-            return {}
-
-    def _load_validated_words(self):
-        """Load previously validated words from permanent storage.
-        
-        This is the Tier 3 dictionary - words that passed manual validation.
-        Returns dict: {category: set(normalized_words)}
-        """
-        validated_path = self.settings.get('validated_words_path', 'static/data/validated_words.json')
-        if not os.path.exists(validated_path):
-            return {cat: set() for cat in self.categories}
-
-        try:
-            with open(validated_path, 'r', encoding='utf-8') as handle:
-                data = json.load(handle)
-                normalized = {}
-                for cat in self.categories:
-                    words = data.get(cat, [])
-                    if isinstance(words, list):
-                        normalized[cat] = {self._normalize_text(w) for w in words if w}
-                    else:
-                        normalized[cat] = set()
-                logger.info(f"Loaded validated words dictionary")
-                return normalized
-        except (OSError, json.JSONDecodeError) as e:
-            logger.warning(f"Failed to load validated_words.json: {e}")
-            return {cat: set() for cat in self.categories}
-
-    def _normalize_dictionary(self, data):
-        normalized = {}
-        if not isinstance(data, dict):
-            return normalized
-
-        for category, words in data.items():
-            if not isinstance(words, list):
-                continue
-            normalized_words = set()
-            for word in words:
-                if not word:
-                    continue
-                normalized_words.add(self._normalize_text(str(word)))
-            normalized[str(category)] = normalized_words
-
-        return normalized
+        return load_answer_dictionary(dictionary_path)
 
     def _load_general_wordlist(self):
-        """Load the general Arabic wordlist (Hans Wehr, 34K words) as a normalized set.
+        """The general Arabic wordlist (Hans Wehr, 34K words), shared read-only across rooms.
         
         This flat wordlist is used as tier-3 fallback validation to check
         if a word exists in Arabic at all, regardless of category.
         """
         wordlist_path = self.settings.get('general_wordlist_path', 'static/data/arabic_wordlist.txt')
-        if not os.path.exists(wordlist_path):
-            return set()
-
-        try:
-            with open(wordlist_path, 'r', encoding='utf-8') as handle:
-                words = set()
-                for line in handle:
-                    word = line.strip()
-                    if word:
-                        words.add(self._normalize_text(word))
-                logger.info(f"Loaded general Arabic wordlist: {len(words)} words")
-                return words
-        except OSError:
-            return set()
+        return load_general_wordlist(wordlist_path)
 
     def _normalize_text(self, text):
-        if text is None:
-            return ''
-        normalized = str(text).strip()
-        normalized = normalized.replace('أ', 'ا').replace('إ', 'ا').replace('آ', 'ا')
-        normalized = normalized.replace('ة', 'ه').replace('ى', 'ي').replace('ئ', 'ي').replace('ؤ', 'و')
-        return normalized
+        return normalize_arabic(text)
+
+    def _letter_index(self):
+        return get_letter_index(self.answer_dictionary, self.general_wordlist)
 
     def _starts_with_letter(self, answer):
         """Check if the answer starts with the current round letter."""
@@ -570,109 +574,6 @@ class BusCompleteGame(CharadesGame):
         norm_letter = self._normalize_text(self.current_letter)
         return norm_answer.startswith(norm_letter)
 
-    def _get_groq_client(self):
-        """Lazy-initialize the Groq client."""
-        if self._groq_client is None:
-            api_key = os.getenv('GROQ_API_KEY', '')
-            if api_key and api_key != 'your_groq_api_key_here':
-                self._groq_client = Groq(api_key=api_key)
-        return self._groq_client
-
-    def _validate_ai_batch(self, tasks):
-        """Validate all answers in a single Groq AI call.
-        
-        Args:
-            tasks: list of (player_name, category, answer) tuples
-            
-        Returns:
-            dict of {(category, answer): True/False} for each validated pair.
-            Empty dict if AI is unavailable.
-        """
-        client = self._get_groq_client()
-        if not client:
-            logger.debug("Groq API key not configured, falling back to offline validation")
-            return {}
-
-        # Deduplicate: same word+category only needs one check
-        unique_pairs = list({(cat, ans) for _, cat, ans in tasks})
-
-        items_text = []
-        for cat, ans in unique_pairs:
-            desc = CATEGORIES_DESCRIPTION.get(cat, cat)
-            items_text.append(f'  "{ans}" -> category "{cat}" ({desc})')
-
-        prompt = f"""You are a judge for the Arabic word game "اتوبيس كومبليت" (Bus Complete).
-Players write one word per category, all starting with the same letter.
-
-Your job: check if each word reasonably fits its category.
-
-CATEGORIES:
-- اسم = Any real human first name (Arabic, foreign, or dialect names all count)
-- حيوان = Any animal (mammal, bird, fish, insect, reptile)
-- نبات = Any plant, flower, tree, fruit, or vegetable
-- جماد = Any inanimate physical object (tool, furniture, device, etc.)
-- بلاد = Any country, city, island, or region. Accept variant spellings.
-- أكلة = Any food, dish, dessert, or snack (including regional/dialect foods)
-- مهنة = Any job, profession, occupation, or field of work (e.g. زراعة = agriculture/farming counts as مهنة)
-
-KEY RULES:
-- BE LENIENT: if a word can reasonably fit the category, accept it
-- Dialect/colloquial words are VALID (e.g. زلومة is a real Levantine food)
-- Names that also have other meanings still count as names (e.g. زيادة is both a name and a word)
-- Fields of work count as مهنة (زراعة = farming, تجارة = trade, هندسة = engineering)
-- ONLY reject if the word clearly belongs to a completely different category
-  Example: زرافة (giraffe) is حيوان, so it's INVALID for نبات
-
-Words to validate (letter "{self.current_letter}"):
-{chr(10).join(items_text)}
-
-Return JSON: {{"results": [{{"word":"...","category":"...","valid":true/false}}]}}"""
-
-        timeout = self.settings.get('validation_timeout', 8)
-        for attempt in range(2):
-            try:
-                response = client.chat.completions.create(
-                    model=GROQ_MODEL,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0,
-                    max_tokens=1024,
-                    timeout=timeout,
-                    response_format={"type": "json_object"},
-                )
-                raw = response.choices[0].message.content.strip()
-                # Strip markdown code fences if present
-                if raw.startswith('```'):
-                    raw = raw.split('\n', 1)[1].rsplit('```', 1)[0].strip()
-
-                parsed = json.loads(raw)
-                # Handle both {"results": [...]} and [...] formats
-                if isinstance(parsed, dict):
-                    results = parsed.get('results', parsed.get('data', parsed.get('words', [])))
-                    if not results:
-                        # Try first list-valued key
-                        for v in parsed.values():
-                            if isinstance(v, list):
-                                results = v
-                                break
-                else:
-                    results = parsed
-
-                ai_map = {}
-                for r in results:
-                    ai_map[(r['category'], r['word'])] = bool(r['valid'])
-                logger.info(f"AI validated {len(ai_map)} word-category pairs")
-                return ai_map
-
-            except json.JSONDecodeError as e:
-                logger.warning(f"AI JSON parse error (attempt {attempt+1}): {e}")
-                continue
-            except Exception as e:
-                logger.warning(f"Groq AI validation failed: {e}, falling back to offline")
-                return {}
-
-        logger.warning("AI validation failed after retries, falling back to offline")
-        return {}
-
     def _is_valid_answer(self, category, answer):
         """Check validation cache or run offline fallback.
         
@@ -703,9 +604,10 @@ Return JSON: {{"results": [{{"word":"...","category":"...","valid":true/false}}]
         if len(normalized_answer) < 2:
             return False
 
+        index = self._letter_index()
+
         # Tier 2b: Categorized dictionary (category-specific)
-        allowed_words = self.answer_dictionary.get(normalized_category)
-        if allowed_words and normalized_answer in allowed_words:
+        if index.in_category(normalized_category, normalized_answer):
             return True
 
         # Tier 3: Previously validated words (manual validation history)
@@ -713,11 +615,11 @@ Return JSON: {{"results": [{{"word":"...","category":"...","valid":true/false}}]
             return True
 
         # Tier 4: General Arabic wordlist (Hans Wehr — 34K words)
-        if self.general_wordlist and normalized_answer in self.general_wordlist:
+        if index.in_wordlist(normalized_answer):
             return True
 
         # If we have no dictionaries at all, accept the answer
-        if not allowed_words and not self.general_wordlist:
+        if not self.answer_dictionary.get(normalized_category) and not self.general_wordlist:
             return True
 
         return False
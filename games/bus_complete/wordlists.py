@@ -0,0 +1,317 @@
+"""
+Process-wide Bus Complete word lists.
+
+The categorized dictionary, the general Arabic wordlist and the manually
+validated words are loaded and normalized once per file and shared by every
+room as read-only frozensets. Validated words change through copy-on-write:
+an update builds new frozensets and swaps the store's mapping in one
+assignment, so readers never see a half-applied update.
+
+A round only ever accepts words starting with one letter, so the static
+lists are also partitioned by first letter (``LetterIndex``).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, Mapping
+
+from games.arabic_text import normalize_arabic
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single worker, the thread lock is enough
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_guard = threading.Lock()
+# (kind, absolute path) -> (mtime, loaded value)
+_loaded: dict[tuple[str, str], tuple[float, Any]] = {}
+_validated_stores: dict[str, 'ValidatedWordsStore'] = {}
+
+EMPTY_WORDS: frozenset[str] = frozenset()
+
+
+def normalize_dictionary(data: Any) -> Mapping[str, frozenset[str]]:
+    normalized = {}
+    if not isinstance(data, dict):
+        return MappingProxyType(normalized)
+
+    for category, words in data.items():
+        if not isinstance(words, list):
+            continue
+        normalized[str(category)] = frozenset(normalize_arabic(str(word)) for word in words if word)
+
+    return MappingProxyType(normalized)
+
+
+def _load_shared(kind: str, path: str, load: Any) -> Any:
+    """Load ``path`` once per modification time and share the result."""
+    path = os.path.abspath(path)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    key = (kind, path)
+    with _guard:
+        cached = _loaded.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        value = load(path)
+        _loaded[key] = (mtime, value)
+        return value
+
+
+def load_answer_dictionary(path: str) -> Mapping[str, frozenset[str]]:
+    def load(path: str) -> Mapping[str, frozenset[str]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as handle:
+                return normalize_dictionary(json.load(handle))
+        except (OSError, json.JSONDecodeError):
+            return MappingProxyType({})
+
+    return _load_shared('dictionary', path, load) or MappingProxyType({})
+
+
+def load_general_wordlist(path: str) -> frozenset[str]:
+    """The general Arabic wordlist (Hans Wehr, 34K words) as a normalized frozenset."""
+    def load(path: str) -> frozenset[str]:
+        try:
+            with open(path, 'r', encoding='utf-8') as handle:
+                words = frozenset(normalize_arabic(line) for line in handle if line.strip())
+        except OSError:
+            return EMPTY_WORDS
+        logger.info(f"Loaded general Arabic wordlist: {len(words)} words")
+        return words
+
+    return _load_shared('wordlist', path, load) or EMPTY_WORDS
+
+
+class LetterIndex:
+    """Dictionary and wordlist partitioned as first letter -> category -> words.
+
+    Lookups only touch the partition for the word's first letter, and
+    ``coverage`` counts the categorized words available for a round letter.
+    """
+
+    def __init__(self, dictionary: Mapping[str, Iterable[str]], wordlist: Iterable[str]) -> None:
+        categorized: dict[str, dict[str, set[str]]] = {}
+        for category, words in dictionary.items():
+            for word in words:
+                if word:
+                    categorized.setdefault(word[0], {}).setdefault(category, set()).add(word)
+        general: dict[str, set[str]] = {}
+        for word in wordlist:
+            if word:
+                general.setdefault(word[0], set()).add(word)
+
+        self._categorized = {
+            letter: {category: frozenset(words) for category, words in categories.items()}
+            for letter, categories in categorized.items()
+        }
+        self._general = {letter: frozenset(words) for letter, words in general.items()}
+        self._coverage = {
+            letter: sum(len(words) for words in categories.values())
+            for letter, categories in self._categorized.items()
+        }
+
+    def in_category(self, category: str, word: str) -> bool:
+        return word in self._categorized.get(word[:1], {}).get(category, EMPTY_WORDS)
+
+    def in_wordlist(self, word: str) -> bool:
+        return word in self._general.get(word[:1], EMPTY_WORDS)
+
+    def words_for(self, letter: str) -> Mapping[str, frozenset[str]]:
+        """{category: words} starting with the (normalized) letter."""
+        return MappingProxyType(self._categorized.get(letter, {}))
+
+    def coverage(self, letter: str) -> int:
+        return self._coverage.get(letter, 0)
+
+
+# (id(dictionary), id(wordlist)) -> (dictionary, wordlist, index); the
+# references keep the ids valid while the entry is cached
+_letter_indexes: OrderedDict[tuple[int, int], tuple[Any, Any, LetterIndex]] = OrderedDict()
+LETTER_INDEX_CACHE_SIZE = 16
+
+
+def get_letter_index(dictionary: Mapping[str, Iterable[str]], wordlist: Iterable[str]) -> LetterIndex:
+    """Shared index for this exact pair of word lists, built on first use."""
+    key = (id(dictionary), id(wordlist))
+    with _guard:
+        cached = _letter_indexes.get(key)
+        if cached and cached[0] is dictionary and cached[1] is wordlist:
+            _letter_indexes.move_to_end(key)
+            return cached[2]
+    index = LetterIndex(dictionary, wordlist)
+    with _guard:
+        _letter_indexes[key] = (dictionary, wordlist, index)
+        while len(_letter_indexes) > LETTER_INDEX_CACHE_SIZE:
+            _letter_indexes.popitem(last=False)
+    return index
+
+
+class ValidatedWordsStore:
+    """Words that passed manual validation, shared by all rooms using one file.
+
+    ``words`` is an immutable ``{category: frozenset}`` mapping; ``update``
+    replaces it with a new one rather than mutating it. Updates are appended
+    to ``<path>.journal`` as add/remove events instead of rewriting the JSON
+    file; ``compact`` folds the journal into a fresh snapshot written to a
+    temp file and renamed over ``path``. Appends and compaction hold an
+    exclusive lock on ``<path>.lock`` so a worker never appends between
+    another worker's compaction reading the journal and removing it.
+    """
+
+    def __init__(self, path: str, categories: Iterable[str]) -> None:
+        self.path = path
+        self.journal_path = f'{path}.journal'
+        self.lock_path = f'{path}.lock'
+        self.categories = list(categories)
+        self._write_guard = threading.Lock()
+        with self._locked():
+            self._raw = self._read_merged()
+        self.words: Mapping[str, frozenset[str]] = self._view(self._raw)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the store's thread lock and, where supported, the cross-process file lock."""
+        with self._write_guard:
+            if fcntl is None:
+                yield
+                return
+            try:
+                os.makedirs(os.path.dirname(self.lock_path) or '.', exist_ok=True)
+                handle = open(self.lock_path, 'a')
+            except OSError as e:
+                logger.warning(f"Cannot lock validated words, continuing without the file lock: {e}")
+                yield
+                return
+            with handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read_file(self) -> dict[str, Any]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as handle:
+                data = json.load(handle)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Failed to load validated_words.json: {e}")
+            return {}
+
+    def _read_merged(self) -> dict[str, set[str]]:
+        """Snapshot file with the journal replayed on top, as raw words per category."""
+        data = self._read_file()
+        raw = {}
+        for cat in self.categories:
+            entries = data.get(cat, [])
+            raw[cat] = {w for w in entries if w} if isinstance(entries, list) else set()
+        if not os.path.exists(self.journal_path):
+            return raw
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as handle:
+                for line in handle:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from a crash mid-append
+                    words = raw.setdefault(event.get('category'), set())
+                    if event.get('op') == 'add':
+                        words.update(event.get('words', []))
+                    elif event.get('op') == 'remove':
+                        words.difference_update(event.get('words', []))
+        except OSError as e:
+            logger.warning(f"Failed to replay validated words journal: {e}")
+        return raw
+
+    def _view(self, raw: Mapping[str, Iterable[str]]) -> Mapping[str, frozenset[str]]:
+        return MappingProxyType({
+            cat: frozenset(normalize_arabic(w) for w in raw.get(cat, ()) if w) for cat in self.categories
+        })
+
+    def update(self, words_to_add: Mapping[str, Iterable[str]], words_to_remove: Mapping[str, Iterable[str]]) -> None:
+        """Apply a validation round: journal the added and removed words, then swap the view.
+
+        Args:
+            words_to_add: {category: [normalized_words]} to add
+            words_to_remove: {category: [normalized_words]} to remove (overridden)
+        """
+        events = []
+        for cat in self.categories:
+            for op, words in (('add', words_to_add.get(cat, [])), ('remove', words_to_remove.get(cat, []))):
+                if words:
+                    events.append({'op': op, 'category': cat, 'words': sorted(words)})
+        if not events:
+            return
+
+        with self._locked():
+            raw = dict(self._raw)
+            for event in events:
+                words = set(raw.get(event['category'], ()))
+                if event['op'] == 'add':
+                    words.update(event['words'])
+                else:
+                    words.difference_update(event['words'])
+                raw[event['category']] = words
+            try:
+                os.makedirs(os.path.dirname(self.journal_path) or '.', exist_ok=True)
+                with open(self.journal_path, 'a', encoding='utf-8') as handle:
+                    handle.write(''.join(json.dumps(event, ensure_ascii=False) + '\n' for event in events))
+            except OSError as e:
+                logger.error(f"Failed to journal validated words: {e}")
+            self._raw = raw
+            self.words = self._view(raw)
+
+    def compact(self) -> bool:
+        """Fold the journal into the snapshot file; returns False when there was nothing to fold."""
+        with self._locked():
+            if not os.path.exists(self.journal_path) or not os.path.getsize(self.journal_path):
+                return False
+            # Re-read from disk so events journaled by other processes are kept
+            raw = self._read_merged()
+            data = self._read_file()
+            for cat, words in raw.items():
+                data[cat] = sorted(words)
+            temp_path = f'{self.path}.tmp'
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as handle:
+                    json.dump(data, handle, ensure_ascii=False, indent=2)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(temp_path, self.path)
+                os.remove(self.journal_path)
+            except OSError as e:
+                logger.error(f"Failed to compact validated_words.json: {e}")
+                return False
+            self._raw = raw
+            self.words = self._view(raw)
+            logger.info("Compacted validated_words.json")
+            return True
+
+
+def compact_validated_words() -> int:
+    """Compact every validated-words store in the process; returns how many were rewritten."""
+    with _guard:
+        stores = list(_validated_stores.values())
+    return sum(1 for store in stores if store.compact())
+
+
+def get_validated_words_store(path: str, categories: Iterable[str]) -> ValidatedWordsStore:
+    path = os.path.abspath(path)
+    with _guard:
+        store = _validated_stores.get(path)
+        if store is None:
+            store = _validated_stores[path] = ValidatedWordsStore(path, categories)
+        return store
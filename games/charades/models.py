@@ -5,6 +5,9 @@ from games.base import BaseGame
 from services.data_service import get_data_service
 
 class CharadesGame(BaseGame):
+    SNAPSHOT_FIELDS = ('current_item', 'round_start_time')
+    ITEM_GAME_TYPE = 'charades'  # which cached item pool the room draws from
+
     def __init__(self, game_id, host, settings=None):
         super().__init__(game_id=game_id, host=host, game_type='charades', settings=settings or {
             'teams': False,
@@ -25,7 +28,8 @@ class CharadesGame(BaseGame):
         self.data_service = get_data_service()
         
         # Pre-fetch items for this room (30 items as per requirements)
-        self.data_service.prefetch_for_room(self.game_id, 'charades', count=30)
+        if not self._restoring:
+            self.data_service.prefetch_for_room(self.game_id, self.ITEM_GAME_TYPE, count=30)
         
         # Legacy support - keep for backward compatibility
         self.room_items = []
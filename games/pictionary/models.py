@@ -1,14 +1,14 @@
 from games.charades.models import CharadesGame
 
 class PictionaryGame(CharadesGame):
+    SNAPSHOT_FIELDS = CharadesGame.SNAPSHOT_FIELDS + ('canvas_data',)
+    ITEM_GAME_TYPE = 'pictionary'
+
     def __init__(self, game_id, host, settings=None):
-        # Initialize parent without prefetching (we'll do it for pictionary)
+        # The parent prefetches the pictionary pool via ITEM_GAME_TYPE
         super().__init__(game_id, host, settings)
         self.game_type = 'pictionary'
         self.canvas_data = [] # Store drawing strokes to sync new joiners
-        
-        # Pre-fetch pictionary items for this room (overrides charades prefetch)
-        self.data_service.prefetch_for_room(self.game_id, 'pictionary', count=30)
 
     def clear_canvas(self):
         self.canvas_data = []
@@ -18,6 +18,10 @@ class RapidFireGame(BaseGame):
     """Rapid Fire game: buzz-in trivia with race mechanics."""
 
     BUZZ_TIMEOUT_SECONDS = 10  # Time for buzzed player to answer
+    SNAPSHOT_FIELDS = (
+        'current_question', 'question_active', 'buzzed_player', 'buzz_time',
+        'players_buzzed_wrong', 'round_start_time',
+    )
 
     def __init__(self, game_id: str, host: str, settings: Optional[dict] = None):
         super().__init__(game_id=game_id, host=host, game_type='rapid_fire', settings=settings or {
@@ -36,7 +40,8 @@ class RapidFireGame(BaseGame):
 
         # Data service for questions (reuses trivia pool)
         self.data_service = get_data_service()
-        self.data_service.prefetch_for_room(self.game_id, 'rapid_fire', count=30)
+        if not self._restoring:
+            self.data_service.prefetch_for_room(self.game_id, 'rapid_fire', count=30)
 
         # Legacy fallback
         self.questions: list[dict] = []
@@ -213,21 +218,24 @@ class RapidFireGame(BaseGame):
 
     # ── Serialization ─────────────────────────────────────────────────
 
+    def public_question(self, include_answer: bool = False) -> Optional[dict]:
+        """The current question as broadcast (without its answer index unless asked)."""
+        if not self.current_question:
+            return None
+        q = self.current_question.copy()
+        if not include_answer:
+            q.pop('answer', None)
+        return q
+
     def to_dict(self, include_answer: bool = False, **kwargs) -> dict:
         """Serialize game state for broadcasting.
 
         Args:
             include_answer: If True, include correct answer index.
         """
-        q = None
-        if self.current_question:
-            q = self.current_question.copy()
-            if not include_answer:
-                q.pop('answer', None)
-
         state = self._build_base_state()
         state.update({
-            'current_question': q,
+            'current_question': self.public_question(include_answer),
             'buzzed_player': self.buzzed_player,
             'players_buzzed_wrong': list(self.players_buzzed_wrong),
             'question_active': self.question_active,
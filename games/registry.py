@@ -31,3 +31,8 @@ def create_game_instance(game_type: str, game_id: str, host: str, settings: dict
     metadata = get_game_metadata(game_type)
     factory = metadata['factory']
     return factory(game_id, host, settings)
+
+
+def restore_game_instance(snapshot: dict[str, Any]) -> Any:
+    metadata = get_game_metadata(snapshot['game_type'])
+    return metadata['factory'].from_snapshot(snapshot)
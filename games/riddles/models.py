@@ -8,6 +8,7 @@ multiple riddles.
 import json
 import random
 from typing import Optional
+from games.arabic_text import normalize_arabic
 from games.base import BaseGame
 from services.data_service import get_data_service
 
@@ -17,6 +18,10 @@ class RiddlesGame(BaseGame):
 
     HINT_COST = 2  # points deducted per hint used
     MAX_HINTS = 3
+    SNAPSHOT_FIELDS = (
+        'current_riddle', 'riddle_active', 'players_answered', 'hints_revealed',
+        'round_number', 'riddle_pool', 'used_riddles',
+    )
 
     def __init__(self, game_id: str, host: str, settings: Optional[dict] = None):
         super().__init__(game_id=game_id, host=host, game_type='riddles', settings=settings or {
@@ -32,11 +37,14 @@ class RiddlesGame(BaseGame):
         self.hints_revealed: int = 0
         self.round_number = 0
         self.data_service = get_data_service()
+        self.riddle_pool: list[dict] = []
+        self.used_riddles: set[int] = set()  # track used indices
+        if self._restoring:
+            return  # the pool comes from the snapshot
         self.data_service.prefetch_for_room(self.game_id, 'riddles', count=30)
 
-        # Load riddle pool
-        self.riddle_pool: list[dict] = self.data_service.get_items_for_room(self.game_id, 'riddles', count=30)
-        self.used_riddles: set[int] = set()  # track used indices
+        # Load riddle pool (whatever is cached now; the local riddles cover a cold cache)
+        self.riddle_pool = self.data_service.get_items_for_room(self.game_id, 'riddles', count=30, wait=False)
         if not self.riddle_pool:
             self._load_riddles()
 
@@ -193,37 +201,31 @@ class RiddlesGame(BaseGame):
     @staticmethod
     def _normalize(text: str) -> str:
         """Normalize Arabic text for comparison."""
-        if not text:
-            return ''
-        t = text.strip().lower()
-        t = t.replace('أ', 'ا').replace('إ', 'ا').replace('آ', 'ا')
-        t = t.replace('ة', 'ه').replace('ى', 'ي')
-        t = t.replace('ؤ', 'و').replace('ئ', 'ي')
-        import re
-        t = re.sub(r'[\u064B-\u065F\u0670]', '', t)
-        t = re.sub(r'[^\w\s]', '', t)  # remove punctuation
-        return t
+        return normalize_arabic(text, strip_punctuation=True)
 
     # ── Serialization ─────────────────────────────────────────────────
 
+    def public_riddle(self) -> Optional[dict]:
+        """The current riddle as broadcast, with its revealed hints."""
+        if not self.current_riddle:
+            return None
+        riddle_data = {
+            'riddle': self.current_riddle['riddle'],
+            'category': self.current_riddle.get('category', ''),
+            'difficulty': self.current_riddle.get('difficulty', ''),
+            'hints_revealed': self.hints_revealed,
+            'hints': self.current_riddle.get('hints', [])[:self.hints_revealed],
+        }
+        # Only include answer if riddle is not active
+        if not self.riddle_active:
+            riddle_data['answer'] = self.current_riddle['answer']
+        return riddle_data
+
     def to_dict(self, **kwargs) -> dict:
         """Serialize game state for broadcasting."""
-        riddle_data = None
-        if self.current_riddle:
-            riddle_data = {
-                'riddle': self.current_riddle['riddle'],
-                'category': self.current_riddle.get('category', ''),
-                'difficulty': self.current_riddle.get('difficulty', ''),
-                'hints_revealed': self.hints_revealed,
-                'hints': self.current_riddle.get('hints', [])[:self.hints_revealed],
-            }
-            # Only include answer if riddle is not active
-            if not self.riddle_active:
-                riddle_data['answer'] = self.current_riddle['answer']
-
         state = self._build_base_state()
         state.update({
-            'current_riddle': riddle_data,
+            'current_riddle': self.public_riddle(),
             'riddle_active': self.riddle_active,
             'round_number': self.round_number,
             'players_answered': list(self.players_answered),
@@ -5,6 +5,11 @@ from games.base import BaseGame
 from services.data_service import get_data_service
 
 class TriviaGame(BaseGame):
+    SNAPSHOT_FIELDS = (
+        'current_question', 'question_active', 'round_start_time',
+        'players_answered', 'players_answered_wrong',
+    )
+
     def __init__(self, game_id, host, settings=None):
         super().__init__(game_id=game_id, host=host, game_type='trivia', settings=settings or {
             'teams': False,
@@ -22,7 +27,8 @@ class TriviaGame(BaseGame):
         self.data_service = get_data_service()
 
         # Pre-fetch questions for this room (30 questions as per requirements)
-        self.data_service.prefetch_for_room(self.game_id, 'trivia', count=30)
+        if not self._restoring:
+            self.data_service.prefetch_for_room(self.game_id, 'trivia', count=30)
 
         # Legacy support - keep for backward compatibility
         self.questions = []
@@ -101,15 +107,18 @@ class TriviaGame(BaseGame):
     def add_score(self, player_name, points):
         super().add_score(player_name, points)
 
-    def to_dict(self, include_answer=False):
-        q = None
-        if self.current_question:
-            q = self.current_question.copy()
-            if not include_answer:
-                q.pop('answer', None)
+    def public_question(self, include_answer=False):
+        """The current question as broadcast (without its answer unless asked)."""
+        if not self.current_question:
+            return None
+        q = self.current_question.copy()
+        if not include_answer:
+            q.pop('answer', None)
+        return q
 
+    def to_dict(self, include_answer=False):
         state = self._build_base_state()
         state.update({
-            'current_question': q,
+            'current_question': self.public_question(include_answer),
         })
         return state
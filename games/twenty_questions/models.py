@@ -9,6 +9,7 @@ Game ends when someone guesses correctly or 20 questions are exhausted.
 import json
 import random
 from typing import Optional
+from games.arabic_text import normalize_arabic
 from games.base import BaseGame
 
 
@@ -16,6 +17,10 @@ class TwentyQuestionsGame(BaseGame):
     """Twenty Questions game: deduction through yes/no questions."""
 
     MAX_QUESTIONS = 20
+    SNAPSHOT_FIELDS = (
+        'thinker', 'secret_word', 'secret_category', 'questions_asked', 'question_count',
+        'current_asker', 'guesses_made', 'round_number', 'thinker_index',
+    )
 
     def __init__(self, game_id: str, host: str, settings: Optional[dict] = None):
         super().__init__(game_id=game_id, host=host, game_type='twenty_questions', settings=settings or {
@@ -36,7 +41,8 @@ class TwentyQuestionsGame(BaseGame):
 
         # Word pool
         self.word_pool: list[dict] = []
-        self._load_word_pool()
+        if not self._restoring:
+            self._load_word_pool()
 
     # ── Player management ─────────────────────────────────────────────
 
@@ -106,6 +112,8 @@ class TwentyQuestionsGame(BaseGame):
 
     def get_random_word(self) -> dict:
         """Get a random word suggestion for the thinker."""
+        if not self.word_pool:
+            self._load_word_pool()  # restored rooms load it on first use
         if self.word_pool:
             return random.choice(self.word_pool)
         return {'word': 'قطة', 'category': 'حيوان'}
@@ -262,16 +270,7 @@ class TwentyQuestionsGame(BaseGame):
     @staticmethod
     def _normalize(text: str) -> str:
         """Normalize Arabic text for comparison."""
-        if not text:
-            return ''
-        t = text.strip().lower()
-        t = t.replace('أ', 'ا').replace('إ', 'ا').replace('آ', 'ا')
-        t = t.replace('ة', 'ه').replace('ى', 'ي')
-        t = t.replace('ؤ', 'و').replace('ئ', 'ي')
-        # Remove diacritics
-        import re
-        t = re.sub(r'[\u064B-\u065F\u0670]', '', t)
-        return t
+        return normalize_arabic(text)
 
     # ── Serialization ─────────────────────────────────────────────────
 
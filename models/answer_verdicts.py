@@ -0,0 +1,23 @@
+"""
+Database model for cached AI verdicts on Bus Complete answers.
+"""
+from datetime import datetime
+from sqlalchemy import Column, Boolean, String, DateTime
+
+from models.game_items import Base
+
+
+class AnswerVerdict(Base):
+    """
+    Whether a normalized word fits a category, as judged once by the AI model.
+    """
+    __tablename__ = 'answer_verdicts'
+
+    category = Column(String(50), primary_key=True)
+    word = Column(String(200), primary_key=True)
+    valid = Column(Boolean, nullable=False)
+    model = Column(String(100))
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<AnswerVerdict(category={self.category}, word={self.word}, valid={self.valid})>"
@@ -3,12 +3,15 @@ Database models for tracking game items (movies, questions, vocabulary)
 with usage statistics and caching support.
 """
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, JSON, Index, text
+from sqlalchemy import create_engine, event, Column, Integer, String, DateTime, JSON, Index, text
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+import functools
 import hashlib
 import json as json_module
 import os
+import threading
 
 Base = declarative_base()
 
@@ -33,7 +36,8 @@ class GameItem(Base):
     __table_args__ = (
         Index('idx_game_type_last_used', 'game_type', 'last_used'),
         Index('idx_game_type_category', 'game_type', 'category'),
-        Index('idx_game_type_content_hash', 'game_type', 'content_hash'),
+        # Deduplication key: bulk inserts skip rows that collide on it
+        Index('uq_game_type_content_hash', 'game_type', 'content_hash', unique=True),
     )
     
     def __repr__(self):
@@ -60,13 +64,136 @@ class RoomItemUsage(Base):
 
 
 # Database setup
-DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'game_data.db')
-engine = create_engine(f'sqlite:///{DB_PATH}', echo=False)
+DB_PATH = os.getenv('FAMILY_GAMES_DB_PATH') or os.path.join(os.path.dirname(os.path.dirname(__file__)), 'game_data.db')
+# Milliseconds a connection waits for another writer's lock before "database is locked"
+DB_BUSY_TIMEOUT_MS = int(os.getenv('FAMILY_GAMES_DB_BUSY_TIMEOUT_MS', '5000'))
+DB_SYNCHRONOUS = os.getenv('FAMILY_GAMES_DB_SYNCHRONOUS', 'NORMAL').upper()
+# Connections kept open for green threads; overflow connections are closed after use
+DB_POOL_SIZE = int(os.getenv('FAMILY_GAMES_DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.getenv('FAMILY_GAMES_DB_MAX_OVERFLOW', '20'))
+# Read-only connections for selects (0 sends reads through the write pool)
+DB_READ_POOL_SIZE = int(os.getenv('FAMILY_GAMES_DB_READ_POOL_SIZE', '5'))
+
+
+def _apply_pragmas(dbapi_connection, connection_record, read_only=False):
+    if not read_only:
+        # Transactions are begun by _begin_transaction instead of the driver
+        dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+        else:
+            # WAL lets readers run alongside the single writer; NORMAL syncs at checkpoints only
+            cursor.execute("PRAGMA journal_mode = WAL")
+            cursor.execute(f"PRAGMA synchronous = {DB_SYNCHRONOUS}")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+    finally:
+        cursor.close()
+
+
+class _WriteLock:
+    """
+    Queues this process's write transactions in order (a green lock under eventlet)
+    instead of leaving them to poll SQLite's busy handler, which can starve a waiter.
+
+    Not re-entrant on purpose: a write session opened while the same thread
+    holds another would wait on the outer one's database lock, so it fails at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._owner = None
+
+    def acquire(self):
+        if self._owner == threading.get_ident():
+            raise RuntimeError("Nested write transaction: finish the open write session first")
+        if not self._lock.acquire(timeout=DB_BUSY_TIMEOUT_MS / 1000):
+            raise TimeoutError(f"Waited {DB_BUSY_TIMEOUT_MS} ms for the database write lock")
+        self._owner = threading.get_ident()
+
+    def release(self):
+        self._owner = None
+        self._lock.release()
+
+
+def _begin_transaction(connection, write_lock):
+    if connection.get_execution_options().get('deferred_begin'):
+        # Read sessions: a deferred transaction reads the last commit without any lock
+        connection.exec_driver_sql("BEGIN")
+        return
+    write_lock.acquire()
+    connection.info['holds_write_lock'] = True
+    try:
+        # Take the database lock up front: a read transaction upgraded to a
+        # write in WAL mode fails at once (SQLITE_BUSY_SNAPSHOT) instead of waiting
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+    except Exception:
+        _end_transaction(connection, write_lock)
+        raise
+
+
+def _end_transaction(connection, write_lock):
+    if connection.info.pop('holds_write_lock', False):
+        write_lock.release()
+
+
+def create_storage_engine(path=DB_PATH, read_only=False, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW):
+    """
+    SQLite engine tuned for many green threads sharing one database file.
+    
+    Every new connection gets WAL mode, synchronous=NORMAL and a busy
+    timeout. Transactions start with BEGIN IMMEDIATE behind a per-engine
+    lock, so this process's writers queue in order and other processes wait
+    on the busy timeout rather than failing; binds with the ``deferred_begin``
+    execution option start plain deferred transactions for reads instead.
+    Connections are pooled rather than opened per session, and may be handed
+    between green threads. Read-only engines open the file with mode=ro and
+    keep SQLite's deferred transactions, so selects never wait for the write lock.
+    """
+    url = f'sqlite:///file:{path}?mode=ro&uri=true' if read_only else f'sqlite:///{path}'
+    storage_engine = create_engine(
+        url,
+        echo=False,
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        connect_args={'check_same_thread': False, 'timeout': DB_BUSY_TIMEOUT_MS / 1000},
+    )
+    event.listen(storage_engine, 'connect', functools.partial(_apply_pragmas, read_only=read_only))
+    if not read_only:
+        write_lock = _WriteLock()
+        event.listen(storage_engine, 'begin', functools.partial(_begin_transaction, write_lock=write_lock))
+        for name in ('commit', 'rollback'):
+            event.listen(storage_engine, name, functools.partial(_end_transaction, write_lock=write_lock))
+    return storage_engine
+
+
+engine = create_storage_engine()
 SessionLocal = sessionmaker(bind=engine)
+read_engine = None
+ReadSessionLocal = None
+
+
+def _open_read_engine():
+    """(Re)open the read-only pool on the database file SessionLocal writes to."""
+    global read_engine, ReadSessionLocal
+    path = SessionLocal.kw['bind'].url.database
+    if DB_READ_POOL_SIZE <= 0 or not path or path == ':memory:':
+        return
+    if read_engine is not None:
+        if read_engine.url.database == f'file:{path}':
+            return
+        read_engine.dispose()
+    read_engine = create_storage_engine(path, read_only=True, pool_size=DB_READ_POOL_SIZE)
+    ReadSessionLocal = sessionmaker(bind=read_engine)
 
 def init_db():
     """Initialize database tables and migrate schema if needed"""
     Base.metadata.create_all(engine)
+    # Opened after create_all: mode=ro needs the file to exist
+    _open_read_engine()
     
     # Migration: Add content_hash column if it doesn't exist
     session = SessionLocal()
@@ -79,6 +206,28 @@ def init_db():
             session.execute(text("ALTER TABLE game_items ADD COLUMN content_hash VARCHAR(64)"))
             session.commit()
             print("Migration: Added content_hash column to game_items table")
+        
+        # Migration: make (game_type, content_hash) unique, keeping the oldest copy of duplicates
+        indexes = [row[1] for row in session.execute(text("PRAGMA index_list(game_items)")).fetchall()]
+        if 'uq_game_type_content_hash' not in indexes:
+            duplicates = (
+                "SELECT id FROM game_items WHERE content_hash IS NOT NULL AND id NOT IN "
+                "(SELECT MIN(id) FROM game_items WHERE content_hash IS NOT NULL GROUP BY game_type, content_hash)"
+            )
+            # Room history of a removed copy now points at the copy that is kept
+            session.execute(text(
+                "UPDATE room_item_usage SET item_id = ("
+                "SELECT MIN(kept.id) FROM game_items AS copy JOIN game_items AS kept "
+                "ON kept.game_type = copy.game_type AND kept.content_hash = copy.content_hash "
+                f"WHERE copy.id = room_item_usage.item_id) WHERE item_id IN ({duplicates})"
+            ))
+            removed = session.execute(text(f"DELETE FROM game_items WHERE id IN ({duplicates})")).rowcount
+            session.execute(text("DROP INDEX IF EXISTS idx_game_type_content_hash"))
+            session.execute(text(
+                "CREATE UNIQUE INDEX uq_game_type_content_hash ON game_items (game_type, content_hash)"
+            ))
+            session.commit()
+            print(f"Migration: Made (game_type, content_hash) unique, removed {removed} duplicate item(s)")
     except Exception as e:
         session.rollback()
         print(f"Migration warning: {e}")
@@ -89,6 +238,12 @@ def get_session():
     """Get a new database session"""
     return SessionLocal()
 
+def get_read_session():
+    """Session for selects: a read-only connection when configured, else a deferred (lock-free) one"""
+    if ReadSessionLocal is not None and read_engine.url.database == f'file:{SessionLocal.kw["bind"].url.database}':
+        return ReadSessionLocal()
+    return SessionLocal(bind=SessionLocal.kw['bind'].execution_options(deferred_begin=True))
+
 
 def compute_content_hash(game_type: str, item_data: dict) -> str:
     """
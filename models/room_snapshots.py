@@ -0,0 +1,23 @@
+"""
+Database model for persisted game room snapshots (warm restarts).
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+
+from models.game_items import Base
+
+
+class RoomSnapshot(Base):
+    """
+    Latest snapshot of one live room, as produced by ``BaseGame.to_snapshot``.
+    """
+    __tablename__ = 'room_snapshots'
+
+    game_id = Column(String(50), primary_key=True)
+    game_type = Column(String(50), nullable=False)
+    state_version = Column(Integer, default=0)
+    snapshot = Column(JSON, nullable=False)
+    saved_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<RoomSnapshot(game_id={self.game_id}, type={self.game_type}, version={self.state_version})>"
@@ -0,0 +1,23 @@
+"""
+Database model for the translation memory of fetched trivia questions.
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, JSON, Text
+
+from models.game_items import Base
+
+
+class TranslationMemoryEntry(Base):
+    """
+    Arabic translation of one source question, keyed by the hash of its English text.
+    """
+    __tablename__ = 'translation_memory'
+
+    source_hash = Column(String(64), primary_key=True)
+    source_text = Column(Text, nullable=False)
+    translation = Column(JSON, nullable=False)
+    model = Column(String(100))
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TranslationMemoryEntry(source_hash={self.source_hash[:12]}, model={self.model})>"
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+# (category, answer, client sequence number)
+AnswerPatch = tuple[str, str, Optional[int]]
+# (game_id, player_name)
+PlayerKey = tuple[str, str]
+
+
+class AnswerPatchThrottle:
+    """Per-player rate limit for Bus Complete answer patches.
+
+    A player's first patch in each ``interval`` is applied straight away.
+    Patches arriving sooner are held, keeping only the newest per category,
+    and are handed back by ``drain`` once the interval has passed, so a fast
+    typist costs the room at most one apply per interval.
+    """
+
+    def __init__(self, interval: float = 0.2, clock: Callable[[], float] = time.monotonic) -> None:
+        self.interval = interval
+        self._clock = clock
+        self._last_applied: dict[PlayerKey, float] = {}
+        # player key -> {category: patch}
+        self._held: dict[PlayerKey, dict[str, AnswerPatch]] = {}
+
+    def admit(self, key: PlayerKey, category: str, answer: str, seq: Optional[int]) -> bool:
+        """True when the patch should be applied now; otherwise it is held."""
+        held = self._held.get(key)
+        if held is None:
+            now = self._clock()
+            if now - self._last_applied.get(key, float('-inf')) >= self.interval:
+                self._last_applied[key] = now
+                return True
+            held = self._held[key] = {}
+        previous = held.get(category)
+        if previous is None or seq is None or previous[2] is None or seq > previous[2]:
+            held[category] = (category, answer, seq)
+        return False
+
+    def delay(self, key: PlayerKey) -> float:
+        """Seconds until the held patches of ``key`` may be applied."""
+        elapsed = self._clock() - self._last_applied.get(key, float('-inf'))
+        return max(0.0, self.interval - elapsed)
+
+    def drain(self, key: PlayerKey) -> list[AnswerPatch]:
+        held = self._held.pop(key, None)
+        if not held:
+            return []
+        self._last_applied[key] = self._clock()
+        return list(held.values())
+
+    def drain_room(self, game_id: str) -> dict[str, list[AnswerPatch]]:
+        """Every held patch of a room, by player."""
+        return {key[1]: self.drain(key) for key in [key for key in self._held if key[0] == game_id]}
+
+    def forget_room(self, game_id: str) -> None:
+        for key in [key for key in self._last_applied if key[0] == game_id]:
+            del self._last_applied[key]
+        for key in [key for key in self._held if key[0] == game_id]:
+            del self._held[key]
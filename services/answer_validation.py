@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+GROQ_MODEL = 'llama-3.3-70b-versatile'
+CATEGORIES_DESCRIPTION = {
+    'اسم': 'human first name (Arabic or common)',
+    'حيوان': 'animal (mammal, bird, fish, insect, reptile)',
+    'نبات': 'plant, flower, tree, fruit, or vegetable',
+    'جماد': 'inanimate physical object',
+    'بلاد': 'country or city',
+    'أكلة': 'food or dish',
+    'مهنة': 'job or profession title',
+}
+
+# Completion budget: the JSON wrapper plus one {"word", "category", "valid"} object per pair
+RESPONSE_BASE_TOKENS = 100
+TOKENS_PER_VERDICT = 40
+# A complete result object inside a response that was cut off
+RESULT_OBJECT = re.compile(r'\{[^{}]*\}')
+
+# (category, normalized word) -> fits the category
+Verdicts = dict[tuple[str, str], bool]
+# (category, normalized word, answer as the player wrote it)
+AnswerPair = tuple[str, str, str]
+
+
+def build_prompt(pairs: Iterable[tuple[str, str]]) -> str:
+    items_text = []
+    for cat, ans in pairs:
+        desc = CATEGORIES_DESCRIPTION.get(cat, cat)
+        items_text.append(f'  "{ans}" -> category "{cat}" ({desc})')
+
+    return f"""You are a judge for the Arabic word game "اتوبيس كومبليت" (Bus Complete).
+Players write one word per category, all starting with the same letter.
+
+Your job: check if each word reasonably fits its category.
+
+CATEGORIES:
+- اسم = Any real human first name (Arabic, foreign, or dialect names all count)
+- حيوان = Any animal (mammal, bird, fish, insect, reptile)
+- نبات = Any plant, flower, tree, fruit, or vegetable
+- جماد = Any inanimate physical object (tool, furniture, device, etc.)
+- بلاد = Any country, city, island, or region. Accept variant spellings.
+- أكلة = Any food, dish, dessert, or snack (including regional/dialect foods)
+- مهنة = Any job, profession, occupation, or field of work (e.g. زراعة = agriculture/farming counts as مهنة)
+
+KEY RULES:
+- BE LENIENT: if a word can reasonably fit the category, accept it
+- Dialect/colloquial words are VALID (e.g. زلومة is a real Levantine food)
+- Names that also have other meanings still count as names (e.g. زيادة is both a name and a word)
+- Fields of work count as مهنة (زراعة = farming, تجارة = trade, هندسة = engineering)
+- ONLY reject if the word clearly belongs to a completely different category
+  Example: زرافة (giraffe) is حيوان, so it's INVALID for نبات
+
+Words to validate:
+{chr(10).join(items_text)}
+
+Return JSON: {{"results": [{{"word":"...","category":"...","valid":true/false}}]}}"""
+
+
+def parse_results(raw: str) -> list[dict[str, Any]]:
+    raw = raw.strip()
+    # Strip markdown code fences if present
+    if raw.startswith('```'):
+        raw = raw.split('\n', 1)[1].rsplit('```', 1)[0].strip()
+
+    parsed = json.loads(raw)
+    # Handle both {"results": [...]} and [...] formats
+    if isinstance(parsed, dict):
+        results = parsed.get('results', parsed.get('data', parsed.get('words', [])))
+        if not results:
+            # Try first list-valued key
+            for v in parsed.values():
+                if isinstance(v, list):
+                    results = v
+                    break
+        return results
+    return parsed
+
+
+def salvage_results(raw: str) -> list[dict[str, Any]]:
+    """The complete result objects of a truncated response."""
+    results = []
+    for match in RESULT_OBJECT.finditer(raw):
+        try:
+            result = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            continue
+        if {'word', 'category', 'valid'} <= result.keys():
+            results.append(result)
+    return results
+
+
+class GroqJudge:
+    """Asks the Groq model whether answers fit their categories, many per request.
+
+    ``GROQ_BASE_URL`` points the client elsewhere (a local stub in tests).
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 model: str = GROQ_MODEL, timeout: float = 8) -> None:
+        self.api_key = api_key if api_key is not None else os.getenv('GROQ_API_KEY', '')
+        self.base_url = base_url or os.getenv('GROQ_BASE_URL') or None
+        self.model = model
+        self.timeout = timeout
+        self._client = None  # lazy-initialized
+
+    def available(self) -> bool:
+        return bool(self.api_key) and self.api_key != 'your_groq_api_key_here'
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            from groq import Groq
+            self._client = Groq(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+        return self._client
+
+    def __call__(self, pairs: list[tuple[str, str]]) -> dict[tuple[str, str], bool]:
+        """Judge ``(category, answer)`` pairs; {} when the model is unavailable."""
+        if not pairs or not self.available():
+            return {}
+        prompt = build_prompt(pairs)
+        for attempt in range(2):
+            try:
+                response = self._get_client().chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0,
+                    max_tokens=RESPONSE_BASE_TOKENS + TOKENS_PER_VERDICT * len(pairs),
+                    timeout=self.timeout,
+                    response_format={"type": "json_object"},
+                )
+                content = response.choices[0].message.content
+                try:
+                    results = parse_results(content)
+                except json.JSONDecodeError:
+                    # Keep whatever verdicts completed; the rest are asked again later
+                    results = salvage_results(content)
+                    if not results:
+                        raise
+                    logger.warning(f"AI response was cut off ({response.choices[0].finish_reason}); "
+                                   f"kept {len(results)} of {len(pairs)} verdicts")
+                ai_map = {(r['category'], r['word']): bool(r['valid']) for r in results}
+                logger.info(f"AI validated {len(ai_map)} word-category pairs")
+                return ai_map
+            except json.JSONDecodeError as e:
+                logger.warning(f"AI JSON parse error (attempt {attempt+1}): {e}")
+                continue
+            except Exception as e:
+                logger.warning(f"Groq AI validation failed: {e}")
+                return {}
+
+        logger.warning("AI validation failed after retries")
+        return {}
+
+
+class VerdictCache:
+    """AI verdicts keyed by (category, normalized word), in memory and in SQLite."""
+
+    def __init__(self, session_factory: Optional[Callable[[], Any]] = None,
+                 read_session_factory: Optional[Callable[[], Any]] = None) -> None:
+        if session_factory is None:
+            from models.game_items import get_read_session, get_session, init_db
+            import models.answer_verdicts  # noqa: F401 - registers the table for init_db
+            init_db()
+            session_factory = get_session
+            read_session_factory = read_session_factory or get_read_session
+        self._session_factory = session_factory
+        self._read_session_factory = read_session_factory or session_factory
+        self._memory: Verdicts = {}
+
+    def get_many(self, keys: Iterable[tuple[str, str]]) -> Verdicts:
+        keys = set(keys)
+        found = {key: self._memory[key] for key in keys if key in self._memory}
+        missing = keys - found.keys()
+        if not missing:
+            return found
+
+        from models.answer_verdicts import AnswerVerdict
+        session = self._read_session_factory()
+        try:
+            rows = session.query(AnswerVerdict).filter(
+                AnswerVerdict.word.in_({word for _, word in missing})
+            ).all()
+            for row in rows:
+                key = (row.category, row.word)
+                self._memory[key] = row.valid
+                if key in missing:
+                    found[key] = row.valid
+        except Exception as e:
+            logger.warning(f"Failed to read cached verdicts: {e}")
+        finally:
+            session.close()
+        return found
+
+    def save(self, verdicts: Verdicts, model: str = GROQ_MODEL) -> None:
+        if not verdicts:
+            return
+        self._memory.update(verdicts)
+        from models.answer_verdicts import AnswerVerdict
+        session = self._session_factory()
+        try:
+            for (category, word), valid in verdicts.items():
+                session.merge(AnswerVerdict(
+                    category=category, word=word, valid=valid, model=model, created_at=datetime.utcnow(),
+                ))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Failed to save {len(verdicts)} verdict(s): {e}")
+        finally:
+            session.close()
+
+
+class AnswerValidationService:
+    """Cross-room AI validation of Bus Complete answers.
+
+    Rooms ``submit`` their (category, word) pairs and get cached verdicts
+    back straight away. Unknown pairs from all rooms are queued; a single
+    background loop waits ``window`` seconds after the first one arrives,
+    sends everything queued (up to ``max_batch`` pairs) to the judge in one
+    request through ``run_blocking``, caches the verdicts and hands each
+    room its share through the room's callback.
+    """
+
+    def __init__(
+        self,
+        judge: Callable[[list[tuple[str, str]]], dict[tuple[str, str], bool]],
+        cache: Any,
+        spawn: Callable[..., Any],
+        sleep: Callable[[float], Any] = time.sleep,
+        window: float = 0.25,
+        max_batch: int = 60,
+        run_blocking: Optional[Callable[..., Any]] = None,
+    ) -> None:
+        self.judge = judge
+        self.cache = cache
+        self._spawn = spawn
+        self._sleep = sleep
+        self.window = window
+        self.max_batch = max_batch
+        self._run_blocking = run_blocking or (lambda func, *args: func(*args))
+        self._queue: queue.Queue = queue.Queue()
+        self._running = False
+        self._guard = threading.Lock()
+        self._counters = {'submitted': 0, 'cache_hits': 0, 'judged': 0, 'requests': 0}
+        self._counters_guard = threading.Lock()
+
+    def _count(self, **increments: int) -> None:
+        with self._counters_guard:
+            for name, amount in increments.items():
+                self._counters[name] += amount
+
+    def available(self) -> bool:
+        available = getattr(self.judge, 'available', None)
+        return available() if available else True
+
+    def submit(self, pairs: Iterable[AnswerPair], callback: Callable[[Verdicts], Any]) -> Verdicts:
+        """Cached verdicts for ``pairs`` now; the rest arrive later through ``callback``."""
+        pairs = {(cat, norm): answer for cat, norm, answer in pairs}
+        cached = self.cache.get_many(pairs)
+        self._count(submitted=len(pairs), cache_hits=len(cached))
+        pending = [(cat, norm, pairs[(cat, norm)]) for cat, norm in pairs if (cat, norm) not in cached]
+        if pending and self.available():
+            self._queue.put((pending, callback))
+            self._ensure_running()
+        return cached
+
+    def _ensure_running(self) -> None:
+        with self._guard:
+            if self._running:
+                return
+            self._running = True
+        self._spawn(self._run)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            self._sleep(self.window)
+            size = len(batch[0][0])
+            while size < self.max_batch:
+                try:
+                    request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += len(request[0])
+            try:
+                self.flush(batch)
+            except Exception:
+                logger.exception('AI answer validation batch failed')
+
+    def flush(self, batch: list[tuple[list[AnswerPair], Callable[[Verdicts], Any]]]) -> Verdicts:
+        """Judge one batch of room requests and deliver each room's verdicts."""
+        # Pairs judged since the request was queued (another room asked first)
+        wanted = {(cat, norm): answer for pending, _ in batch for cat, norm, answer in pending}
+        verdicts = self.cache.get_many(wanted)
+        unknown = [(cat, norm) for cat, norm in wanted if (cat, norm) not in verdicts]
+        if unknown:
+            judged = self._run_blocking(self.judge, [(cat, wanted[(cat, norm)]) for cat, norm in unknown])
+            answers = {(cat, wanted[(cat, norm)]): (cat, norm) for cat, norm in unknown}
+            new = {answers[key]: valid for key, valid in judged.items() if key in answers}
+            self._count(requests=1, judged=len(new))
+            self.cache.save(new)
+            verdicts.update(new)
+
+        for pending, callback in batch:
+            share = {(cat, norm): verdicts[(cat, norm)] for cat, norm, _ in pending if (cat, norm) in verdicts}
+            if share:
+                try:
+                    callback(share)
+                except Exception:
+                    logger.exception('AI verdict callback failed')
+        return verdicts
+
+    def stats(self) -> dict[str, int]:
+        with self._counters_guard:
+            counters = dict(self._counters)
+        return {**counters, 'queued': self._queue.qsize()}
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Optional
+
+
+class ConnectionRegistry:
+    """Which socket belongs to which player of which room.
+
+    Keeps ``(room_id, player_name) -> sid`` and ``sid -> (room_id, player_name)``
+    in step, so private emits and disconnects are single lookups and players
+    with the same name in different rooms never share an entry. A player has
+    at most one live sid per room and a sid belongs to at most one player.
+    """
+
+    def __init__(self) -> None:
+        # room_id -> player_name -> sid
+        self._rooms: dict[str, dict[str, str]] = {}
+        self._by_sid: dict[str, tuple[str, str]] = {}
+
+    def bind(self, sid: str, room_id: str, player_name: str) -> None:
+        room_id = str(room_id)
+        self.unbind(sid)
+        players = self._rooms.setdefault(room_id, {})
+        previous_sid = players.get(player_name)
+        if previous_sid is not None:
+            self._by_sid.pop(previous_sid, None)
+        players[player_name] = sid
+        self._by_sid[sid] = (room_id, player_name)
+
+    def unbind(self, sid: str) -> Optional[tuple[str, str]]:
+        """Drop a socket; returns the (room_id, player_name) it was bound to."""
+        binding = self._by_sid.pop(sid, None)
+        if binding is None:
+            return None
+        room_id, player_name = binding
+        players = self._rooms.get(room_id)
+        if players and players.get(player_name) == sid:
+            del players[player_name]
+            if not players:
+                del self._rooms[room_id]
+        return binding
+
+    def sid_for(self, room_id: str, player_name: str) -> Optional[str]:
+        return self._rooms.get(str(room_id), {}).get(player_name)
+
+    def binding_for(self, sid: str) -> Optional[tuple[str, str]]:
+        return self._by_sid.get(sid)
+
+    def forget_player(self, room_id: str, player_name: str) -> None:
+        sid = self.sid_for(room_id, player_name)
+        if sid is not None:
+            self.unbind(sid)
+
+    def forget_room(self, room_id: str) -> None:
+        for sid in self._rooms.pop(str(room_id), {}).values():
+            self._by_sid.pop(sid, None)
+
+    def count(self, room_id: str) -> int:
+        """Live connections in a room."""
+        return len(self._rooms.get(str(room_id), ()))
+
+    def __len__(self) -> int:
+        return len(self._by_sid)
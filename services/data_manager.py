@@ -3,8 +3,12 @@ Data Manager Service
 Handles caching, pre-fetching, and item distribution for all game types.
 """
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from models.game_items import GameItem, RoomItemUsage, get_session, init_db, compute_content_hash
+from typing import List, Dict, Optional, Set, Tuple
+import threading
+from collections import Counter
+from sqlalchemy import bindparam, exists, insert, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models.game_items import GameItem, RoomItemUsage, get_read_session, get_session, init_db, compute_content_hash
 import random
 
 
@@ -16,10 +20,19 @@ class DataManager:
     
     BATCH_SIZE = 30
     REFETCH_THRESHOLD = 10
+    INGEST_CHUNK = 1000  # rows per INSERT statement in ingest_items
     
     def __init__(self):
         """Initialize database"""
         init_db()
+        # (game_type, category or None) -> {'total_items', 'unused_items', 'oldest_unused_date'}
+        # kept up to date by add_items/get_items_for_room/record_usage and
+        # reconciled against the database by reconcile_cache_status
+        self._status = {}
+        self._stale_oldest = set()  # keys whose oldest unused item was just used
+        self._status_lock = threading.Lock()
+        self.last_drift = {}
+        self.reconciled_at = None
     
     def get_items_for_room(self, room_id: str, game_type: str, category: Optional[str] = None, count: int = 1) -> List[Dict]:
         """
@@ -36,13 +49,6 @@ class DataManager:
         """
         session = get_session()
         try:
-            # Get items already used in this room
-            used_item_ids = session.query(RoomItemUsage.item_id).filter(
-                RoomItemUsage.room_id == room_id
-            ).all()
-            used_ids = [item_id for (item_id,) in used_item_ids]
-            
-            # Build query for available items
             query = session.query(GameItem).filter(
                 GameItem.game_type == game_type
             )
@@ -50,9 +56,12 @@ class DataManager:
             if category:
                 query = query.filter(GameItem.category == category)
             
-            # Exclude already used items in this room
-            if used_ids:
-                query = query.filter(~GameItem.id.in_(used_ids))
+            # Exclude items already used in this room: a NOT EXISTS probe on
+            # idx_room_item per candidate instead of binding every used id
+            query = query.filter(~exists().where(
+                RoomItemUsage.room_id == room_id,
+                RoomItemUsage.item_id == GameItem.id,
+            ))
             
             # Order by last_used (oldest first, nulls first)
             query = query.order_by(GameItem.last_used.asc().nullsfirst())
@@ -63,23 +72,23 @@ class DataManager:
             if not items:
                 return []
             
-            # Mark items as used in this room
-            for item in items:
-                # Update item usage
-                item.last_used = datetime.utcnow()
-                item.use_count += 1
-                
-                # Track room usage
-                room_usage = RoomItemUsage(
-                    room_id=room_id,
-                    item_id=item.id
-                )
-                session.add(room_usage)
-            
-            session.commit()
+            # Mark items as used in this room: one UPDATE and one batched INSERT
+            item_ids = [item.id for item in items]
+            first_uses = [(item.game_type, item.category, item.created_at) for item in items if item.last_used is None]
+            now = datetime.utcnow()
+            session.query(GameItem).filter(GameItem.id.in_(item_ids)).update(
+                {GameItem.last_used: now, GameItem.use_count: GameItem.use_count + 1},
+                synchronize_session=False,
+            )
+            session.execute(insert(RoomItemUsage), [
+                {'room_id': room_id, 'item_id': item_id, 'used_at': now} for item_id in item_ids
+            ])
             
             # Return item data
-            return [item.item_data for item in items]
+            data = [item.item_data for item in items]
+            session.commit()
+            self._count_first_uses(first_uses)
+            return data
             
         except Exception as e:
             session.rollback()
@@ -87,19 +96,103 @@ class DataManager:
         finally:
             session.close()
     
+    def load_items(self, game_type: str, category: Optional[str] = None) -> List[Tuple[int, Dict, Optional[datetime]]]:
+        """All cached items of a game type (and category) as (id, item_data, last_used)."""
+        session = get_read_session()
+        try:
+            query = session.query(GameItem.id, GameItem.item_data, GameItem.last_used).filter(
+                GameItem.game_type == game_type
+            )
+            if category:
+                query = query.filter(GameItem.category == category)
+            return [tuple(row) for row in query.all()]
+        finally:
+            session.close()
+    
+    def get_used_item_ids(self, room_id: str) -> Set[int]:
+        """Ids of the items a room has already been served."""
+        session = get_read_session()
+        try:
+            return {item_id for (item_id,) in session.query(RoomItemUsage.item_id).filter(
+                RoomItemUsage.room_id == room_id
+            )}
+        finally:
+            session.close()
+    
+    def record_usage(self, events: List[Tuple[str, int, datetime]]):
+        """
+        Write (room_id, item_id, used_at) events in one transaction.
+        
+        Each item's last_used/use_count is updated once however many times
+        it appears, and the room usage rows are inserted in one batch.
+        """
+        if not events:
+            return
+        per_item = {}
+        for _, item_id, used_at in events:
+            uses, last_used = per_item.get(item_id, (0, used_at))
+            per_item[item_id] = (uses + 1, max(last_used, used_at))
+        
+        session = get_session()
+        try:
+            first_uses = session.query(GameItem.game_type, GameItem.category, GameItem.created_at).filter(
+                GameItem.id.in_(per_item), GameItem.last_used.is_(None)
+            ).all()
+            session.execute(
+                update(GameItem.__table__)
+                .where(GameItem.__table__.c.id == bindparam('item_id'))
+                .values(last_used=bindparam('used_at'), use_count=GameItem.__table__.c.use_count + bindparam('uses')),
+                [{'item_id': item_id, 'uses': uses, 'used_at': last_used}
+                 for item_id, (uses, last_used) in per_item.items()]
+            )
+            session.execute(insert(RoomItemUsage), [
+                {'room_id': room_id, 'item_id': item_id, 'used_at': used_at}
+                for room_id, item_id, used_at in events
+            ])
+            session.commit()
+            self._count_first_uses(first_uses)
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
     def get_cache_status(self, game_type: str, category: Optional[str] = None) -> Dict:
         """
         Check cache status for a game type/category.
         
+        Counters are read from the database the first time a game type or
+        category is asked for and kept in memory after that.
+        
         Returns:
             Dict with total_items, oldest_unused_date, needs_refetch
         """
-        session = get_session()
+        key = (game_type, category or None)
+        with self._status_lock:
+            status = self._status.get(key)
+            stale = key in self._stale_oldest
+        if status is None:
+            status = self._query_cache_status(*key)
+            with self._status_lock:
+                status = self._status.setdefault(key, status)
+        elif stale:
+            oldest = self._query_oldest_unused(*key)
+            with self._status_lock:
+                self._stale_oldest.discard(key)
+                status['oldest_unused_date'] = oldest
+        
+        return {**status, 'needs_refetch': status['total_items'] < self.REFETCH_THRESHOLD}
+    
+    def _status_query(self, session, game_type: str, category: Optional[str]):
+        query = session.query(GameItem).filter(GameItem.game_type == game_type)
+        if category:
+            query = query.filter(GameItem.category == category)
+        return query
+    
+    def _query_cache_status(self, game_type: str, category: Optional[str]) -> Dict:
+        session = get_read_session()
         try:
-            query = session.query(GameItem).filter(GameItem.game_type == game_type)
-            
-            if category:
-                query = query.filter(GameItem.category == category)
+            query = self._status_query(session, game_type, category)
             
             total = query.count()
             unused = query.filter(GameItem.last_used == None).count()
@@ -112,11 +205,96 @@ class DataManager:
                 'total_items': total,
                 'unused_items': unused,
                 'oldest_unused_date': oldest_unused.created_at if oldest_unused else None,
-                'needs_refetch': total < self.REFETCH_THRESHOLD
             }
         finally:
             session.close()
     
+    def _query_oldest_unused(self, game_type: str, category: Optional[str]) -> Optional[datetime]:
+        session = get_read_session()
+        try:
+            oldest_unused = self._status_query(session, game_type, category).filter(
+                GameItem.last_used == None
+            ).order_by(GameItem.created_at.asc()).first()
+            return oldest_unused.created_at if oldest_unused else None
+        finally:
+            session.close()
+    
+    def _count_added(self, game_type: str, category: str, created_at: List[datetime]):
+        if not created_at:
+            return
+        oldest = min(created_at)
+        with self._status_lock:
+            for key in {(game_type, None), (game_type, category or None)}:
+                status = self._status.get(key)
+                if status is None:
+                    continue
+                status['total_items'] += len(created_at)
+                status['unused_items'] += len(created_at)
+                if status['oldest_unused_date'] is None or oldest < status['oldest_unused_date']:
+                    status['oldest_unused_date'] = oldest
+    
+    def _count_first_uses(self, items: List[Tuple[str, Optional[str], datetime]]):
+        """Items served for the first time are no longer unused."""
+        with self._status_lock:
+            for game_type, category, created_at in items:
+                for key in {(game_type, None), (game_type, category or None)}:
+                    status = self._status.get(key)
+                    if status is None:
+                        continue
+                    status['unused_items'] -= 1
+                    oldest = status['oldest_unused_date']
+                    if oldest is None or created_at is None or created_at <= oldest:
+                        self._stale_oldest.add(key)
+    
+    def reconcile_cache_status(self) -> Dict:
+        """
+        Re-read every cached counter from the database.
+        
+        Returns the drift found, by "game_type/category": for each field that
+        differed, the cached and the actual value. Counters drift when another
+        process writes the same database.
+        """
+        drift = {}
+        with self._status_lock:
+            keys = list(self._status)
+        for key in keys:
+            actual = self._query_cache_status(*key)
+            with self._status_lock:
+                cached = self._status.get(key, {})
+                fields = ['total_items', 'unused_items']
+                if key not in self._stale_oldest:
+                    fields.append('oldest_unused_date')
+                difference = {
+                    field: {'cached': cached.get(field), 'actual': actual[field]}
+                    for field in fields if cached.get(field) != actual[field]
+                }
+                self._status[key] = actual
+                self._stale_oldest.discard(key)
+            if difference:
+                drift[f'{key[0]}/{key[1] or "*"}'] = difference
+        self.last_drift = drift
+        self.reconciled_at = datetime.utcnow()
+        return drift
+    
+    def cache_status_report(self) -> Dict:
+        """Cached counters and the drift found by the last reconciliation."""
+        def encode(value):
+            return value.isoformat() if isinstance(value, datetime) else value
+        
+        with self._status_lock:
+            counters = {
+                f'{game_type}/{category or "*"}': {field: encode(value) for field, value in status.items()}
+                for (game_type, category), status in self._status.items()
+            }
+        return {
+            'counters': counters,
+            'drift': {
+                key: {field: {side: encode(value) for side, value in values.items()} for field, values in fields.items()}
+                for key, fields in self.last_drift.items()
+            },
+            'reconciled_at': encode(self.reconciled_at),
+        }
+    
     def add_items(self, game_type: str, category: str, items: List[Dict], source: str):
         """
         Add fetched items to the cache with deduplication.
@@ -127,39 +305,52 @@ class DataManager:
             items: List of item data dictionaries
             source: Source API/website
         """
+        return self.ingest_items(game_type, [(category, item_data) for item_data in items], source)['added']
+    
+    def ingest_items(self, game_type: str, items: List[Tuple[str, Dict]], source: str) -> Dict[str, int]:
+        """
+        Bulk-add (category, item_data) pairs in one transaction.
+        
+        Rows whose content hash is already cached (or repeated within the
+        batch) are skipped by INSERT ... ON CONFLICT DO NOTHING on the
+        unique (game_type, content_hash) index.
+        
+        Returns:
+            Dict with added and skipped counts
+        """
+        rows = []
+        now = datetime.utcnow()
+        for category, item_data in items:
+            rows.append({
+                'game_type': game_type,
+                'category': category,
+                'item_data': item_data,
+                'source': source,
+                'content_hash': compute_content_hash(game_type, item_data),
+                'use_count': 0,
+                'created_at': now,
+            })
+        if not rows:
+            return {'added': 0, 'skipped': 0}
+        
+        statement = sqlite_insert(GameItem).on_conflict_do_nothing(
+            index_elements=['game_type', 'content_hash']
+        ).returning(GameItem.category)
         session = get_session()
         try:
-            added_count = 0
-            for item_data in items:
-                # Compute content hash for deduplication
-                content_hash = compute_content_hash(game_type, item_data)
-                
-                # Check if item already exists
-                existing = session.query(GameItem).filter(
-                    GameItem.game_type == game_type,
-                    GameItem.content_hash == content_hash
-                ).first()
-                
-                if existing:
-                    continue  # Skip duplicate
-                
-                game_item = GameItem(
-                    game_type=game_type,
-                    category=category,
-                    item_data=item_data,
-                    source=source,
-                    content_hash=content_hash
-                )
-                session.add(game_item)
-                added_count += 1
-            
+            added = []
+            for start in range(0, len(rows), self.INGEST_CHUNK):
+                added.extend(session.scalars(statement, rows[start:start + self.INGEST_CHUNK]))
             session.commit()
-            return added_count
         except Exception as e:
             session.rollback()
             raise e
         finally:
             session.close()
+        
+        for category, count in Counter(added).items():
+            self._count_added(game_type, category, [now] * count)
+        return {'added': len(added), 'skipped': len(rows) - len(added)}
     
     def clear_room_usage(self, room_id: str):
         """Clear usage tracking for a room (when room closes)"""
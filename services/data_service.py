@@ -6,6 +6,8 @@ from typing import List, Dict, Optional
 import os
 from dotenv import load_dotenv
 from .data_manager import DataManager
+from .item_pool import ItemPool
+from .prefetch_worker import PrefetchWorker
 from .fetchers.charades_fetcher import CharadesFetcher
 from .fetchers.pictionary_fetcher import PictionaryFetcher
 from .fetchers.riddles_fetcher import RiddlesFetcher
@@ -19,6 +21,8 @@ class DataService:
     """
     Central service for managing game data fetching and caching.
     """
+
+    GAME_TYPES = ('charades', 'pictionary', 'trivia', 'rapid_fire', 'riddles')
     
     def __init__(self, ai_api_key: Optional[str] = None):
         """
@@ -28,14 +32,31 @@ class DataService:
             ai_api_key: Optional API key for AI translation (Groq)
         """
         self.data_manager = DataManager()
+        # Items are served from memory; usage is written back in batches
+        self.item_pool = ItemPool(self.data_manager)
+        # Cache refills run in the background so rooms never wait on scraping
+        self.prefetcher = PrefetchWorker(self._refetch_items, self.item_pool.size, low=DataManager.REFETCH_THRESHOLD)
         self.charades_fetcher = CharadesFetcher()
         self.pictionary_fetcher = PictionaryFetcher()
         self.riddles_fetcher = RiddlesFetcher(source_url=os.getenv('RIDDLES_SOURCE_URL'))
         self.trivia_fetcher = TriviaFetcher(ai_api_key=ai_api_key)
     
+    def configure_prefetch(self, spawn=None, low: Optional[int] = None, high: Optional[int] = None,
+                           wait_timeout: Optional[float] = None):
+        """Replace the refill worker, e.g. to run it on the server's green threads."""
+        self.prefetcher.wait_idle()
+        self.prefetcher = PrefetchWorker(
+            self._refetch_items,
+            self.item_pool.size,
+            spawn=spawn,
+            low=self.prefetcher.low if low is None else low,
+            high=self.prefetcher.high if high is None else high,
+            wait_timeout=self.prefetcher.wait_timeout if wait_timeout is None else wait_timeout,
+        )
+
     def get_item_for_room(self, room_id: str, game_type: str, category: Optional[str] = None) -> Optional[Dict]:
         """
-        Get a single item for a room, fetching more if cache is low.
+        Get a single item for a room, queueing a refill if the cache is low.
         
         Args:
             room_id: Room identifier
@@ -45,42 +66,35 @@ class DataService:
         Returns:
             Item data dict or None
         """
-        # Check cache status
-        cache_status = self.data_manager.get_cache_status(game_type, category)
-        
-        # If cache is low, fetch more items in background
-        if cache_status['needs_refetch']:
-            self._refetch_items(game_type, category)
-        
-        # Get item from cache
-        items = self.data_manager.get_items_for_room(room_id, game_type, category, count=1)
+        items = self.get_items_for_room(room_id, game_type, category, count=1, wait=True)
         return items[0] if items else None
 
-    def get_items_for_room(self, room_id: str, game_type: str, category: Optional[str] = None, count: int = 1) -> List[Dict]:
-        """Get multiple cached items for a room with the same anti-repetition behavior."""
-        cache_status = self.data_manager.get_cache_status(game_type, category)
+    def get_items_for_room(self, room_id: str, game_type: str, category: Optional[str] = None, count: int = 1,
+                           wait: bool = True) -> List[Dict]:
+        """
+        Get multiple cached items for a room with the same anti-repetition behavior.
 
-        if cache_status['total_items'] < count or cache_status['needs_refetch']:
-            self._refetch_items(game_type, category, count=max(count, 30))
+        Only waits for the background refill (when ``wait`` is set) if the
+        room has run out of items and the pool is below its low watermark.
+        """
+        self.prefetcher.request(game_type, category)
+        items = self.item_pool.next_items(room_id, game_type, category, count=count)
 
-        return self.data_manager.get_items_for_room(room_id, game_type, category, count=count)
+        if len(items) < count and wait and self.prefetcher.wait(game_type, category):
+            items += self.item_pool.next_items(room_id, game_type, category, count=count - len(items))
+        return items
     
     def prefetch_for_room(self, room_id: str, game_type: str, category: Optional[str] = None, count: int = 30):
         """
-        Pre-fetch items when a room is created.
+        Queue a background refill when a room is created; never blocks.
         
         Args:
             room_id: Room identifier
             game_type: Type of game
             category: Optional category filter
-            count: Number of items to pre-fetch
+            count: Number of items the cache should hold for the room
         """
-        # Check if we have enough items in cache
-        cache_status = self.data_manager.get_cache_status(game_type, category)
-        
-        if cache_status['total_items'] < count:
-            # Need to fetch more items
-            self._refetch_items(game_type, category, count=count)
+        self.prefetcher.request(game_type, category, minimum=count)
     
     def _refetch_items(self, game_type: str, category: Optional[str] = None, count: int = 30):
         """
@@ -90,79 +104,49 @@ class DataService:
             game_type: Type of game
             category: Optional category filter
             count: Number of items to fetch
+
+        Fetch and storage errors propagate so the prefetch worker counts them.
         """
         try:
             if game_type == 'charades':
                 items = self.charades_fetcher.fetch_batch(count)
                 source = self.charades_fetcher.get_source_name()
-                
-                # Add items to cache
-                for item in items:
-                    item_category = item.get('category', category or 'أفلام')
-                    self.data_manager.add_items(
-                        game_type='charades',
-                        category=item_category,
-                        items=[item],
-                        source=source
-                    )
+                default_category = category or 'أفلام'
             
             elif game_type == 'pictionary':
                 items = self.pictionary_fetcher.fetch_batch(count)
                 source = self.pictionary_fetcher.get_source_name()
-                
-                # Add items to cache
-                for item in items:
-                    item_category = item.get('category', category or 'عام')
-                    self.data_manager.add_items(
-                        game_type='pictionary',
-                        category=item_category,
-                        items=[item],
-                        source=source
-                    )
+                default_category = category or 'عام'
             
             elif game_type == 'trivia':
                 items = self.trivia_fetcher.fetch_batch(count)
                 source = self.trivia_fetcher.get_source_name()
-                
-                # Add items to cache
-                for item in items:
-                    item_category = item.get('category', category or 'ثقافة عامة')
-                    self.data_manager.add_items(
-                        game_type='trivia',
-                        category=item_category,
-                        items=[item],
-                        source=source
-                    )
+                default_category = category or 'ثقافة عامة'
             elif game_type == 'rapid_fire':
                 items = self.trivia_fetcher.fetch_batch(count)
                 source = f"{self.trivia_fetcher.get_source_name()} [rapid_fire]"
-                
-                for item in items:
-                    item_category = item.get('category', category or 'ثقافة عامة')
-                    self.data_manager.add_items(
-                        game_type='rapid_fire',
-                        category=item_category,
-                        items=[item],
-                        source=source
-                    )
+                default_category = category or 'ثقافة عامة'
             elif game_type == 'riddles':
                 items = self.riddles_fetcher.fetch_batch(count)
                 source = self.riddles_fetcher.get_source_name()
-                
-                for item in items:
-                    item_category = item.get('category', category or 'ألغاز عامة')
-                    self.data_manager.add_items(
-                        game_type='riddles',
-                        category=item_category,
-                        items=[item],
-                        source=source
-                    )
+                default_category = category or 'ألغاز عامة'
+            else:
+                return
             
-        except Exception as e:
-            print(f"Error refetching items for {game_type}: {e}")
+            # Add the whole batch to the cache in one transaction
+            self.data_manager.ingest_items(
+                game_type,
+                [(item.get('category', default_category), item) for item in items],
+                source=source
+            )
+        finally:
+            # Pick up whatever made it into the cache
+            self.item_pool.refresh(game_type)
     
     def cleanup_room(self, room_id: str):
         """Clean up room usage tracking when room closes"""
+        self.item_pool.forget_room(room_id)
+        self.item_pool.flush_usage()
         self.data_manager.clear_room_usage(room_id)
     
     def get_cache_stats(self) -> Dict:
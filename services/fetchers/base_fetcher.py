@@ -1,57 +1,84 @@
 """
 Base fetcher class with common functionality for all data fetchers.
 """
-import time
 import requests
 from typing import List, Dict, Optional
 from abc import ABC, abstractmethod
+from .fetch_pipeline import HostRateLimiter
+from .http_cache import get_http_cache
 
 
 class BaseFetcher(ABC):
     """
     Abstract base class for all data fetchers.
-    Provides rate limiting and common HTTP functionality.
+    Provides per-host rate limiting, an on-disk GET cache and common HTTP functionality.
     """
     
-    def __init__(self, rate_limit_delay: float = 1.0):
+    def __init__(self, rate_limit_delay: float = 1.0, cache_ttl: float = 3600.0):
         """
         Initialize fetcher with rate limiting.
         
         Args:
-            rate_limit_delay: Seconds to wait between requests
+            rate_limit_delay: Seconds to wait between requests to the same host
+            cache_ttl: Seconds a cached GET response is used without revalidating it
         """
         self.rate_limit_delay = rate_limit_delay
-        self.last_request_time = 0
+        self.cache_ttl = cache_ttl
+        self.http_cache = get_http_cache()
+        # Shared per host: fetchers calling the same host are limited together
+        self.rate_limiter = HostRateLimiter(1 / rate_limit_delay if rate_limit_delay > 0 else None, shared=True)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
     
-    def _rate_limit(self):
-        """Enforce rate limiting between requests"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time = time.time()
+    def _rate_limit(self, url: str):
+        """Enforce rate limiting between requests to the url's host"""
+        self.rate_limiter.acquire(url)
     
-    def _get(self, url: str, **kwargs) -> requests.Response:
+    def _get(self, url: str, cached: bool = True, cache_ttl: Optional[float] = None, **kwargs) -> requests.Response:
         """
-        Make a rate-limited GET request.
+        Make a rate-limited GET request through the on-disk cache.
+        
+        A cached response younger than the TTL is returned without a request;
+        an older one is revalidated with its ETag/Last-Modified, and served
+        as-is if the source cannot be reached.
         
         Args:
             url: URL to fetch
+            cached: Whether the response may be cached (off for endpoints that answer differently every call)
+            cache_ttl: Overrides the fetcher's cache TTL for this source
             **kwargs: Additional arguments for requests.get
             
         Returns:
             Response object
         """
-        self._rate_limit()
+        cache = self.http_cache if cached and not kwargs.get('headers') else None
+        entry = None
+        if cache:
+            url_key = cache.cache_url(url, kwargs.get('params'))
+            entry = cache.lookup(url_key)
+            if entry and cache.is_fresh(entry, self.cache_ttl if cache_ttl is None else cache_ttl):
+                return cache.hit(entry)
+            if entry:
+                kwargs['headers'] = cache.validators(entry)
+        elif self.http_cache:
+            self.http_cache.bypass()
+        
+        self._rate_limit(url)
+        kwargs.setdefault('timeout', 10)
         try:
-            response = self.session.get(url, timeout=10, **kwargs)
+            response = self.session.get(url, **kwargs)
+            if entry and response.status_code == 304:
+                return cache.refresh(entry, response)
             response.raise_for_status()
+            if cache:
+                cache.store(url_key, response)
             return response
         except requests.RequestException as e:
             print(f"Request error for {url}: {e}")
+            if entry:
+                return cache.serve_stale(entry)
             raise
     
     def _post(self, url: str, **kwargs) -> requests.Response:
@@ -65,9 +92,10 @@ class BaseFetcher(ABC):
         Returns:
             Response object
         """
-        self._rate_limit()
+        self._rate_limit(url)
+        kwargs.setdefault('timeout', 10)
         try:
-            response = self.session.post(url, timeout=10, **kwargs)
+            response = self.session.post(url, **kwargs)
             response.raise_for_status()
             return response
         except requests.RequestException as e:
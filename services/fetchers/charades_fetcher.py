@@ -14,7 +14,8 @@ class CharadesFetcher(BaseFetcher):
     """
     
     def __init__(self):
-        super().__init__(rate_limit_delay=2.0)  # 2 seconds between requests
+        # 2 seconds between requests; cached listing pages are revalidated after 6 hours
+        super().__init__(rate_limit_delay=2.0, cache_ttl=6 * 3600)
         self.elcinema_base = "https://elcinema.com"
         
         # Static fallback data (used when web scraping fails)
@@ -301,7 +302,8 @@ class CharadesFetcher(BaseFetcher):
                 'piprop': 'original'
             }
             
-            response = self._get(url, params=params)
+            # Article intros rarely change
+            response = self._get(url, params=params, cache_ttl=7 * 24 * 3600)
             data = response.json()
             
             pages = data.get('query', {}).get('pages', {})
@@ -0,0 +1,143 @@
+"""
+Concurrent fetching shared by the data fetchers: a token-bucket rate
+limiter per host, and a pipeline that runs several sources at once and
+returns as soon as enough items have arrived.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """
+    Allows ``rate`` requests per second with bursts of up to ``burst``.
+    Callers reserve a token under the lock and sleep outside it, so
+    concurrent callers queue up in order instead of all waking at once.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until it is available. Returns the seconds waited."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay:
+            self._sleep(delay)
+        return delay
+
+
+# Token buckets of every shared HostRateLimiter in the process, keyed by host
+_shared_buckets: Dict[str, TokenBucket] = {}
+_shared_lock = threading.Lock()
+
+
+class HostRateLimiter:
+    """
+    One token bucket per host (``host:port``), so a slow source never
+    holds back requests to another. With ``shared`` the buckets are the
+    process-wide ones, so every fetcher calling a host draws from the same
+    bucket (at the slowest rate any of them asked for).
+    """
+
+    def __init__(self, rate: Optional[float], burst: int = 1, rates: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep,
+                 shared: bool = False):
+        """
+        Args:
+            rate: Requests per second per host; None disables limiting
+            burst: Requests a host may get back to back
+            rates: Per-host overrides of ``rate``
+            shared: Use the process-wide buckets instead of this limiter's own
+        """
+        self.rate = rate
+        self.burst = burst
+        self.rates = dict(rates or {})
+        self._clock = clock
+        self._sleep = sleep
+        if shared:
+            self._buckets, self._lock = _shared_buckets, _shared_lock
+        else:
+            self._buckets: Dict[str, TokenBucket] = {}
+            self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        host = urlsplit(url).netloc
+        rate = self.rates.get(host, self.rate)
+        if not rate:
+            return 0.0
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(rate, self.burst, self._clock, self._sleep)
+            elif rate < bucket.rate:
+                bucket.rate = rate
+        return bucket.acquire()
+
+
+@dataclass
+class FetchSource:
+    """A source in a concurrent batch: ``fetch()`` returns its items."""
+    name: str
+    fetch: Callable[[], List[Dict]]
+    deadline: float = 10.0  # seconds after the batch starts; later results are dropped
+
+
+def fetch_concurrently(sources: List[FetchSource], want: int, max_workers: Optional[int] = None,
+                       clock: Callable[[], float] = time.monotonic) -> List[Dict]:
+    """
+    Run the sources concurrently and collect their items.
+
+    Returns as soon as ``want`` items have arrived, or when every source
+    has finished or passed its deadline; sources still running are left
+    to finish in the background and their results are dropped.
+
+    Args:
+        sources: Sources to run
+        want: Number of items that is enough
+        max_workers: Pool size (default: one worker per source)
+
+    Returns:
+        Items in the order their sources finished
+    """
+    items: List[Dict] = []
+    if not sources:
+        return items
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(sources), thread_name_prefix='fetch')
+    started = clock()
+    futures = {executor.submit(source.fetch): source for source in sources}
+    pending = set(futures)
+    try:
+        while pending and len(items) < want:
+            elapsed = clock() - started
+            live = [future for future in pending if futures[future].deadline > elapsed]
+            if not live:
+                for future in pending:
+                    print(f"Source {futures[future].name} missed its {futures[future].deadline:g}s deadline")
+                break
+            timeout = min(futures[future].deadline for future in live) - elapsed
+            done, _ = wait(live, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                try:
+                    items.extend(future.result())
+                except Exception as e:
+                    print(f"Error fetching from {futures[future].name}: {e}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return items
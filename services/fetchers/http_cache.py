@@ -0,0 +1,186 @@
+"""
+On-disk HTTP response cache shared by the data fetchers.
+
+Response bodies are stored once per content hash under ``blobs/``; each
+cached URL has a small JSON entry under ``entries/`` pointing at its body
+with the ETag/Last-Modified validators and the time it was last
+confirmed. A fresh entry (younger than the caller's TTL) is served from
+disk; a stale one is revalidated with a conditional GET, and a 304 costs
+no body download. When a URL's body changes, the old body is deleted once
+no entry points at it any more.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / 'http_cache'
+
+# Response headers kept with a cached body
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class HttpCache:
+    """
+    Content-addressed response store with hit/miss counters.
+    """
+
+    def __init__(self, directory, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            directory: Where entries and bodies are kept (created on first store)
+            clock: Wall clock used for entry ages
+        """
+        self.directory = Path(directory)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stale_served': 0, 'uncached': 0, 'pruned': 0}
+
+    @staticmethod
+    def cache_url(url: str, params: Optional[Dict] = None) -> str:
+        """The full URL a GET with these params requests (the cache key)."""
+        return requests.Request('GET', url, params=params).prepare().url
+
+    def _entry_path(self, url: str) -> Path:
+        return self.directory / 'entries' / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.directory / 'blobs' / digest[:2] / digest
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """The cached entry for a URL (with its ``age`` in seconds), or None."""
+        try:
+            with self._entry_path(url).open('r', encoding='utf-8') as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != url or not self._blob_path(entry['body']).exists():
+            return None
+        entry['age'] = self._clock() - entry['stored_at']
+        return entry
+
+    def is_fresh(self, entry: Dict, ttl: float) -> bool:
+        return entry['age'] < ttl
+
+    def validators(self, entry: Dict) -> Dict[str, str]:
+        """Conditional request headers for revalidating an entry."""
+        headers = {}
+        if entry['headers'].get('ETag'):
+            headers['If-None-Match'] = entry['headers']['ETag']
+        if entry['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        return headers
+
+    def store(self, url: str, response: requests.Response) -> Dict:
+        """Keep a 200 response's body and validators."""
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        blob = self._blob_path(digest)
+        if not blob.exists():
+            self._write(blob, body)
+        replaced = self.lookup(url)
+        entry = {
+            'url': url,
+            'body': digest,
+            'encoding': response.encoding,
+            'headers': {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+            'stored_at': self._clock(),
+        }
+        self._write_entry(entry)
+        self._count('misses')
+        if replaced and replaced['body'] != digest:
+            self._prune(replaced['body'])
+        return entry
+
+    def hit(self, entry: Dict) -> requests.Response:
+        """Serve a fresh entry."""
+        self._count('hits')
+        return self.response(entry)
+
+    def refresh(self, entry: Dict, response: requests.Response) -> requests.Response:
+        """A 304 confirmed the entry: restart its TTL, pick up new validators and serve it."""
+        for name in ('ETag', 'Last-Modified'):
+            if name in response.headers:
+                entry['headers'][name] = response.headers[name]
+        entry['stored_at'] = self._clock()
+        self._write_entry(entry)
+        self._count('revalidated')
+        return self.response(entry)
+
+    def serve_stale(self, entry: Dict) -> requests.Response:
+        """Serve an expired entry because the source could not be reached."""
+        self._count('stale_served')
+        return self.response(entry)
+
+    def bypass(self) -> None:
+        """Count a GET that was not cacheable."""
+        self._count('uncached')
+
+    def response(self, entry: Dict) -> requests.Response:
+        """Rebuild a response from a cached entry."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry['url']
+        response.encoding = entry['encoding']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = self._blob_path(entry['body']).read_bytes()
+        return response
+
+    def _prune(self, digest: str) -> None:
+        """Delete a body that no entry points at any more."""
+        with self._lock:
+            for path in (self.directory / 'entries').glob('*.json'):
+                try:
+                    with path.open('r', encoding='utf-8') as handle:
+                        if json.load(handle).get('body') == digest:
+                            return
+                except (OSError, ValueError):
+                    continue
+            try:
+                self._blob_path(digest).unlink()
+            except FileNotFoundError:
+                return
+            self._counters['pruned'] += 1
+
+    def _write_entry(self, entry: Dict) -> None:
+        stored = {key: value for key, value in entry.items() if key != 'age'}
+        self._write(self._entry_path(entry['url']), json.dumps(stored, ensure_ascii=False).encode('utf-8'))
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(descriptor, 'wb') as handle:
+                handle.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Get or create the process-wide cache (FAMILY_GAMES_HTTP_CACHE_DIR)."""
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache(os.getenv('FAMILY_GAMES_HTTP_CACHE_DIR') or DEFAULT_CACHE_DIR)
+        return _http_cache
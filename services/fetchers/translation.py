@@ -0,0 +1,256 @@
+"""
+Batched translation of fetched trivia questions, with a translation memory.
+
+Questions are packed many to a Groq chat request, one JSON object per line
+in and out. The response is streamed and each translation is handed back
+as soon as its line parses. Translations are kept in the
+``translation_memory`` table keyed by the hash of the English text, so no
+question is ever sent to the model twice.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..answer_validation import GROQ_MODEL
+
+SYSTEM_PROMPT = (
+    'You translate English trivia questions and their answers into Modern Standard Arabic. '
+    'The input has one JSON object per line with "id", "question", "correct_answer" and "wrong_answers". '
+    'Reply with one JSON object per line, each on a single line, with the same "id" and the translated '
+    '"question", "correct_answer" and "wrong_answers" (same number and order). '
+    'Keep names and numbers accurate. Output nothing else.'
+)
+
+
+def source_text(question: Dict) -> str:
+    """Canonical English text of a question, as hashed for the translation memory."""
+    return json.dumps({
+        'question': question['question'],
+        'correct_answer': question['correct_answer'],
+        'wrong_answers': list(question['wrong_answers']),
+    }, ensure_ascii=False, sort_keys=True)
+
+
+def source_hash(question: Dict) -> str:
+    return hashlib.sha256(source_text(question).encode('utf-8')).hexdigest()
+
+
+def parse_lines(chunks: Iterable[str]) -> Iterator[Dict]:
+    """Yield each JSON object line from streamed text as soon as the line is complete."""
+    buffer = ''
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split('\n')
+        for line in lines:
+            parsed = _parse_line(line)
+            if parsed is not None:
+                yield parsed
+    parsed = _parse_line(buffer)
+    if parsed is not None:
+        yield parsed
+
+
+def _parse_line(line: str) -> Optional[Dict]:
+    line = line.strip().rstrip(',')
+    if not line.startswith('{'):
+        return None  # code fences, prose
+    try:
+        value = json.loads(line)
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+class GroqTranslator:
+    """
+    Streams translations of a batch of questions from a Groq chat model.
+
+    ``GROQ_BASE_URL`` points the client elsewhere (a local stub in tests).
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 model: str = GROQ_MODEL, timeout: float = 60):
+        self.api_key = api_key if api_key is not None else os.getenv('GROQ_API_KEY', '')
+        self.base_url = base_url or os.getenv('GROQ_BASE_URL') or None
+        self.model = model
+        self.timeout = timeout
+        self._client = None  # lazy-initialized
+
+    def available(self) -> bool:
+        return bool(self.api_key) and self.api_key != 'your_groq_api_key_here'
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            from groq import Groq
+            self._client = Groq(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+        return self._client
+
+    def __call__(self, questions: List[Dict]) -> Iterator[Dict]:
+        """
+        Translate questions in one request.
+
+        Yields:
+            Dicts with the question's position in ``id`` and its translated
+            question, correct_answer and wrong_answers, as each one arrives
+        """
+        lines = [json.dumps({'id': position, **question}, ensure_ascii=False)
+                 for position, question in enumerate(questions)]
+        stream = self._get_client().chat.completions.create(
+            model=self.model,
+            messages=[
+                {'role': 'system', 'content': SYSTEM_PROMPT},
+                {'role': 'user', 'content': '\n'.join(lines)},
+            ],
+            temperature=0.3,
+            timeout=self.timeout,
+            stream=True,
+        )
+        yield from parse_lines(chunk.choices[0].delta.content or '' for chunk in stream if chunk.choices)
+
+
+class TranslationMemory:
+    """Translations keyed by source-text hash, in memory and in SQLite."""
+
+    def __init__(self, session_factory: Optional[Callable[[], Any]] = None,
+                 read_session_factory: Optional[Callable[[], Any]] = None):
+        self._session_factory = session_factory
+        self._read_session_factory = read_session_factory or session_factory
+        self._memory: Dict[str, Dict] = {}
+
+    def _session(self, read: bool = False) -> Any:
+        if self._session_factory is None:
+            from models.game_items import get_read_session, get_session, init_db
+            import models.translation_memory  # noqa: F401 - registers the table for init_db
+            init_db()
+            self._session_factory = get_session
+            self._read_session_factory = self._read_session_factory or get_read_session
+        return (self._read_session_factory if read else self._session_factory)()
+
+    def get_many(self, hashes: Iterable[str]) -> Dict[str, Dict]:
+        hashes = set(hashes)
+        found = {digest: self._memory[digest] for digest in hashes if digest in self._memory}
+        missing = hashes - found.keys()
+        if not missing:
+            return found
+
+        from models.translation_memory import TranslationMemoryEntry
+        session = self._session(read=True)
+        try:
+            rows = session.query(TranslationMemoryEntry).filter(TranslationMemoryEntry.source_hash.in_(missing)).all()
+            for row in rows:
+                self._memory[row.source_hash] = found[row.source_hash] = row.translation
+        except Exception as e:
+            print(f"Failed to read the translation memory: {e}")
+        finally:
+            session.close()
+        return found
+
+    def save(self, translations: Dict[str, Tuple[str, Dict]], model: str = GROQ_MODEL) -> None:
+        """Store ``{source_hash: (source_text, translation)}``."""
+        if not translations:
+            return
+        self._memory.update({digest: translation for digest, (_, translation) in translations.items()})
+        from models.translation_memory import TranslationMemoryEntry
+        session = self._session()
+        try:
+            for digest, (text, translation) in translations.items():
+                session.merge(TranslationMemoryEntry(
+                    source_hash=digest, source_text=text, translation=translation, model=model,
+                    created_at=datetime.utcnow(),
+                ))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            print(f"Failed to save {len(translations)} translation(s): {e}")
+        finally:
+            session.close()
+
+
+class BatchTranslator:
+    """
+    Translates questions through the memory first, then ``batch_size`` at a time.
+    """
+
+    def __init__(self, translator: Callable[[List[Dict]], Iterable[Dict]], memory: TranslationMemory,
+                 batch_size: int = 20):
+        self.translator = translator
+        self.memory = memory
+        self.batch_size = batch_size
+        self._counters = {'memory_hits': 0, 'requests': 0, 'translated': 0, 'rejected': 0, 'failures': 0}
+
+    def available(self) -> bool:
+        available = getattr(self.translator, 'available', None)
+        return available() if available else True
+
+    def translate(self, questions: List[Dict]) -> Iterator[Tuple[int, Dict]]:
+        """
+        Translate questions with ``question``, ``correct_answer`` and ``wrong_answers``.
+
+        Yields:
+            ``(index, translation)`` for every question that could be
+            translated: remembered ones first, then each new one as soon as
+            its batch streams it back
+        """
+        hashes = [source_hash(question) for question in questions]
+        known = self.memory.get_many(hashes)
+        pending: Dict[str, List[int]] = {}
+        for index, digest in enumerate(hashes):
+            if digest in known:
+                self._counters['memory_hits'] += 1
+                yield index, known[digest]
+            else:
+                pending.setdefault(digest, []).append(index)
+        if not pending or not self.available():
+            return
+
+        digests = list(pending)
+        for start in range(0, len(digests), self.batch_size):
+            batch = digests[start:start + self.batch_size]
+            sources = [questions[pending[digest][0]] for digest in batch]
+            learned: Dict[str, Tuple[str, Dict]] = {}
+            self._counters['requests'] += 1
+            try:
+                for result in self.translator([{
+                    'question': source['question'],
+                    'correct_answer': source['correct_answer'],
+                    'wrong_answers': list(source['wrong_answers']),
+                } for source in sources]):
+                    position = result.get('id')
+                    if not isinstance(position, int) or not 0 <= position < len(batch):
+                        continue
+                    digest = batch[position]
+                    if digest in learned:
+                        continue
+                    translation = self._translation(result, sources[position])
+                    if translation is None:
+                        # Left out of the memory, so the question is asked for again next time
+                        self._counters['rejected'] += 1
+                        continue
+                    learned[digest] = (source_text(sources[position]), translation)
+                    self._counters['translated'] += 1
+                    for index in pending[digest]:
+                        yield index, translation
+            except Exception as e:
+                self._counters['failures'] += 1
+                print(f"Error translating a batch of {len(batch)} question(s): {e}")
+            finally:
+                # Whatever parsed before a failure (or an early stop) is kept
+                self.memory.save(learned, getattr(self.translator, 'model', GROQ_MODEL))
+
+    @staticmethod
+    def _translation(result: Dict, source: Dict) -> Optional[Dict]:
+        question, correct, wrong = result.get('question'), result.get('correct_answer'), result.get('wrong_answers')
+        if not isinstance(question, str) or not isinstance(correct, str) or not isinstance(wrong, list):
+            return None
+        if not question.strip() or not correct.strip():
+            return None
+        # A dropped or merged wrong answer would change the question's options
+        if len(wrong) != len(source['wrong_answers']):
+            return None
+        return {'question': question.strip(), 'correct_answer': correct.strip(),
+                'wrong_answers': [str(answer).strip() for answer in wrong]}
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._counters)
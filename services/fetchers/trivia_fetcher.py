@@ -3,9 +3,12 @@ Trivia questions fetcher with AI translation support.
 Sources: Egyptian cinema quiz, OpenTDB, Islamic Quiz API
 """
 from typing import List, Dict, Optional
-import requests
+import html
 import random
+import time
 from .base_fetcher import BaseFetcher
+from .fetch_pipeline import FetchSource, fetch_concurrently
+from .translation import BatchTranslator, GroqTranslator, TranslationMemory
 from .trivia_categories import TriviaCategories
 
 
@@ -14,14 +17,20 @@ class TriviaFetcher(BaseFetcher):
     Fetches trivia questions from multiple sources with Arabic translation.
     """
     
+    # Seconds a batch waits for each network source before going without it
+    SOURCE_DEADLINES = {'islamic_quiz': 10.0, 'opentdb': 30.0}
+    
     def __init__(self, ai_api_key: Optional[str] = None):
-        super().__init__(rate_limit_delay=1.0)
+        # The Islamic quiz JSON changes rarely: revalidate it daily
+        super().__init__(rate_limit_delay=1.0, cache_ttl=24 * 3600)
         self.ai_api_key = ai_api_key
         
         # API endpoints
         self.opentdb_url = "https://opentdb.com/api.php"
         self.islamic_quiz_url = "https://raw.githubusercontent.com/rn0x/IslamicQuizAPI/main"
-        self.groq_url = "https://api.groq.com/openai/v1/chat/completions"
+        
+        # OpenTDB questions are translated in batches, each question only once
+        self.translator = BatchTranslator(GroqTranslator(api_key=ai_api_key or ''), TranslationMemory())
     
     def get_source_name(self) -> str:
         return "OpenTDB + Islamic Quiz + Egyptian Cinema"
@@ -30,6 +39,9 @@ class TriviaFetcher(BaseFetcher):
         """
         Fetch a batch of trivia questions from multiple diverse sources and categories.
         
+        The static categories are read from memory; the network sources run
+        concurrently and the batch returns as soon as enough questions arrive.
+        
         Returns:
             List of dicts with: question, correct_answer, wrong_answers, category, difficulty
         """
@@ -39,38 +51,33 @@ class TriviaFetcher(BaseFetcher):
             # Distribute across diverse categories
             items_per_category = max(1, count // 7)  # 7 categories
             
-            # Fetch from Islamic questions
-            islamic_items = self._fetch_islamic_quiz(items_per_category)
-            items.extend(islamic_items)
-            
-            # Fetch general knowledge
-            general_items = self._fetch_general_knowledge(items_per_category)
-            items.extend(general_items)
-            
-            # Fetch science questions
-            science_items = self._fetch_science(items_per_category)
-            items.extend(science_items)
-            
-            # Fetch history questions
-            history_items = self._fetch_history(items_per_category)
-            items.extend(history_items)
-            
-            # Fetch geography questions
-            geography_items = self._fetch_geography(items_per_category)
-            items.extend(geography_items)
-            
-            # Fetch sports questions
-            sports_items = self._fetch_sports(items_per_category)
-            items.extend(sports_items)
+            items.extend(self._fetch_general_knowledge(items_per_category))
+            items.extend(self._fetch_science(items_per_category))
+            items.extend(self._fetch_history(items_per_category))
+            items.extend(self._fetch_geography(items_per_category))
+            items.extend(self._fetch_sports(items_per_category))
+            # Egyptian cinema (as one category among many)
+            items.extend(self._fetch_egyptian_cinema(items_per_category))
             
-            # Fetch Egyptian cinema (as one category among many)
-            cinema_items = self._fetch_egyptian_cinema(items_per_category)
-            items.extend(cinema_items)
+            # Islamic questions and OpenTDB (for what the rest will leave short) in parallel;
+            # OpenTDB questions are only kept once translated
+            opentdb_count = max(count - len(items) - items_per_category, 0)
+            sources = [FetchSource('Islamic Quiz', lambda: self._fetch_islamic_quiz(items_per_category),
+                                   self.SOURCE_DEADLINES['islamic_quiz'])]
+            if self.translator.available() and opentdb_count:
+                sources.append(FetchSource('OpenTDB', lambda: self._fetch_opentdb(opentdb_count),
+                                           self.SOURCE_DEADLINES['opentdb']))
+            started = time.monotonic()
+            items.extend(fetch_concurrently(sources, want=count - len(items)))
             
-            # If we need more items, fetch from OpenTDB
-            if len(items) < count:
-                opentdb_items = self._fetch_opentdb(count - len(items))
-                items.extend(opentdb_items)
+            # If we still need more items (Islamic quiz came up short), top up from OpenTDB
+            # within what is left of its deadline
+            remaining = self.SOURCE_DEADLINES['opentdb'] - (time.monotonic() - started)
+            if self.translator.available() and len(items) < count and remaining > 0:
+                top_up = count - len(items)
+                items.extend(fetch_concurrently(
+                    [FetchSource('OpenTDB top-up', lambda: self._fetch_opentdb(top_up), remaining)], want=top_up,
+                ))
             
         except Exception as e:
             print(f"Error fetching trivia data: {e}")
@@ -380,88 +387,26 @@ class TriviaFetcher(BaseFetcher):
                 'type': 'multiple'
             }
             
-            response = self._get(self.opentdb_url, params=params)
+            # Every call returns different random questions, so never cache them
+            response = self._get(self.opentdb_url, params=params, cached=False)
             data = response.json()
             
             if data.get('response_code') == 0:
-                for item in data.get('results', []):
-                    # Translate question and answers
-                    translated = self._translate_question(item)
-                    if translated:
-                        questions.append(translated)
+                results = data.get('results', [])
+                # OpenTDB encodes its text as HTML entities
+                sources = [{
+                    'question': html.unescape(item.get('question', '')),
+                    'correct_answer': html.unescape(item.get('correct_answer', '')),
+                    'wrong_answers': [html.unescape(answer) for answer in item.get('incorrect_answers', [])],
+                } for item in results]
+                for index, translated in self.translator.translate(sources):
+                    questions.append({
+                        **translated,
+                        'category': 'ثقافة عامة',
+                        'difficulty': results[index].get('difficulty', 'medium')
+                    })
                         
         except Exception as e:
             print(f"Error fetching OpenTDB: {e}")
         
         return questions
-    
-    def _translate_question(self, question_data: Dict) -> Optional[Dict]:
-        """
-        Translate a question from English to Arabic using AI.
-        
-        Args:
-            question_data: Question dict from OpenTDB
-            
-        Returns:
-            Translated question dict or None
-        """
-        if not self.ai_api_key:
-            # Skip translation if no API key
-            return None
-        
-        try:
-            question = question_data.get('question', '')
-            correct = question_data.get('correct_answer', '')
-            incorrect = question_data.get('incorrect_answers', [])
-            
-            # Prepare translation prompt
-            text_to_translate = f"""Question: {question}
-Correct Answer: {correct}
-Wrong Answers: {', '.join(incorrect)}"""
-            
-            # Call Groq API for translation
-            headers = {
-                'Authorization': f'Bearer {self.ai_api_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            payload = {
-                'model': 'mixtral-8x7b-32768',
-                'messages': [
-                    {
-                        'role': 'system',
-                        'content': 'You are a translator. Translate the following trivia question and answers from English to Arabic. Return only the translations in the same format.'
-                    },
-                    {
-                        'role': 'user',
-                        'content': text_to_translate
-                    }
-                ],
-                'temperature': 0.3
-            }
-            
-            response = self._post(self.groq_url, headers=headers, json=payload)
-            result = response.json()
-            
-            translated_text = result.get('choices', [{}])[0].get('message', {}).get('content', '')
-            
-            # Parse translated text
-            lines = translated_text.strip().split('\n')
-            if len(lines) >= 3:
-                translated_question = lines[0].replace('Question:', '').replace('السؤال:', '').strip()
-                translated_correct = lines[1].replace('Correct Answer:', '').replace('الإجابة الصحيحة:', '').strip()
-                translated_wrong = lines[2].replace('Wrong Answers:', '').replace('الإجابات الخاطئة:', '').strip()
-                translated_wrong_list = [ans.strip() for ans in translated_wrong.split(',')]
-                
-                return {
-                    'question': translated_question,
-                    'correct_answer': translated_correct,
-                    'wrong_answers': translated_wrong_list,
-                    'category': 'ثقافة عامة',
-                    'difficulty': question_data.get('difficulty', 'medium')
-                }
-                
-        except Exception as e:
-            print(f"Error translating question: {e}")
-        
-        return None
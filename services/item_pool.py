@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+from datetime import datetime
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+PoolKey = tuple[str, Optional[str]]  # (game_type, category or None for all)
+
+
+class _RoomCursor:
+    """A room's walk through one pool: remaining item ids, next one last."""
+
+    __slots__ = ('order', 'seen', 'generation')
+
+    def __init__(self, seen: set[int]) -> None:
+        self.order: list[int] = []
+        self.seen = seen
+        self.generation = -1
+
+
+class ItemPool:
+    """Process-wide in-memory copy of the cached game items.
+
+    Items are loaded from SQLite once per ``(game_type, category)`` and
+    reloaded by ``refresh`` (after a refetch, and periodically). Each room
+    walks a pool through its own cursor: the items it has not been served,
+    least recently used first and shuffled among equals, so the next item
+    is a list pop with no database round-trip.
+
+    Usage (``last_used``, ``use_count`` and the room usage rows) is queued
+    in memory and written by ``flush_usage`` in one transaction.
+    """
+
+    def __init__(self, data_manager: Any, rng: Optional[random.Random] = None) -> None:
+        self.data_manager = data_manager
+        self._rng = rng or random.Random()
+        self._lock = threading.RLock()
+        self._items: dict[PoolKey, dict[int, Any]] = {}
+        self._generations: dict[PoolKey, int] = {}
+        self._last_used: dict[int, datetime] = {}
+        self._cursors: dict[tuple[str, PoolKey], _RoomCursor] = {}
+        self._room_used: dict[str, set[int]] = {}
+        self._pending: list[tuple[str, int, datetime]] = []
+        self._counters = {'served': 0, 'loads': 0, 'flushes': 0}
+
+    def _pool(self, key: PoolKey) -> dict[int, Any]:
+        pool = self._items.get(key)
+        if pool is None:
+            pool = self._load(key)
+        return pool
+
+    def _load(self, key: PoolKey) -> dict[int, Any]:
+        rows = self.data_manager.load_items(*key)
+        with self._lock:
+            pool = {item_id: item_data for item_id, item_data, _ in rows}
+            for item_id, _, last_used in rows:
+                # Usage queued here is newer than what the database has
+                if last_used and (item_id not in self._last_used or last_used > self._last_used[item_id]):
+                    self._last_used[item_id] = last_used
+            if self._items.get(key, {}).keys() != pool.keys():
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._items[key] = pool
+            self._counters['loads'] += 1
+            return pool
+
+    def warm(self, game_types: list[str]) -> None:
+        for game_type in game_types:
+            self._load((game_type, None))
+
+    def refresh(self, game_type: Optional[str] = None) -> None:
+        """Reload the loaded pools (of one game type, or all) from the database."""
+        for key in [key for key in list(self._items) if game_type is None or key[0] == game_type]:
+            self._load(key)
+
+    def size(self, game_type: str, category: Optional[str] = None) -> int:
+        return len(self._pool((game_type, category or None)))
+
+    def next_items(self, room_id: str, game_type: str, category: Optional[str] = None, count: int = 1) -> list[Any]:
+        """Up to ``count`` items the room has not been served yet."""
+        key = (game_type, category or None)
+        pool = self._pool(key)
+        used = self._used_ids(room_id)
+        with self._lock:
+            cursor = self._cursors.get((room_id, key))
+            if cursor is None:
+                cursor = self._cursors[(room_id, key)] = _RoomCursor(used)
+            if cursor.generation != self._generations.get(key, 0):
+                self._reorder(cursor, pool, key)
+
+            now = datetime.utcnow()
+            items = []
+            while cursor.order and len(items) < count:
+                item_id = cursor.order.pop()
+                if item_id in used or item_id not in pool:
+                    continue
+                used.add(item_id)
+                self._last_used[item_id] = now
+                self._pending.append((room_id, item_id, now))
+                items.append(pool[item_id])
+            self._counters['served'] += len(items)
+            return items
+
+    def _used_ids(self, room_id: str) -> set[int]:
+        used = self._room_used.get(room_id)
+        if used is None:
+            # A room restored after a restart keeps its history
+            loaded = self.data_manager.get_used_item_ids(room_id)
+            with self._lock:
+                used = self._room_used.setdefault(room_id, loaded)
+        return used
+
+    def _reorder(self, cursor: _RoomCursor, pool: dict[int, Any], key: PoolKey) -> None:
+        remaining = [item_id for item_id in pool if item_id not in cursor.seen]
+        self._rng.shuffle(remaining)
+        # Popped from the end: most recently used first in the list, never used last
+        remaining.sort(key=lambda item_id: self._last_used.get(item_id, datetime.min), reverse=True)
+        cursor.order = remaining
+        cursor.generation = self._generations.get(key, 0)
+
+    def flush_usage(self) -> int:
+        """Write the queued usage to the database; returns the number of events written."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        try:
+            self.data_manager.record_usage(pending)
+        except Exception:
+            with self._lock:
+                self._pending[:0] = pending
+            raise
+        self._counters['flushes'] += 1
+        return len(pending)
+
+    def forget_room(self, room_id: str) -> None:
+        """Drop a closed room's cursors and history (its queued usage still gets written)."""
+        with self._lock:
+            self._room_used.pop(room_id, None)
+            for cursor_key in [cursor_key for cursor_key in self._cursors if cursor_key[0] == room_id]:
+                del self._cursors[cursor_key]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                **self._counters,
+                'pools': len(self._items),
+                'items': sum(len(pool) for pool in self._items.values()),
+                'rooms': len(self._room_used),
+                'pending_usage': len(self._pending),
+            }
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+PoolKey = tuple[str, Optional[str]]  # (game_type, category or None for all)
+
+
+def _spawn_daemon(target: Callable[[], None]) -> None:
+    threading.Thread(target=target, daemon=True).start()
+
+
+class PrefetchWorker:
+    """Refills the item cache in the background, one ``(game_type, category)`` at a time.
+
+    ``request`` is cheap and never touches the network: when a pool is below
+    its low watermark the key is queued (once) and a worker task refills it
+    up to the high watermark. The worker exits when the queue is empty and
+    is spawned again by the next request.
+
+    ``wait`` is for a room that has nothing left to serve: it blocks until
+    the queued refill for its pool finishes (or ``wait_timeout`` passes),
+    and is counted so the metrics show how often rooms had to wait.
+    """
+
+    def __init__(
+        self,
+        refill: Callable[..., None],
+        size: Callable[[str, Optional[str]], int],
+        spawn: Optional[Callable[[Callable[[], None]], None]] = None,
+        low: int = 10,
+        high: int = 60,
+        wait_timeout: float = 3.0,
+    ) -> None:
+        self._refill = refill
+        self._size = size
+        self._spawn = spawn or _spawn_daemon
+        self.low = low
+        self.high = max(high, low)
+        self.wait_timeout = wait_timeout
+        self._cond = threading.Condition()
+        self._queue: deque[PoolKey] = deque()
+        self._targets: dict[PoolKey, int] = {}
+        self._running = False
+        self._counters = {
+            'requests': 0, 'refills': 0, 'failures': 0, 'items_added': 0,
+            'waits': 0, 'wait_timeouts': 0,
+        }
+        self._wait_seconds = 0.0
+
+    def request(self, game_type: str, category: Optional[str] = None, minimum: int = 0) -> bool:
+        """Queue a refill if the pool is below its low watermark (or ``minimum``).
+
+        Returns True when a refill for the pool is queued or running.
+        """
+        key = (game_type, category or None)
+        with self._cond:
+            if key in self._targets:
+                return True
+        if self._size(*key) >= max(self.low, minimum):
+            return False
+        with self._cond:
+            if key in self._targets:
+                return True
+            self._targets[key] = max(self.high, minimum)
+            self._queue.append(key)
+            self._counters['requests'] += 1
+            start = not self._running
+            self._running = True
+        if start:
+            self._spawn(self._run)
+        return True
+
+    def wait(self, game_type: str, category: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """Block until the pool's refill finishes; False if none was needed or it timed out."""
+        key = (game_type, category or None)
+        if not self.request(*key):
+            return False
+        started = time.monotonic()
+        with self._cond:
+            finished = self._cond.wait_for(
+                lambda: key not in self._targets,
+                self.wait_timeout if timeout is None else timeout,
+            )
+            self._counters['waits'] += 1
+            if not finished:
+                self._counters['wait_timeouts'] += 1
+            self._wait_seconds += time.monotonic() - started
+        return finished
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued refill has finished."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._targets, timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._queue:
+                    self._running = False
+                    return
+                key = self._queue.popleft()
+                target = self._targets[key]
+            try:
+                before = self._size(*key)
+                self._refill(key[0], key[1], count=max(target - before, 1))
+                added = max(self._size(*key) - before, 0)
+            except Exception as e:
+                logger.warning(f"Refill of {key[0]}/{key[1] or '*'} failed: {e}")
+                added = None
+            with self._cond:
+                if added is None:
+                    self._counters['failures'] += 1
+                else:
+                    self._counters['refills'] += 1
+                    self._counters['items_added'] += added
+                del self._targets[key]
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                **self._counters,
+                'wait_seconds': round(self._wait_seconds, 3),
+                'queued': len(self._targets),
+                'low_watermark': self.low,
+                'high_watermark': self.high,
+            }
@@ -1,11 +1,69 @@
 from __future__ import annotations
 
+import json
 from typing import Any, Optional
 
 
+class EncodedPayload(str):
+    """JSON text that ``PreEncodedJSON`` splices into outgoing packets verbatim."""
+
+
+class PreEncodedJSON:
+    """json module for Socket.IO packets that reuses ``EncodedPayload`` arguments.
+
+    python-socketio encodes ``[event, *args]`` with ``json.dumps``; pre-encoded
+    arguments are inserted as-is so a cached state is never serialized twice.
+    """
+
+    @staticmethod
+    def dumps(obj: Any, *args: Any, **kwargs: Any) -> str:
+        if isinstance(obj, list) and any(isinstance(item, EncodedPayload) for item in obj):
+            return '[' + ','.join(
+                item if isinstance(item, EncodedPayload) else json.dumps(item, *args, **kwargs)
+                for item in obj
+            ) + ']'
+        return json.dumps(obj, *args, **kwargs)
+
+    @staticmethod
+    def loads(*args: Any, **kwargs: Any) -> Any:
+        return json.loads(*args, **kwargs)
+
+
+def _escape_pointer_token(token: Any) -> str:
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+def diff_state(previous: Any, current: Any, path: str = '') -> list[dict[str, Any]]:
+    """Build JSON-patch style operations turning ``previous`` into ``current``.
+
+    Dicts are diffed key by key; any other value (lists included) is replaced
+    wholesale when it changed, which keeps the client-side apply step trivial.
+    """
+    if isinstance(previous, dict) and isinstance(current, dict):
+        ops: list[dict[str, Any]] = []
+        for key in sorted(previous.keys() - current.keys()):
+            ops.append({'op': 'remove', 'path': f'{path}/{_escape_pointer_token(key)}'})
+        for key, value in current.items():
+            child_path = f'{path}/{_escape_pointer_token(key)}'
+            if key not in previous:
+                ops.append({'op': 'add', 'path': child_path, 'value': value})
+            elif previous[key] != value:
+                ops.extend(diff_state(previous[key], value, child_path))
+        return ops
+    if previous == current:
+        return []
+    return [{'op': 'replace', 'path': path, 'value': current}]
+
+
 class RealtimeSyncService:
-    def __init__(self, game_rooms: dict[str, Any]) -> None:
+    def __init__(self, game_rooms: dict[str, Any], patch_mode: bool = True) -> None:
         self.game_rooms = game_rooms
+        self.patch_mode = patch_mode
+        self._last_snapshots: dict[str, dict[str, Any]] = {}
+        # game_id -> (state_version, {payload kind: encoded JSON}) for the room's latest version only
+        self._encoded_cache: dict[str, tuple[int, dict[str, EncodedPayload]]] = {}
+        # Rooms with a bumped version waiting for the next coalesced flush
+        self._dirty_rooms: set[str] = set()
 
     def build_public_state(self, game_id: str) -> dict[str, Any] | None:
         game = self.game_rooms.get(str(game_id))
@@ -16,6 +74,82 @@ class RealtimeSyncService:
             state['state_version'] = getattr(game, 'state_version', 0)
         return state
 
+    def _get_encoded(self, game_id: str, kind: str, build: Any) -> EncodedPayload | None:
+        game = self.game_rooms.get(game_id)
+        if not game:
+            return None
+        version = getattr(game, 'state_version', 0)
+        cached_version, payloads = self._encoded_cache.get(game_id, (None, {}))
+        if cached_version != version:
+            payloads = {}
+            self._encoded_cache[game_id] = (version, payloads)
+        if kind not in payloads:
+            payload = build(game_id)
+            if payload is None:
+                return None
+            payloads[kind] = EncodedPayload(json.dumps(payload, separators=(',', ':')))
+        return payloads[kind]
+
+    def get_encoded_public_state(self, game_id: str) -> EncodedPayload | None:
+        """Public state JSON for the room's current version, encoded at most once per version."""
+        return self._get_encoded(str(game_id), 'public_state', self.build_public_state)
+
+    def get_encoded_room_preview(self, game_id: str, build_preview: Any) -> EncodedPayload | None:
+        return self._get_encoded(str(game_id), 'room_preview', build_preview)
+
+    def build_state_update(self, game_id: str) -> tuple[str, Any] | None:
+        """Return the ``(event, payload)`` pair to broadcast for the room's current version.
+
+        In patch mode the first broadcast for a room is a full ``game_state``;
+        later broadcasts are ``game_state_patch`` payloads relative to the last
+        snapshot sent to the room. Clients whose version does not match
+        ``base_version`` ask for a full snapshot with ``request_game_state``.
+        Returns None when the room already has this version: state changes
+        always bump it, so there is nothing new to send.
+        """
+        game_id = str(game_id)
+        encoded = self.get_encoded_public_state(game_id)
+        if encoded is None:
+            return None
+        previous = self._last_snapshots.get(game_id)
+        if previous is not None and previous['state_version'] == getattr(self.game_rooms[game_id], 'state_version', 0):
+            return None
+        # Decoding the cached JSON also detaches the snapshot from the live game objects
+        snapshot = json.loads(encoded)
+        self._last_snapshots[game_id] = snapshot
+
+        # A version older than the last one sent (e.g. a restored room) starts over with a full snapshot
+        if not self.patch_mode or previous is None or previous['state_version'] > snapshot['state_version']:
+            return 'game_state', encoded
+
+        return 'game_state_patch', {
+            'game_id': game_id,
+            'base_version': previous['state_version'],
+            'state_version': snapshot['state_version'],
+            'ops': diff_state(previous, snapshot),
+        }
+
+    def mark_dirty(self, game_id: str) -> bool:
+        """Flag the room for the next flush; True when no flush is pending yet."""
+        game_id = str(game_id)
+        if game_id in self._dirty_rooms:
+            return False
+        self._dirty_rooms.add(game_id)
+        return True
+
+    def take_dirty(self, game_id: str) -> bool:
+        """Clear the room's dirty flag, returning whether it was set."""
+        game_id = str(game_id)
+        if game_id not in self._dirty_rooms:
+            return False
+        self._dirty_rooms.discard(game_id)
+        return True
+
+    def forget_room(self, game_id: str) -> None:
+        self._last_snapshots.pop(str(game_id), None)
+        self._encoded_cache.pop(str(game_id), None)
+        self._dirty_rooms.discard(str(game_id))
+
     def build_private_state(self, game_id: str, player_name: str) -> dict[str, Any] | None:
         game = self.game_rooms.get(str(game_id))
         if not game:
@@ -29,8 +163,14 @@ class RealtimeSyncService:
         return None
 
     def bump_game_version(self, game: Any) -> int:
+        self._encoded_cache.pop(str(getattr(game, 'game_id', '')), None)
         if hasattr(game, 'bump_state_version'):
-            return game.bump_state_version()
-        current = getattr(game, 'state_version', 0) + 1
-        setattr(game, 'state_version', current)
+            current = game.bump_state_version()
+        else:
+            current = getattr(game, 'state_version', 0) + 1
+            setattr(game, 'state_version', current)
+        # Durable room stores snapshot on transitions and mark the room for the next flush
+        touch = getattr(self.game_rooms, 'touch', None)
+        if touch:
+            touch(game)
         return current
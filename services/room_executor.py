@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RoomExecutor:
+    """Applies tasks for one room strictly one at a time, in arrival order.
+
+    Every room has its own mailbox; a task waits only for the tasks queued
+    before it in the same room, so different rooms run concurrently. Tasks
+    execute on the submitting greenlet, which keeps the Flask request context
+    and Socket.IO ``emit`` working inside handlers. A task submitted from a
+    task already running for the same room executes immediately.
+
+    Metrics are kept only for rooms ``is_tracked`` accepts (rooms that exist),
+    so events carrying made-up room ids leave nothing behind.
+    """
+
+    def __init__(self, slow_wait_seconds: float = 1.0, clock: Callable[[], float] = time.monotonic,
+                 is_tracked: Callable[[str], bool] = lambda game_id: True) -> None:
+        self.slow_wait_seconds = slow_wait_seconds
+        self._clock = clock
+        self._is_tracked = is_tracked
+        self._guard = threading.Lock()
+        self._mailboxes: dict[str, deque[threading.Event]] = {}
+        self._owners: dict[str, int] = {}
+        self._stats: dict[str, dict[str, float]] = {}
+
+    def run(self, game_id: str, task: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        game_id = str(game_id)
+        caller = threading.get_ident()
+        if self._owners.get(game_id) == caller:
+            return task(*args, **kwargs)
+
+        turn = threading.Event()
+        enqueued_at = self._clock()
+        with self._guard:
+            mailbox = self._mailboxes.setdefault(game_id, deque())
+            mailbox.append(turn)
+            depth = len(mailbox)
+            if depth == 1:
+                turn.set()
+        turn.wait()
+
+        waited = self._clock() - enqueued_at
+        if waited >= self.slow_wait_seconds:
+            logger.warning(f"Room {game_id} task waited {waited:.2f}s behind {len(mailbox) - 1} queued tasks")
+
+        self._owners[game_id] = caller
+        try:
+            return task(*args, **kwargs)
+        finally:
+            with self._guard:
+                # Checked after the task, so the event that creates a room is counted
+                if self._is_tracked(game_id):
+                    stats = self._room_stats(game_id)
+                    stats['tasks'] += 1
+                    stats['max_depth'] = max(stats['max_depth'], depth)
+                    stats['total_wait'] += waited
+                    stats['max_wait'] = max(stats['max_wait'], waited)
+                self._owners.pop(game_id, None)
+                mailbox.popleft()
+                if mailbox:
+                    mailbox[0].set()
+                else:
+                    self._mailboxes.pop(game_id, None)
+
+    def _room_stats(self, game_id: str) -> dict[str, float]:
+        return self._stats.setdefault(game_id, {'tasks': 0, 'max_depth': 0, 'total_wait': 0.0, 'max_wait': 0.0})
+
+    def stats(self, game_id: Optional[str] = None) -> dict[str, Any]:
+        """Queue depth and wait-time metrics, for one room or keyed by room."""
+        if game_id is None:
+            return {room_id: self.stats(room_id) for room_id in list(self._stats)}
+        game_id = str(game_id)
+        stats = self._stats.get(game_id, {'tasks': 0, 'max_depth': 0, 'total_wait': 0.0, 'max_wait': 0.0})
+        tasks = stats['tasks']
+        return {
+            'depth': len(self._mailboxes.get(game_id, ())),
+            'max_depth': stats['max_depth'],
+            'tasks': tasks,
+            'avg_wait_ms': round(stats['total_wait'] / tasks * 1000, 3) if tasks else 0.0,
+            'max_wait_ms': round(stats['max_wait'] * 1000, 3),
+        }
+
+    def forget_room(self, game_id: str) -> None:
+        with self._guard:
+            self._stats.pop(str(game_id), None)
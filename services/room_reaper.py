@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RoomReaper:
+    """Evicts abandoned rooms so they do not live in memory forever.
+
+    A room whose ``updated_at`` is older than ``ttl_seconds`` is evicted. On
+    top of that, when the live rooms exceed ``max_rooms`` or their estimated
+    size exceeds ``max_bytes``, rooms idle for at least ``min_idle_seconds``
+    are evicted least recently updated first until the budget holds again.
+    ``evict`` is called with each game_id and does the actual teardown; it
+    should check ``still_idle`` once it holds the room and return False to
+    skip a room that saw activity after the sweep picked it.
+    Rooms ``owns`` rejects belong to another worker and are never evicted here.
+    """
+
+    def __init__(
+        self,
+        rooms: Mapping[str, Any],
+        evict: Callable[[str], Any],
+        ttl_seconds: float = 3600,
+        max_rooms: int = 0,
+        max_bytes: int = 0,
+        min_idle_seconds: float = 120,
+        clock: Callable[[], datetime] = datetime.now,
+        owns: Callable[[str], bool] = lambda game_id: True,
+    ) -> None:
+        self.rooms = rooms
+        self._evict = evict
+        self._owns = owns
+        self.ttl_seconds = ttl_seconds
+        self.max_rooms = max_rooms
+        self.max_bytes = max_bytes
+        self.min_idle_seconds = min_idle_seconds
+        self._clock = clock
+        self._counters = {
+            'sweeps': 0, 'evicted_idle': 0, 'evicted_budget': 0, 'evicted_bytes': 0, 'skipped_active': 0,
+        }
+        self._last_sweep_ms = 0.0
+        # game_id -> updated_at of each room the current sweep picked for eviction
+        self._picked: dict[str, Any] = {}
+
+    @staticmethod
+    def estimate_size(game: Any) -> int:
+        """Approximate bytes held by a room: the size of its encoded snapshot."""
+        try:
+            return len(json.dumps(game.to_snapshot(), ensure_ascii=False, default=str))
+        except Exception:
+            return 0
+
+    def sweep(self) -> list[str]:
+        """Evict expired rooms, then enforce the budget; returns the evicted game_ids."""
+        started = time.perf_counter()
+        now = self._clock()
+        idle: list[tuple[datetime, str]] = []
+        expired: list[str] = []
+        self._picked = {}
+        for game_id, game in list(self.rooms.items()):
+            if not self._owns(game_id):
+                continue
+            updated_at = getattr(game, 'updated_at', None) or now
+            idle_seconds = (now - updated_at).total_seconds()
+            if idle_seconds >= self.ttl_seconds:
+                expired.append(game_id)
+            elif idle_seconds >= self.min_idle_seconds:
+                idle.append((updated_at, game_id))
+            else:
+                continue
+            self._picked[game_id] = getattr(game, 'updated_at', None)
+
+        evicted = [game_id for game_id in expired if self._remove(game_id, 'evicted_idle')]
+        if self.max_rooms or self.max_bytes:
+            evicted.extend(self._enforce_budget(sorted(idle)))
+
+        self._counters['sweeps'] += 1
+        self._last_sweep_ms = (time.perf_counter() - started) * 1000
+        if evicted:
+            logger.info(f"Reaped {len(evicted)} idle room(s): {', '.join(evicted)}")
+        return evicted
+
+    def _enforce_budget(self, idle_oldest_first: list[tuple[datetime, str]]) -> list[str]:
+        sizes = {game_id: self.estimate_size(game) for game_id, game in list(self.rooms.items())} if self.max_bytes else {}
+        total_bytes = sum(sizes.values())
+        evicted = []
+        for _, game_id in idle_oldest_first:
+            over_rooms = self.max_rooms and len(self.rooms) > self.max_rooms
+            over_bytes = self.max_bytes and total_bytes > self.max_bytes
+            if not (over_rooms or over_bytes):
+                break
+            if self._remove(game_id, 'evicted_budget', sizes.get(game_id, 0)):
+                total_bytes -= sizes.get(game_id, 0)
+                evicted.append(game_id)
+        return evicted
+
+    def still_idle(self, game_id: str) -> bool:
+        """True while the room is unchanged since the sweep picked it for eviction."""
+        game = self.rooms.get(game_id)
+        return game is not None and game_id in self._picked and getattr(game, 'updated_at', None) == self._picked[game_id]
+
+    def _remove(self, game_id: str, counter: str, size: Optional[int] = None) -> bool:
+        game = self.rooms.get(game_id)
+        if game is None:
+            return False
+        if size is None:
+            size = self.estimate_size(game)
+        try:
+            if self._evict(game_id) is False:
+                self._counters['skipped_active'] += 1
+                return False
+        except Exception as e:
+            logger.warning(f"Failed to evict room {game_id}: {e}")
+            return False
+        self._counters[counter] += 1
+        self._counters['evicted_bytes'] += size
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._counters, 'rooms': len(self.rooms), 'last_sweep_ms': round(self._last_sweep_ms, 2)}
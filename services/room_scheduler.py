@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import functools
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RoomScheduler:
+    """Server-side timers for rooms (round expiry, buzz windows, reveal delays).
+
+    Each room holds at most one timer per name: scheduling the same name again
+    replaces the pending one and ``cancel`` drops a single timer or all of a
+    room's timers. Deadlines live in one heap driven by a single background
+    loop, so a pending timer costs no greenlet of its own. Due callbacks are
+    handed to ``dispatch`` which by default calls them inline.
+
+    A dispatched timer stays pending until its callback actually starts, so a
+    ``cancel`` or reschedule that runs first (e.g. an event queued ahead of it
+    on the room's executor) still stops the stale callback.
+    """
+
+    def __init__(
+        self,
+        sleep: Callable[[float], Any],
+        spawn: Callable[..., Any],
+        dispatch: Optional[Callable[..., Any]] = None,
+        tick: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._sleep = sleep
+        self._spawn = spawn
+        self._dispatch = dispatch or (lambda game_id, callback, *args: callback(*args))
+        self.tick = tick
+        self._clock = clock
+        # (game_id, name) -> sequence number of the live heap entry
+        self._timers: dict[tuple[str, str], int] = {}
+        self._heap: list[tuple[float, int, str, str, Callable[..., Any], tuple[Any, ...]]] = []
+        self._sequence = itertools.count()
+        self._running = False
+
+    def schedule(self, game_id: str, name: str, delay: float, callback: Callable[..., Any], *args: Any) -> None:
+        game_id = str(game_id)
+        sequence = next(self._sequence)
+        self._timers[(game_id, name)] = sequence
+        heapq.heappush(self._heap, (self._clock() + max(0.0, delay), sequence, game_id, name, callback, args))
+        if not self._running:
+            self._running = True
+            self._spawn(self._run)
+
+    def cancel(self, game_id: str, name: Optional[str] = None) -> None:
+        """Cancel one named timer, or every timer of the room when ``name`` is None."""
+        game_id = str(game_id)
+        if name is not None:
+            self._timers.pop((game_id, name), None)
+            return
+        for key in [key for key in self._timers if key[0] == game_id]:
+            del self._timers[key]
+
+    def is_pending(self, game_id: str, name: str) -> bool:
+        return (str(game_id), name) in self._timers
+
+    def remaining(self, game_id: str, name: str) -> Optional[float]:
+        """Seconds left on a pending timer, or None when it is not scheduled."""
+        sequence = self._timers.get((str(game_id), name))
+        if sequence is None:
+            return None
+        # Dispatched timers have left the heap and are about to run
+        deadline = next((entry[0] for entry in self._heap if entry[1] == sequence), None)
+        return 0.0 if deadline is None else max(0.0, deadline - self._clock())
+
+    def deadlines(self, game_id: str) -> dict[str, float]:
+        """Seconds left on each of the room's pending timers, keyed by name."""
+        game_id = str(game_id)
+        pending = {sequence: name for (room_id, name), sequence in self._timers.items() if room_id == game_id}
+        if not pending:
+            return {}
+        now = self._clock()
+        return {pending[entry[1]]: max(0.0, entry[0] - now) for entry in self._heap if entry[1] in pending}
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """Fire every timer whose deadline has passed; returns how many fired."""
+        now = self._clock() if now is None else now
+        fired = 0
+        while self._heap and self._heap[0][0] <= now:
+            _, sequence, game_id, name, callback, args = heapq.heappop(self._heap)
+            if self._timers.get((game_id, name)) != sequence:
+                continue  # cancelled or replaced
+            fired += 1
+            try:
+                self._dispatch(game_id, functools.partial(self._fire, game_id, name, sequence, callback), *args)
+            except Exception:
+                logger.exception(f"Timer {name} failed for room {game_id}")
+        return fired
+
+    def _fire(self, game_id: str, name: str, sequence: int, callback: Callable[..., Any], *args: Any) -> Any:
+        if self._timers.get((game_id, name)) != sequence:
+            return None  # cancelled or replaced after it was dispatched
+        del self._timers[(game_id, name)]
+        return callback(*args)
+
+    def _run(self) -> None:
+        while True:
+            self._sleep(self.tick)
+            self.run_due()
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator, MutableMapping
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryRoomStore(MutableMapping):
+    """Live game rooms keyed by game_id; nothing survives a restart.
+
+    Behaves like the plain dict the app used before, plus the persistence
+    hooks (``touch``, ``flush``, ``restore``) that durable stores implement.
+    """
+
+    def __init__(self) -> None:
+        self._rooms: dict[str, Any] = {}
+
+    def __getitem__(self, game_id: str) -> Any:
+        return self._rooms[game_id]
+
+    def __setitem__(self, game_id: str, game: Any) -> None:
+        self._rooms[game_id] = game
+
+    def __delitem__(self, game_id: str) -> None:
+        del self._rooms[game_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rooms)
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def touch(self, game: Any) -> None:
+        """Note that a room's state changed."""
+
+    def flush(self) -> int:
+        """Persist rooms changed since the last flush; returns how many were written."""
+        return 0
+
+    def restore(
+        self,
+        accept: Optional[Callable[[str], bool]] = None,
+        rearm: Optional[Callable[[Any, dict[str, float]], None]] = None,
+    ) -> int:
+        """Load rooms saved by a previous process; returns how many were restored.
+
+        Args:
+            accept: Only rooms whose game_id it accepts are loaded (the rooms
+                this worker owns)
+            rearm: Called with each restored room and the seconds left on the
+                timers it had pending when it was saved
+        """
+        return 0
+
+
+class SqliteRoomStore(InMemoryRoomStore):
+    """Room store that snapshots rooms into SQLite for warm restarts.
+
+    Rooms stay live in memory. ``touch`` marks a room dirty and writes it
+    straight away when its status changed since the last snapshot (a round
+    or phase transition); everything else is written by periodic ``flush``
+    calls. Removing a room deletes its snapshot.
+
+    ``timers`` reports the seconds left on a room's pending timers; they are
+    saved as wall-clock deadlines so ``restore`` can re-arm them.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        timers: Optional[Callable[[str], dict[str, float]]] = None,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ) -> None:
+        super().__init__()
+        if session_factory is None:
+            from models.game_items import get_session, init_db
+            import models.room_snapshots  # noqa: F401 - registers the table for init_db
+            init_db()
+            session_factory = get_session
+        self._session_factory = session_factory
+        self._timers = timers
+        self._clock = clock
+        self._dirty: set[str] = set()
+        # game_id -> status at the last snapshot, to detect transitions
+        self._saved_status: dict[str, str] = {}
+
+    def __setitem__(self, game_id: str, game: Any) -> None:
+        super().__setitem__(game_id, game)
+        self._save([game])
+
+    def __delitem__(self, game_id: str) -> None:
+        super().__delitem__(game_id)
+        self._dirty.discard(game_id)
+        self._saved_status.pop(game_id, None)
+        from models.room_snapshots import RoomSnapshot
+        session = self._session_factory()
+        try:
+            session.query(RoomSnapshot).filter(RoomSnapshot.game_id == game_id).delete()
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Failed to delete snapshot for room {game_id}: {e}")
+        finally:
+            session.close()
+
+    def touch(self, game: Any) -> None:
+        game_id = str(game.game_id)
+        if game_id not in self:
+            return
+        if self._saved_status.get(game_id) != game.status:
+            self._save([game])
+        else:
+            self._dirty.add(game_id)
+
+    def flush(self) -> int:
+        games = [self[game_id] for game_id in list(self._dirty) if game_id in self]
+        self._dirty.clear()
+        if games:
+            self._save(games)
+        return len(games)
+
+    def _save(self, games: list[Any]) -> None:
+        from models.room_snapshots import RoomSnapshot
+        session = self._session_factory()
+        try:
+            now = self._clock()
+            for game in games:
+                snapshot = game.to_snapshot()
+                if self._timers:
+                    snapshot['timers'] = {
+                        name: (now + timedelta(seconds=left)).isoformat()
+                        for name, left in self._timers(str(game.game_id)).items()
+                    }
+                session.merge(RoomSnapshot(
+                    game_id=str(game.game_id),
+                    game_type=game.game_type,
+                    state_version=getattr(game, 'state_version', 0),
+                    snapshot=snapshot,
+                    saved_at=now,
+                ))
+            session.commit()
+            for game in games:
+                self._dirty.discard(str(game.game_id))
+                self._saved_status[str(game.game_id)] = game.status
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Failed to snapshot {len(games)} room(s): {e}")
+            self._dirty.update(str(game.game_id) for game in games)
+        finally:
+            session.close()
+
+    def restore(
+        self,
+        accept: Optional[Callable[[str], bool]] = None,
+        rearm: Optional[Callable[[Any, dict[str, float]], None]] = None,
+    ) -> int:
+        from games.registry import restore_game_instance
+        from models.room_snapshots import RoomSnapshot
+        session = self._session_factory()
+        try:
+            rows = session.query(RoomSnapshot).all()
+            snapshots = [(row.game_id, row.snapshot) for row in rows if accept is None or accept(row.game_id)]
+        finally:
+            session.close()
+
+        restored = 0
+        now = self._clock()
+        for game_id, snapshot in snapshots:
+            try:
+                game = restore_game_instance(snapshot)
+            except Exception as e:
+                logger.warning(f"Could not restore room {game_id}: {e}")
+                continue
+            self._rooms[game_id] = game
+            self._saved_status[game_id] = game.status
+            restored += 1
+            timers = {
+                name: max(0.0, (datetime.fromisoformat(deadline) - now).total_seconds())
+                for name, deadline in (snapshot.get('timers') or {}).items()
+            }
+            if rearm and timers:
+                rearm(game, timers)
+        return restored
+
+
+def create_room_store(backend: str = 'memory', **kwargs: Any) -> InMemoryRoomStore:
+    if backend == 'sqlite':
+        return SqliteRoomStore(**kwargs)
+    return InMemoryRoomStore()
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import queue
+import threading
+import uuid
+from typing import Any, Callable, Iterator, Optional
+
+import socketio
+
+logger = logging.getLogger(__name__)
+
+
+class RoomAffinity:
+    """Maps each room id to the worker process that owns its state.
+
+    Ownership uses rendezvous hashing, so every worker computes the same map
+    without coordination and resizing the pool only moves the rooms of the
+    workers that were added or removed. ``assign`` pins a room explicitly.
+    """
+
+    def __init__(self, worker_id: int = 0, worker_count: int = 1) -> None:
+        if not 0 <= worker_id < worker_count:
+            raise ValueError(f'worker_id {worker_id} is outside a pool of {worker_count} workers')
+        self.worker_id = worker_id
+        self.worker_count = worker_count
+        self._assigned: dict[str, int] = {}
+
+    def owner_of(self, game_id: str) -> int:
+        game_id = str(game_id)
+        if game_id in self._assigned:
+            return self._assigned[game_id]
+        if self.worker_count == 1:
+            return 0
+        return max(range(self.worker_count), key=lambda worker: self._weight(worker, game_id))
+
+    def is_local(self, game_id: str) -> bool:
+        return self.owner_of(game_id) == self.worker_id
+
+    def assign(self, game_id: str, worker_id: int) -> None:
+        self._assigned[str(game_id)] = worker_id
+
+    @staticmethod
+    def _weight(worker: int, game_id: str) -> int:
+        digest = hashlib.blake2b(f'{worker}:{game_id}'.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big')
+
+
+class LocalMessageBus:
+    """In-process stand-in for the Redis / AMQP message queues below.
+
+    Every ``listen`` call registers a subscriber that receives all messages
+    published on the channel from then on, including the subscriber's own.
+    """
+
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        self._subscribers: dict[str, list[queue.Queue]] = {}
+
+    def publish(self, channel: str, message: Any) -> None:
+        with self._guard:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            subscriber.put(message)
+
+    def listen(self, channel: str) -> Iterator[Any]:
+        subscriber: queue.Queue = queue.Queue()
+        with self._guard:
+            self._subscribers.setdefault(channel, []).append(subscriber)
+
+        def messages() -> Iterator[Any]:
+            while True:
+                yield subscriber.get()
+
+        return messages()
+
+
+class RedisMessageBus:
+    """Message bus over Redis pub/sub (needs the optional ``redis`` package)."""
+
+    def __init__(self, url: str) -> None:
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError('Redis message queue requires the "redis" package') from e
+        self._redis = redis.Redis.from_url(url)
+
+    def publish(self, channel: str, message: Any) -> None:
+        self._redis.publish(channel, json.dumps(message))
+
+    def listen(self, channel: str) -> Iterator[Any]:
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(channel)
+        return (json.loads(item['data']) for item in pubsub.listen() if item['type'] == 'message')
+
+
+class KombuMessageBus:
+    """Message bus over an AMQP broker such as RabbitMQ (needs the optional ``kombu`` package).
+
+    Each channel is a fanout exchange; every ``listen`` call binds its own
+    auto-expiring queue to it, so every listener sees every message.
+    """
+
+    def __init__(self, url: str) -> None:
+        try:
+            import kombu
+        except ImportError as e:
+            raise RuntimeError('AMQP message queue requires the "kombu" package') from e
+        self._kombu = kombu
+        self._connection = kombu.Connection(url)
+
+    def _exchange(self, channel: str) -> Any:
+        return self._kombu.Exchange(channel, type='fanout', durable=False)
+
+    def publish(self, channel: str, message: Any) -> None:
+        connection = self._connection.clone()
+        try:
+            producer = connection.Producer(exchange=self._exchange(channel), serializer='json')
+            connection.ensure(producer, producer.publish)(message)
+        finally:
+            connection.release()
+
+    def listen(self, channel: str) -> Iterator[Any]:
+        queue = self._kombu.Queue(f'{channel}.{uuid.uuid4().hex}', self._exchange(channel), durable=False,
+                                  queue_arguments={'x-expires': 300000})
+        # Declared and bound now, so nothing published after listen() returns is missed
+        reader = self._connection.clone().SimpleQueue(queue)
+
+        def messages() -> Iterator[Any]:
+            while True:
+                message = reader.get(block=True)
+                message.ack()
+                yield message.payload
+
+        return messages()
+
+
+# Shared by every LocalPubSubManager / forwarder in the process that is not given its own bus
+local_bus = LocalMessageBus()
+
+
+def create_message_bus(url: str) -> Any:
+    if url.startswith('local://'):
+        return local_bus
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisMessageBus(url)
+    if url.startswith(('amqp://', 'amqps://')):
+        return KombuMessageBus(url)
+    raise ValueError(f'Unsupported message queue for room forwarding: {url}')
+
+
+class LocalPubSubManager(socketio.PubSubManager):
+    """Socket.IO client manager that shares emits through a ``LocalMessageBus``.
+
+    Lets several Socket.IO servers in one process (tests, benchmarks) behave
+    like workers connected to a real message queue.
+    """
+
+    name = 'local'
+
+    def __init__(self, bus: Optional[LocalMessageBus] = None, channel: str = 'socketio',
+                 write_only: bool = False, logger: Any = None) -> None:
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.bus = bus or local_bus
+        self._messages = self.bus.listen(self.channel)
+
+    def _publish(self, data: Any) -> None:
+        self.bus.publish(self.channel, data)
+
+    def _listen(self) -> Iterator[Any]:
+        return self._messages
+
+
+class RoomEventForwarder:
+    """Moves room work that reached a non-owning worker over to the owner.
+
+    Socket.IO events are re-run on the owner with the caller's sid and
+    session; session changes travel back to the worker holding the
+    connection. ``query`` runs a named read-only function on the owner and
+    waits for its result; queries the owner does not answer in time and
+    answers that arrive after their query gave up are logged and counted.
+    """
+
+    def __init__(self, affinity: RoomAffinity, bus: Any, channel: str = 'family-games-rooms') -> None:
+        self.affinity = affinity
+        self.bus = bus
+        self.channel = channel
+        self._messages = bus.listen(channel)
+        self._guard = threading.Lock()
+        self._pending: dict[str, list[Any]] = {}
+        self._counters = {'forwarded_events': 0, 'queries': 0, 'query_timeouts': 0, 'late_answers': 0}
+
+    def forward_event(self, game_id: str, handler: str, args: list[Any], sid: str,
+                      namespace: str, session: dict[str, Any]) -> None:
+        with self._guard:
+            self._counters['forwarded_events'] += 1
+        self.bus.publish(self.channel, {
+            'kind': 'event',
+            'worker': self.affinity.owner_of(game_id),
+            'origin': self.affinity.worker_id,
+            'game_id': str(game_id),
+            'handler': handler,
+            'args': args,
+            'sid': sid,
+            'namespace': namespace,
+            'session': session,
+        })
+
+    def send_session(self, worker: int, sid: str, namespace: str, session: dict[str, Any]) -> None:
+        self.bus.publish(self.channel, {
+            'kind': 'session', 'worker': worker, 'sid': sid, 'namespace': namespace, 'session': session,
+        })
+
+    def query(self, game_id: str, name: str, timeout: float = 2.0) -> Any:
+        """Run query ``name`` for the room on its owner; None when it does not answer in time."""
+        query_id = uuid.uuid4().hex
+        waiter = [threading.Event(), None]
+        with self._guard:
+            self._pending[query_id] = waiter
+            self._counters['queries'] += 1
+        self.bus.publish(self.channel, {
+            'kind': 'query',
+            'worker': self.affinity.owner_of(game_id),
+            'origin': self.affinity.worker_id,
+            'id': query_id,
+            'name': name,
+            'game_id': str(game_id),
+        })
+        try:
+            waiter[0].wait(timeout)
+        finally:
+            with self._guard:
+                self._pending.pop(query_id, None)
+                # Checked under the guard: an answer is either delivered here or counted as late
+                answered = waiter[0].is_set()
+                if not answered:
+                    self._counters['query_timeouts'] += 1
+        if not answered:
+            logger.warning(f"Worker {self.affinity.owner_of(game_id)} did not answer {name} "
+                           f"for room {game_id} within {timeout}s")
+        return waiter[1]
+
+    def serve(self, on_event: Callable[[dict[str, Any]], Any], on_session: Callable[[dict[str, Any]], Any],
+              queries: dict[str, Callable[[str], Any]]) -> None:
+        """Handle messages addressed to this worker; blocks, run it as a background task."""
+        for message in self._messages:
+            if message.get('worker') != self.affinity.worker_id:
+                continue
+            try:
+                kind = message.get('kind')
+                if kind == 'event':
+                    on_event(message)
+                elif kind == 'session':
+                    on_session(message)
+                elif kind == 'query':
+                    query = queries.get(message['name'])
+                    result = query(message['game_id']) if query else None
+                    self.bus.publish(self.channel, {
+                        'kind': 'answer', 'worker': message['origin'], 'id': message['id'], 'result': result,
+                    })
+                elif kind == 'answer':
+                    with self._guard:
+                        waiter = self._pending.pop(message['id'], None)
+                        if waiter:
+                            waiter[1] = message['result']
+                            waiter[0].set()
+                        else:
+                            self._counters['late_answers'] += 1
+                    if not waiter:
+                        logger.warning(f"Dropped an answer that arrived after its query {message['id']} timed out")
+            except Exception:
+                logger.exception(f"Failed to handle forwarded {message.get('kind')} message")
+
+    def stats(self) -> dict[str, int]:
+        with self._guard:
+            return dict(self._counters)
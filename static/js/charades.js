@@ -452,6 +452,32 @@ const Utils = {
     }
 };
 
+// Applies JSON-patch style ops (add / replace / remove) sent with game_state_patch
+const StatePatch = {
+    apply(state, ops) {
+        let doc = JSON.parse(JSON.stringify(state));
+        (ops || []).forEach(op => {
+            if (op.path === '') {
+                doc = op.value;
+                return;
+            }
+            const tokens = op.path.split('/').slice(1).map(t => t.replace(/~1/g, '/').replace(/~0/g, '~'));
+            const last = tokens.pop();
+            let parent = doc;
+            tokens.forEach(token => {
+                if (parent[token] === undefined || parent[token] === null) parent[token] = {};
+                parent = parent[token];
+            });
+            if (op.op === 'remove') {
+                delete parent[last];
+            } else {
+                parent[last] = op.value;
+            }
+        });
+        return doc;
+    }
+};
+
 // --- Game Logic ---
 
 class GameEngine {
@@ -597,9 +623,25 @@ class GameEngine {
 
     setupSocketListeners() {
         this.socket.on('game_state', (data) => {
+            this.lastState = data;
             this.gameType = data.game_type || 'charades';
             this.updateGameState(data);
         });
+        this.socket.on('game_state_patch', (patch) => {
+            // Patches only apply on top of the exact version they were built from
+            if (!this.lastState || this.lastState.state_version !== patch.base_version) {
+                this.socket.emit('request_game_state', {
+                    game_id: this.gameId,
+                    player_name: this.playerName,
+                    state_version: this.lastState ? this.lastState.state_version : null
+                });
+                return;
+            }
+            const state = StatePatch.apply(this.lastState, patch.ops);
+            this.lastState = state;
+            this.gameType = state.game_type || 'charades';
+            this.updateGameState(state);
+        });
         this.socket.on('timer_start', (data) => this.startTimer(data.duration));
         this.socket.on('correct_guess', (data) => {
             AudioManager.play('guessed');
@@ -815,6 +857,15 @@ class GameEngine {
                     card.classList.add('pending');
                 }
 
+                // Update the AI verdict badge
+                const aiBadge = card.querySelector('.ai-verdict');
+                const aiHtml = this.aiVerdictBadge(status);
+                if (aiBadge) {
+                    aiBadge.outerHTML = aiHtml;
+                } else if (aiHtml) {
+                    card.querySelector('strong')?.insertAdjacentHTML('afterend', aiHtml);
+                }
+
                 // Update vote counts
                 const voteValidSpan = card.querySelector('.vote-valid');
                 const voteInvalidSpan = card.querySelector('.vote-invalid');
@@ -1337,8 +1388,8 @@ class GameEngine {
             }
 
             if (timeLeft <= 0) {
+                // The server owns round expiry and broadcasts round_timeout itself
                 this.stopTimer();
-                this.socket.emit('round_timeout', { game_id: this.gameId });
             }
         }, 1000);
     }
@@ -1855,6 +1906,7 @@ class GameEngine {
 
         // Clear all inputs
         busArea.querySelectorAll('.bus-input').forEach(input => { input.value = ''; input.disabled = false; });
+        this._busSentAnswers = {};
 
         // Update letter display
         const letterEl = document.getElementById('current-letter');
@@ -1868,13 +1920,18 @@ class GameEngine {
         if (!this._busInputsBound) {
             this._busInputsBound = true;
             let syncTimeout = null;
+            // Only categories whose value changed since the last sync are sent,
+            // one patch each; seq lets the server drop patches replayed out of order
+            this._busSeq = this._busSeq || Date.now();
             const syncAnswers = () => {
-                const answers = {};
                 busArea.querySelectorAll('.bus-input').forEach(input => {
                     const cat = input.dataset.category;
-                    if (cat) answers[cat] = input.value.trim();
+                    const answer = input.value.trim();
+                    if (!cat || this._busSentAnswers[cat] === answer) return;
+                    if (this._busSentAnswers[cat] === undefined && !answer) return;
+                    this._busSentAnswers[cat] = answer;
+                    this.socket.emit('patch_bus_answer', { game_id: this.gameId, category: cat, answer, seq: ++this._busSeq });
                 });
-                this.socket.emit('submit_bus_answers', { game_id: this.gameId, answers });
             };
             busArea.querySelectorAll('.bus-input').forEach(input => {
                 input.addEventListener('input', () => {
@@ -1926,12 +1983,13 @@ class GameEngine {
             catWords.forEach(([key, status]) => {
                 const validClass = status.is_valid === true ? 'valid' : (status.is_valid === false ? 'invalid' : 'pending');
                 const prevBadge = status.previously_validated ? '<span class="badge badge-team-2" style="font-size: 0.7rem;">✓ سابق</span>' : '';
+                const aiBadge = this.aiVerdictBadge(status);
                 const playerVote = status.votes?.[this.playerName];
                 const voteIndicator = playerVote !== undefined
                     ? `<div class="user-vote-indicator ${playerVote ? 'valid' : 'invalid'}"><i class="fas fa-${playerVote ? 'check' : 'times'}"></i></div>`
                     : '';
                 html += `<div class="validation-card ${validClass}" data-answer-key="${key}" style="display: flex; justify-content: space-between; align-items: center; padding: 0.8rem; margin-bottom: 0.5rem; border: 2px solid var(--border); border-radius: 12px; cursor: pointer;" onclick="window.gameInstance.submitBusVote('${key}')">`;
-                html += `<div><strong>${status.answer}</strong> ${prevBadge}<div style="font-size: 0.8rem; color: var(--text-light);">${status.players.join(', ')}</div></div>`;
+                html += `<div><strong>${status.answer}</strong> ${prevBadge}${aiBadge}<div style="font-size: 0.8rem; color: var(--text-light);">${status.players.join(', ')}</div></div>`;
                 html += `<div style="display: flex; gap: 0.5rem; align-items: center;">`;
                 html += `<span class="vote-valid" style="color: var(--success);"><i class="fas fa-check"></i> ${status.valid_count}</span>`;
                 html += `<span class="vote-invalid" style="color: var(--danger);"><i class="fas fa-times"></i> ${status.invalid_count}</span>`;
@@ -1950,6 +2008,16 @@ class GameEngine {
         this.updateValidationProgress();
     }
 
+    aiVerdictBadge(status) {
+        if (status.ai_valid === true) {
+            return ' <span class="badge ai-verdict" style="font-size: 0.7rem; color: var(--success);" title="رأي الذكاء الاصطناعي"><i class="fas fa-robot"></i> ✓</span>';
+        }
+        if (status.ai_valid === false) {
+            return ' <span class="badge ai-verdict" style="font-size: 0.7rem; color: var(--danger);" title="رأي الذكاء الاصطناعي"><i class="fas fa-robot"></i> ✗</span>';
+        }
+        return '';
+    }
+
     submitBusVote(answerKey) {
         // Toggle: first click = valid, second click on same = invalid, third = remove
         const card = document.querySelector(`.validation-card[data-answer-key="${answerKey}"]`);
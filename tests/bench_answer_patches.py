@@ -0,0 +1,99 @@
+"""
+Bus Complete answer sync: whole-dict submit_answers versus per-category patches.
+
+Simulates a player typing seven answers one keystroke-debounce at a time
+and compares payload bytes and server time for both sync styles, with and
+without the per-player throttle. Room prefetching is replaced by a no-op.
+Run directly:
+
+    python tests/bench_answer_patches.py [players]
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import games.charades.models as charades_models  # noqa: E402
+from games.bus_complete.models import BusCompleteGame  # noqa: E402
+from services.answer_patches import AnswerPatchThrottle  # noqa: E402
+
+ANSWERS = {'اسم': 'أحمد', 'حيوان': 'أسد', 'نبات': 'أرز', 'جماد': 'إبريق', 'بلاد': 'الأردن', 'أكلة': 'أرز بلبن', 'مهنة': 'أستاذ'}
+
+
+class NoPrefetch:
+    def prefetch_for_room(self, *args, **kwargs):
+        pass
+
+
+def typing_steps():
+    """Answer states after every debounced sync: one more character each time."""
+    typed = {category: '' for category in ANSWERS}
+    for category, answer in ANSWERS.items():
+        for end in range(1, len(answer) + 1):
+            typed[category] = answer[:end]
+            yield category, dict(typed)
+
+
+def make_game(players):
+    game = BusCompleteGame('bench', 'p0', {'validate_answers': False, 'use_online_validation': False})
+    for i in range(1, players):
+        game.add_player(f'p{i}')
+    game.start_game()
+    game.current_letter = 'ا'
+    return game
+
+
+def run_full(players):
+    game = make_game(players)
+    sent = 0
+    started = time.perf_counter()
+    for _, answers in typing_steps():
+        for i in range(players):
+            payload = {'game_id': 'bench', 'answers': answers}
+            sent += len(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+            game.submit_answers(f'p{i}', payload['answers'])
+    return sent, time.perf_counter() - started, 0
+
+
+def run_patches(players, throttle=None):
+    game = make_game(players)
+    sent = applied = 0
+    seq = 0
+    started = time.perf_counter()
+    for category, answers in typing_steps():
+        seq += 1
+        for i in range(players):
+            payload = {'game_id': 'bench', 'category': category, 'answer': answers[category], 'seq': seq}
+            sent += len(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+            if throttle and not throttle.admit(('bench', f'p{i}'), category, payload['answer'], seq):
+                continue
+            applied += 1
+            game.patch_answer(f'p{i}', category, payload['answer'], seq)
+    if throttle:
+        for player, patches in throttle.drain_room('bench').items():
+            for category, answer, patch_seq in patches:
+                applied += 1
+                game.patch_answer(player, category, answer, patch_seq)
+    return sent, time.perf_counter() - started, applied
+
+
+def main() -> None:
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    charades_models.get_data_service = lambda: NoPrefetch()
+    steps = sum(1 for _ in typing_steps())
+
+    sent, elapsed, _ = run_full(players)
+    print(f'whole dict:         {sent / 1024:7.1f} KB, {elapsed * 1000:6.2f} ms, {steps * players} applies')
+    sent, elapsed, applied = run_patches(players)
+    print(f'patches:            {sent / 1024:7.1f} KB, {elapsed * 1000:6.2f} ms, {applied} applies')
+    # Steps arrive back to back here, so the throttle coalesces nearly all of them
+    sent, elapsed, applied = run_patches(players, AnswerPatchThrottle(interval=0.2))
+    print(f'patches, throttled: {sent / 1024:7.1f} KB, {elapsed * 1000:6.2f} ms, {applied} applies')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+AI answer validation: one request per room versus the shared batching service.
+
+Rooms submit overlapping words against the local Groq stub (with simulated
+model latency). Run directly:
+
+    python tests/bench_answer_validation.py [rooms] [words_per_room] [latency_s]
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from models.answer_verdicts import AnswerVerdict  # noqa: E402
+from models.game_items import Base  # noqa: E402
+from services.answer_validation import AnswerValidationService, GroqJudge, VerdictCache  # noqa: E402
+from tests.groq_stub import GroqStubServer  # noqa: E402
+
+CATEGORIES = ['اسم', 'حيوان', 'نبات', 'جماد', 'بلاد', 'أكلة', 'مهنة']
+
+
+def room_words(rng, words_per_room):
+    vocabulary = [f'كلمة{i}' for i in range(60)]
+    return [(rng.choice(CATEGORIES), word) for word in rng.sample(vocabulary, words_per_room)]
+
+
+def per_room(stub, rooms):
+    judge = GroqJudge(api_key='bench', base_url=stub.url)
+    started = time.perf_counter()
+    threads = [threading.Thread(target=judge, args=(words,)) for words in rooms]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def batched(stub, rooms, cache):
+    service = AnswerValidationService(
+        GroqJudge(api_key='bench', base_url=stub.url), cache,
+        spawn=lambda run: threading.Thread(target=run, daemon=True).start(), window=0.05, max_batch=1000,
+    )
+    done = threading.Semaphore(0)
+    started = time.perf_counter()
+    waiting = 0
+    for words in rooms:
+        cached = service.submit([(cat, word, word) for cat, word in words], lambda verdicts: done.release())
+        if len(cached) < len(set(words)):
+            waiting += 1
+    for _ in range(waiting):
+        done.acquire()
+    return time.perf_counter() - started, service.stats()
+
+
+def main() -> None:
+    rooms_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    words_per_room = int(sys.argv[2]) if len(sys.argv) > 2 else 14
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.3
+    rng = random.Random(3)
+    rooms = [room_words(rng, words_per_room) for _ in range(rooms_count)]
+
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[AnswerVerdict.__table__])
+    cache = VerdictCache(session_factory=sessionmaker(bind=engine))
+
+    with GroqStubServer(latency=latency) as stub:
+        elapsed = per_room(stub, rooms)
+        print(f'per room:          {len(stub.requests):3d} requests, {elapsed * 1000:7.0f} ms')
+        for round_number in (1, 2):
+            stub.requests.clear()
+            elapsed, stats = batched(stub, rooms, cache)
+            print(f'batched, round {round_number}: {len(stub.requests):3d} requests, {elapsed * 1000:7.0f} ms, '
+                  f'{stats["cache_hits"]}/{stats["submitted"]} pairs from cache')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Normalization throughput over the full Hans Wehr wordlist.
+
+Compares the normalizers the games used before with the shared one, cold
+(every word a cache miss) and warm (every word cached).
+Run directly:
+
+    python tests/bench_arabic_normalization.py [passes]
+"""
+from __future__ import annotations
+
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from games.arabic_text import _normalize, normalize_arabic  # noqa: E402
+
+
+def bus_complete_before(text):
+    normalized = str(text).strip()
+    normalized = normalized.replace('أ', 'ا').replace('إ', 'ا').replace('آ', 'ا')
+    normalized = normalized.replace('ة', 'ه').replace('ى', 'ي').replace('ئ', 'ي').replace('ؤ', 'و')
+    return normalized
+
+
+def riddles_before(text):
+    t = text.strip().lower()
+    t = t.replace('أ', 'ا').replace('إ', 'ا').replace('آ', 'ا')
+    t = t.replace('ة', 'ه').replace('ى', 'ي')
+    t = t.replace('ؤ', 'و').replace('ئ', 'ي')
+    t = re.sub(r'[\u064B-\u065F\u0670]', '', t)
+    t = re.sub(r'[^\w\s]', '', t)
+    return t
+
+
+def rate(normalize, words, passes):
+    started = time.perf_counter()
+    for _ in range(passes):
+        for word in words:
+            normalize(word)
+    return len(words) * passes / (time.perf_counter() - started)
+
+
+def main() -> None:
+    passes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with open(os.path.join(ROOT, 'static/data/arabic_wordlist.txt'), encoding='utf-8') as handle:
+        words = [line for line in handle if line.strip()]
+
+    print(f'{len(words)} words, {passes} passes')
+    print(f'bus complete, before: {rate(bus_complete_before, words, passes):>12,.0f} words/s')
+    print(f'riddles, before:      {rate(riddles_before, words, passes):>12,.0f} words/s')
+    _normalize.cache_clear()
+    print(f'shared, cold:         {rate(normalize_arabic, words, 1):>12,.0f} words/s')
+    print(f'shared, warm:         {rate(normalize_arabic, words, passes):>12,.0f} words/s')
+    print(f'shared + punctuation: {rate(lambda word: normalize_arabic(word, True), words, passes):>12,.0f} words/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Bus Complete round start and validation latency as the dictionaries grow.
+
+Synthetic categorized dictionaries and wordlists of increasing size are
+indexed once; round start (letter choice) and offline validation should
+stay flat. Room prefetching is replaced by a no-op. Run directly:
+
+    python tests/bench_bus_letter_index.py [max_words]
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import games.charades.models as charades_models  # noqa: E402
+from games.bus_complete.models import BusCompleteGame  # noqa: E402
+
+LETTERS = 'ابتثجحخدذرزسشصضطظعغفقكلمنهوي'
+
+
+class NoPrefetch:
+    def prefetch_for_room(self, *args, **kwargs):
+        pass
+
+
+def synthetic_words(count, rng):
+    return {rng.choice(LETTERS) + ''.join(rng.choices(LETTERS, k=rng.randint(2, 7))) for _ in range(count)}
+
+
+def measure(game, words, rng, probes=20000):
+    per_category = len(words) // (2 * len(game.categories))
+    word_list = list(words)
+    game.answer_dictionary = {
+        category: frozenset(word_list[i * per_category:(i + 1) * per_category])
+        for i, category in enumerate(game.categories)
+    }
+    game.general_wordlist = frozenset(word_list)
+
+    started = time.perf_counter()
+    game._letter_index()
+    build_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        game.next_round()
+    round_us = (time.perf_counter() - started) * 1e6 / 1000
+
+    answers = [(rng.choice(game.categories), rng.choice(word_list) if rng.random() < 0.5 else 'ب' + 'x' * 4)
+               for _ in range(probes)]
+    started = time.perf_counter()
+    for category, answer in answers:
+        game._is_valid_offline(category, answer)
+    validate_us = (time.perf_counter() - started) * 1e6 / probes
+    return build_ms, round_us, validate_us
+
+
+def main() -> None:
+    max_words = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    charades_models.get_data_service = NoPrefetch
+    rng = random.Random(7)
+    game = BusCompleteGame('bench', 'host')
+
+    size = 5_000
+    while size <= max_words:
+        build_ms, round_us, validate_us = measure(game, synthetic_words(size, rng), rng)
+        print(f'{size:>8,} words: index {build_ms:8.1f} ms, round start {round_us:6.1f} us, '
+              f'validation {validate_us:5.2f} us/answer')
+        size *= 10
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Cost of creating Bus Complete rooms.
+
+The first room loads and normalizes the word lists; later rooms share them.
+Room prefetching is replaced by a no-op so only the game itself is measured.
+Run directly:
+
+    python tests/bench_bus_room_creation.py [rooms]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import games.charades.models as charades_models  # noqa: E402
+from games.bus_complete.models import BusCompleteGame  # noqa: E402
+
+
+class NoPrefetch:
+    def prefetch_for_room(self, *args, **kwargs):
+        pass
+
+
+def main() -> None:
+    rooms = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    charades_models.get_data_service = NoPrefetch
+
+    started = time.perf_counter()
+    BusCompleteGame('first', 'host')
+    print(f'first room (loads word lists): {(time.perf_counter() - started) * 1000:.2f} ms')
+
+    started = time.perf_counter()
+    for room in range(rooms):
+        BusCompleteGame(str(room), 'host')
+    print(f'each later room: {(time.perf_counter() - started) * 1000 / rooms:.3f} ms')
+
+    tracemalloc.start()
+    kept = [BusCompleteGame(str(room), 'host') for room in range(10)]
+    print(f'memory per room: {tracemalloc.get_traced_memory()[0] / len(kept) / 1024:.1f} KB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Refetch cycles with and without the on-disk HTTP cache.
+
+Fetches the Islamic quiz document from a local stand-in (with simulated
+latency) once per refetch cycle: downloading it every time, revalidating
+it with its ETag every time (TTL 0), and serving it from disk while it is
+fresh. Run directly:
+
+    python tests/bench_http_cache.py [cycles] [latency_s]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.fetchers.http_cache import HttpCache  # noqa: E402
+from services.fetchers.trivia_fetcher import TriviaFetcher  # noqa: E402
+from tests.trivia_stub import TriviaStubServer  # noqa: E402
+
+
+def cycles(stub, count, cache=None, ttl=None):
+    fetcher = TriviaFetcher()
+    fetcher.http_cache = cache
+    fetcher.rate_limiter.rate = None
+    fetcher.islamic_quiz_url = stub.url
+    if ttl is not None:
+        fetcher.cache_ttl = ttl
+    requests_before = len(stub.requests)
+    started = time.perf_counter()
+    for _ in range(count):
+        fetcher._fetch_islamic_quiz(5)
+    return (time.perf_counter() - started) / count, len(stub.requests) - requests_before
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+
+    with TriviaStubServer(latency) as stub, tempfile.TemporaryDirectory() as scratch:
+        uncached, uncached_requests = cycles(stub, count)
+        revalidated, revalidated_requests = cycles(stub, count, HttpCache(os.path.join(scratch, 'revalidate')), ttl=0)
+        fresh, fresh_requests = cycles(stub, count, HttpCache(os.path.join(scratch, 'fresh')))
+
+    print(f'{count} refetch cycles, {latency:.2f} s per request')
+    print(f'no cache:          {uncached * 1000:8.2f} ms per cycle ({uncached_requests} full downloads)')
+    print(f'revalidate (304):  {revalidated * 1000:8.2f} ms per cycle ({revalidated_requests} requests, 1 full download)')
+    print(f'fresh from disk:   {fresh * 1000:8.2f} ms per cycle ({fresh_requests} request)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Item ingest throughput: one transaction per item versus bulk ingest_items.
+
+Imports 1K and 100K synthetic trivia questions (plus 10% duplicates) into
+a scratch SQLite database. The per-item path is the previous add_items
+loop (duplicate SELECT, insert and commit per item); it is capped at
+``legacy_cap`` items and reported per second. Run directly:
+
+    python tests/bench_item_ingest.py [legacy_cap]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+import models.game_items as game_items  # noqa: E402
+from models.game_items import GameItem, compute_content_hash, get_session  # noqa: E402
+from services.data_manager import DataManager  # noqa: E402
+
+SIZES = (1_000, 100_000)
+
+
+def questions(count, offset=0):
+    items = [('عام', {'question': f'سؤال {offset + i}', 'correct_answer': str(i), 'category': 'عام'}) for i in range(count)]
+    return items + items[:count // 10]
+
+
+def legacy_add(game_type, items, source):
+    """The previous path: DataService called add_items once per item."""
+    for category, item_data in items:
+        session = get_session()
+        try:
+            content_hash = compute_content_hash(game_type, item_data)
+            if session.query(GameItem).filter(GameItem.game_type == game_type,
+                                              GameItem.content_hash == content_hash).first():
+                continue
+            session.add(GameItem(game_type=game_type, category=category, item_data=item_data,
+                                 source=source, content_hash=content_hash))
+            session.commit()
+        finally:
+            session.close()
+
+
+def main() -> None:
+    legacy_cap = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    with tempfile.TemporaryDirectory() as scratch:
+        game_items.engine = create_engine(f"sqlite:///{os.path.join(scratch, 'bench.db')}")
+        game_items.SessionLocal.configure(bind=game_items.engine)
+        manager = DataManager()
+
+        offset = 0
+        for size in SIZES:
+            batch = questions(size, offset)
+            started = time.perf_counter()
+            result = manager.ingest_items('trivia', batch, source='bench')
+            elapsed = time.perf_counter() - started
+            print(f'bulk,     {size:>7,} items: {elapsed:7.2f} s, {len(batch) / elapsed:9,.0f} rows/s, {result}')
+            offset += size
+
+            legacy_batch = questions(min(size, legacy_cap), offset)
+            started = time.perf_counter()
+            legacy_add('rapid_fire', legacy_batch, source='bench')
+            elapsed = time.perf_counter() - started
+            estimate = len(questions(size)) / (len(legacy_batch) / elapsed)
+            print(f'per item, {size:>7,} items: {len(legacy_batch) / elapsed:9,.0f} rows/s over {len(legacy_batch):,} '
+                  f'rows, ~{estimate:,.0f} s for the full import')
+            offset += size
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Serving the next item: database per turn versus the in-memory item pool.
+
+Fills a scratch SQLite database, then serves rooms one item per turn the
+way DataService used to (cache status counts, select, update, insert and
+commit per item) and through ItemPool cursors with usage flushed in one
+write-behind batch. Run directly:
+
+    python tests/bench_item_pool.py [items] [rooms] [turns]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+import models.game_items as game_items  # noqa: E402
+from services.data_manager import DataManager  # noqa: E402
+from services.item_pool import ItemPool  # noqa: E402
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    rooms = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    turns = int(sys.argv[3]) if len(sys.argv) > 3 else 25
+
+    with tempfile.TemporaryDirectory() as scratch:
+        game_items.engine = create_engine(f"sqlite:///{os.path.join(scratch, 'bench.db')}")
+        game_items.SessionLocal.configure(bind=game_items.engine)
+        manager = DataManager()
+        manager.add_items('trivia', 'عام', [
+            {'question': f'سؤال {i}', 'correct_answer': str(i), 'category': 'عام'} for i in range(total)
+        ], source='bench')
+        serves = rooms * turns
+
+        started = time.perf_counter()
+        for turn in range(turns):
+            for room in range(rooms):
+                manager.get_cache_status('trivia')
+                manager.get_items_for_room(f'db-{room}', 'trivia')
+        per_turn_db = (time.perf_counter() - started) / serves
+
+        pool = ItemPool(manager)
+        started = time.perf_counter()
+        pool.warm(['trivia'])
+        warm = time.perf_counter() - started
+        started = time.perf_counter()
+        for turn in range(turns):
+            for room in range(rooms):
+                pool.size('trivia')
+                pool.next_items(f'pool-{room}', 'trivia')
+        per_turn_pool = (time.perf_counter() - started) / serves
+        started = time.perf_counter()
+        written = pool.flush_usage()
+        flush = time.perf_counter() - started
+
+    print(f'{total} items, {rooms} rooms x {turns} turns')
+    print(f'database per turn: {per_turn_db * 1000:8.3f} ms per item')
+    print(f'item pool:         {per_turn_pool * 1000:8.3f} ms per item '
+          f'(warm-up {warm * 1000:.1f} ms, one flush of {written} events {flush * 1000:.1f} ms)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Latency of serving the next item to a room as the room gets longer.
+
+Fills a scratch SQLite database with items, then serves a room 10, 100
+and 1000 items and times the next serves with the old ``NOT IN (<used
+ids>)`` query and the current ``NOT EXISTS`` anti-join. Run directly:
+
+    python tests/bench_room_items.py [items]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+import models.game_items as game_items  # noqa: E402
+from models.game_items import GameItem, RoomItemUsage, get_session  # noqa: E402
+from services.data_manager import DataManager  # noqa: E402
+
+ROOM_LENGTHS = (10, 100, 1000)
+PROBES = 20
+
+
+def legacy_get_items_for_room(room_id, game_type, category=None, count=1):
+    """The previous implementation: used ids bound as parameters, one usage row per item."""
+    session = get_session()
+    try:
+        used_ids = [item_id for (item_id,) in session.query(RoomItemUsage.item_id).filter(
+            RoomItemUsage.room_id == room_id).all()]
+        query = session.query(GameItem).filter(GameItem.game_type == game_type)
+        if category:
+            query = query.filter(GameItem.category == category)
+        if used_ids:
+            query = query.filter(~GameItem.id.in_(used_ids))
+        items = query.order_by(GameItem.last_used.asc().nullsfirst()).limit(count).all()
+        for item in items:
+            item.last_used = datetime.utcnow()
+            item.use_count += 1
+            session.add(RoomItemUsage(room_id=room_id, item_id=item.id))
+        session.commit()
+        return [item.item_data for item in items]
+    finally:
+        session.close()
+
+
+def fill(manager, total):
+    manager.add_items('pictionary', 'عام', [
+        {'word': f'كلمة {i}', 'category': 'عام'} for i in range(total)
+    ], source='bench')
+
+
+def measure(serve, room_id):
+    timings = {}
+    served = 0
+    for length in ROOM_LENGTHS:
+        while served < length:
+            serve(room_id, 'pictionary')
+            served += 1
+        started = time.perf_counter()
+        for _ in range(PROBES):
+            serve(room_id, 'pictionary')
+        served += PROBES
+        timings[length] = (time.perf_counter() - started) / PROBES
+    return timings
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with tempfile.TemporaryDirectory() as scratch:
+        game_items.engine = create_engine(f"sqlite:///{os.path.join(scratch, 'bench.db')}")
+        game_items.SessionLocal.configure(bind=game_items.engine)
+        manager = DataManager()
+        fill(manager, total)
+
+        legacy = measure(legacy_get_items_for_room, 'legacy-room')
+        current = measure(manager.get_items_for_room, 'current-room')
+
+    print(f'{total} items in the pool, ms per serve')
+    print('room length   NOT IN   NOT EXISTS')
+    for length in ROOM_LENGTHS:
+        print(f'{length:11d} {legacy[length] * 1000:8.2f} {current[length] * 1000:12.2f}')
+
+
+if __name__ == '__main__':
+    main()
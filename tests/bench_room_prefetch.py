@@ -0,0 +1,87 @@
+"""
+Room creation on a cold cache: refetching inline versus the refill worker.
+
+Creates rooms against an empty scratch database whose "scrape" just sleeps
+for a while and then adds items, first refetching inside room creation
+the way DataService used to and then queueing the refill on the
+background PrefetchWorker. Each room then asks for its first item, which
+is where a room may still have to wait. Run directly:
+
+    python tests/bench_room_prefetch.py [rooms] [scrape_seconds]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+import models.game_items as game_items  # noqa: E402
+from services.data_service import DataService  # noqa: E402
+
+
+def make_service(scrape: float) -> DataService:
+    service = DataService()
+    batches = [0]
+
+    def refill(game_type, category=None, count=30):
+        time.sleep(scrape)
+        batches[0] += 1
+        service.data_manager.ingest_items(game_type, [
+            ('عام', {'word': f'كلمة {batches[0]}-{i}', 'category': 'عام'}) for i in range(count)
+        ], source='bench')
+        service.item_pool.refresh(game_type)
+
+    service._refetch_items = refill
+    service.configure_prefetch(low=10, high=60)
+    return service
+
+
+def main() -> None:
+    rooms = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    scrape = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+
+    with tempfile.TemporaryDirectory() as scratch:
+        game_items.engine = create_engine(f"sqlite:///{os.path.join(scratch, 'bench.db')}")
+        game_items.SessionLocal.configure(bind=game_items.engine)
+        game_items.init_db()
+
+        service = make_service(scrape)
+        started = time.perf_counter()
+        inline = []
+        for room in range(rooms):
+            created = time.perf_counter()
+            if service.item_pool.size('pictionary') < 30:
+                service._refetch_items('pictionary', count=30)
+            inline.append(time.perf_counter() - created)
+            service.item_pool.next_items(f'inline-{room}', 'pictionary')
+        inline_total = time.perf_counter() - started
+
+        game_items.engine = create_engine(f"sqlite:///{os.path.join(scratch, 'bench-worker.db')}")
+        game_items.SessionLocal.configure(bind=game_items.engine)
+        game_items.init_db()
+
+        service = make_service(scrape)
+        started = time.perf_counter()
+        queued = []
+        for room in range(rooms):
+            created = time.perf_counter()
+            service.prefetch_for_room(f'worker-{room}', 'pictionary', count=30)
+            queued.append(time.perf_counter() - created)
+            service.get_item_for_room(f'worker-{room}', 'pictionary')
+        worker_total = time.perf_counter() - started
+        service.prefetcher.wait_idle(timeout=30)
+        stats = service.prefetcher.stats()
+
+    print(f'{rooms} rooms, {scrape:.2f} s per scrape')
+    print(f'inline refetch: slowest room creation {max(inline) * 1000:8.1f} ms, all rooms {inline_total:.2f} s')
+    print(f'refill worker:  slowest room creation {max(queued) * 1000:8.1f} ms, all rooms {worker_total:.2f} s '
+          f'({stats["waits"]} rooms waited {stats["wait_seconds"]:.2f} s for a first item, {stats["refills"]} refills)')
+
+
+if __name__ == '__main__':
+    main()
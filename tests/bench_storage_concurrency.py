@@ -0,0 +1,92 @@
+"""
+Concurrent get_items_for_room throughput across simulated rooms.
+
+Each room is a thread serving itself items straight from SQLite (the
+DataManager path, without the in-memory pool) while also reading cache
+status. Compares the default engine (rollback journal, default pool)
+with create_storage_engine (WAL, synchronous=NORMAL, busy timeout,
+larger pool), with and without read-only connections for selects. Run
+directly:
+
+    python tests/bench_storage_concurrency.py [rooms] [serves_per_room]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+import models.game_items as game_items  # noqa: E402
+from services.data_manager import DataManager  # noqa: E402
+
+ITEMS = 5000
+rooms_pool = 50
+
+
+def configure(path, mode):
+    if mode == 'default':
+        # What models/game_items.py used to create
+        engine = create_engine(f'sqlite:///{path}', echo=False)
+    else:
+        engine = game_items.create_storage_engine(path, pool_size=rooms_pool, max_overflow=10)
+    game_items.engine = engine
+    game_items.SessionLocal.configure(bind=engine)
+    game_items.DB_READ_POOL_SIZE = rooms_pool if mode == 'tuned + read pool' else 0
+    if game_items.read_engine is not None:
+        game_items.read_engine.dispose()
+    game_items.read_engine = game_items.ReadSessionLocal = None
+    return DataManager()
+
+
+def run(mode, rooms, serves):
+    with tempfile.TemporaryDirectory() as scratch:
+        manager = configure(os.path.join(scratch, 'bench.db'), mode)
+        manager.ingest_items('trivia', [
+            ('عام', {'question': f'سؤال {i}', 'correct_answer': str(i), 'category': 'عام'}) for i in range(ITEMS)
+        ], source='bench')
+        errors = []
+        served = [0] * rooms
+        start = threading.Barrier(rooms + 1)
+
+        def room(index):
+            start.wait()
+            for _ in range(serves):
+                try:
+                    # What DataService did before every item: the cache-status counts
+                    manager._query_cache_status('trivia', None)
+                    served[index] += len(manager.get_items_for_room(f'room-{index}', 'trivia'))
+                except Exception as e:  # "database is locked" under contention
+                    errors.append(str(e).splitlines()[0])
+
+        threads = [threading.Thread(target=room, args=(i,)) for i in range(rooms)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        game_items.engine.dispose()
+        if game_items.read_engine:
+            game_items.read_engine.dispose()
+    return sum(served), elapsed, errors
+
+
+def main() -> None:
+    rooms = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    serves = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(f'{rooms} rooms x {serves} serves, {ITEMS} items')
+    for mode in ('default', 'tuned', 'tuned + read pool'):
+        total, elapsed, errors = run(mode, rooms, serves)
+        print(f'{mode:18s} {total / elapsed:8.0f} serves/s  {elapsed:6.2f} s  {len(errors)} errors'
+              + (f' ({", ".join(sorted(set(errors)))})' if errors else ''))
+
+
+if __name__ == '__main__':
+    main()
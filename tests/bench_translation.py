@@ -0,0 +1,70 @@
+"""
+Translating OpenTDB questions: one request per question versus batches.
+
+Drives GroqTranslator against the local Groq stand-in (simulated request
+latency plus per-question generation time) with a scratch translation
+memory: one question per request as TriviaFetcher used to, batches of
+``batch_size`` streamed back line by line, and the same questions again
+once they are in the translation memory. Run directly:
+
+    python tests/bench_translation.py [questions] [batch_size] [latency_s] [item_latency_s]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+import models.game_items as game_items  # noqa: E402
+from services.fetchers.translation import BatchTranslator, GroqTranslator, TranslationMemory  # noqa: E402
+from tests.trivia_stub import TriviaStubServer  # noqa: E402
+
+
+def questions(count, offset=0):
+    return [{'question': f'Question {i}?', 'correct_answer': 'Yes', 'wrong_answers': ['No', 'Maybe', 'Never']}
+            for i in range(offset, offset + count)]
+
+
+def timed(translator, batch_size, batch):
+    batch_translator = BatchTranslator(translator, TranslationMemory(), batch_size=batch_size)
+    started = time.perf_counter()
+    first = None
+    translated = 0
+    for _ in batch_translator.translate(batch):
+        translated += 1
+        if first is None:
+            first = time.perf_counter() - started
+    return time.perf_counter() - started, first or 0.0, translated, batch_translator.stats()['requests']
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.3
+    item_latency = float(sys.argv[4]) if len(sys.argv) > 4 else 0.02
+
+    with TriviaStubServer(latency, item_latency) as groq, tempfile.TemporaryDirectory() as scratch:
+        game_items.engine = create_engine(f"sqlite:///{os.path.join(scratch, 'bench.db')}")
+        game_items.SessionLocal.configure(bind=game_items.engine)
+        translator = GroqTranslator(api_key='bench', base_url=groq.url)
+        translator._get_client()
+
+        rows = [
+            ('one per request', *timed(translator, 1, questions(count))),
+            (f'batches of {batch_size}', *timed(translator, batch_size, questions(count, offset=count))),
+            ('translation memory', *timed(translator, batch_size, questions(count, offset=count))),
+        ]
+
+    print(f'{count} questions, {latency:.2f} s per request + {item_latency * 1000:.0f} ms per question')
+    for label, total, first, translated, requests in rows:
+        print(f'{label:20} {total:6.2f} s total, first after {first * 1000:7.1f} ms '
+              f'({translated} translated, {requests} requests)')
+
+
+if __name__ == '__main__':
+    main()
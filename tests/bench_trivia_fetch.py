@@ -0,0 +1,88 @@
+"""
+Trivia batch wall-clock time: sources one after another versus concurrently.
+
+Points TriviaFetcher at local stand-ins for the Islamic Quiz, OpenTDB and
+Groq hosts (one server per host, each with simulated latency; translations
+go to a scratch translation memory) and fetches
+batches the way fetch_batch used to (every source in turn, one delay per
+fetcher whatever the host) and through the concurrent pipeline with a
+token bucket per host. Run directly:
+
+    python tests/bench_trivia_fetch.py [count] [latency_s] [rate_limit_delay_s]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+import models.game_items as game_items  # noqa: E402
+from services.fetchers.translation import GroqTranslator  # noqa: E402
+from services.fetchers.trivia_fetcher import TriviaFetcher  # noqa: E402
+from tests.trivia_stub import TriviaStubServer  # noqa: E402
+
+
+class SequentialTriviaFetcher(TriviaFetcher):
+    """The previous fetch_batch and fetcher-wide rate limit."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_request_time = 0
+
+    def _rate_limit(self, url):
+        elapsed = time.time() - self.last_request_time
+        if elapsed < self.rate_limit_delay:
+            time.sleep(self.rate_limit_delay - elapsed)
+        self.last_request_time = time.time()
+
+    def fetch_batch(self, count=30):
+        per = max(1, count // 7)
+        items = []
+        for fetch in (self._fetch_islamic_quiz, self._fetch_general_knowledge, self._fetch_science,
+                      self._fetch_history, self._fetch_geography, self._fetch_sports, self._fetch_egyptian_cinema):
+            items.extend(fetch(per))
+        if len(items) < count:
+            items.extend(self._fetch_opentdb(count - len(items)))
+        return items[:count]
+
+
+def timed(fetcher_class, count, delay, islamic, opentdb, groq, database):
+    # A fresh translation memory, and no HTTP cache, for each run
+    game_items.engine = create_engine(f"sqlite:///{database}")
+    game_items.SessionLocal.configure(bind=game_items.engine)
+    fetcher = fetcher_class(ai_api_key='bench')
+    fetcher.http_cache = None
+    fetcher.rate_limit_delay = delay
+    fetcher.rate_limiter.rate = 1 / delay
+    fetcher.islamic_quiz_url = islamic.url
+    fetcher.opentdb_url = f'{opentdb.url}/api.php'
+    fetcher.translator.translator = GroqTranslator(api_key='bench', base_url=groq.url)
+    started = time.perf_counter()
+    items = fetcher.fetch_batch(count)
+    return time.perf_counter() - started, len(items)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+    delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+
+    with TriviaStubServer(latency) as islamic, TriviaStubServer(latency) as opentdb, TriviaStubServer(latency) as groq, \
+            tempfile.TemporaryDirectory() as scratch:
+        sequential, sequential_items = timed(SequentialTriviaFetcher, count, delay, islamic, opentdb, groq,
+                                             os.path.join(scratch, 'sequential.db'))
+        concurrent, concurrent_items = timed(TriviaFetcher, count, delay, islamic, opentdb, groq,
+                                             os.path.join(scratch, 'concurrent.db'))
+
+    print(f'batch of {count}, {latency:.2f} s per request, {delay:.2f} s between requests to a host')
+    print(f'one source at a time: {sequential:6.2f} s ({sequential_items} items)')
+    print(f'concurrent pipeline:  {concurrent:6.2f} s ({concurrent_items} items)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Cost of routing room events between workers.
+
+Runs N Socket.IO servers in one process, each a worker the way app.py sets
+one up: a LocalPubSubManager shares its broadcasts with the other servers,
+a RoomEventForwarder moves events for rooms it does not own (RoomAffinity)
+to the owner, and the owner applies them through a RoomExecutor and
+broadcasts the new state to the room. Every event is sent once to the
+room's owner (direct) and once to a worker that does not own the room
+(routed); the difference is the forwarding overhead per event. Run directly:
+
+    python tests/bench_worker_scaling.py [max_workers] [rooms] [events_per_room]
+
+Everything shares one interpreter, so this measures the routing hop, not
+how throughput scales across processes.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import socketio  # noqa: E402
+
+from games.base import BaseGame  # noqa: E402
+from services.room_executor import RoomExecutor  # noqa: E402
+from services.worker_routing import (  # noqa: E402
+    LocalMessageBus, LocalPubSubManager, RoomAffinity, RoomEventForwarder,
+)
+
+
+class BenchGame(BaseGame):
+    def __init__(self, game_id, host, settings=None):
+        super().__init__(game_id, host, 'bench', settings)
+
+
+class Worker:
+    """One Socket.IO server owning the rooms its affinity assigns to it."""
+
+    def __init__(self, worker_id: int, worker_count: int, bus: LocalMessageBus, rooms: int, applied) -> None:
+        self.affinity = RoomAffinity(worker_id, worker_count)
+        self.server = socketio.Server(async_mode='threading', client_manager=LocalPubSubManager(bus))
+        self.server.manager.initialize()
+        self.forwarder = RoomEventForwarder(self.affinity, bus)
+        self.executor = RoomExecutor()
+        self.applied = applied
+        self.games = {}
+        for room in map(str, range(rooms)):
+            if self.affinity.is_local(room):
+                self.games[room] = BenchGame(room, 'host')
+                for player in range(5):
+                    self.games[room].add_player(f'player{player}')
+        self.server.on('add_score', self.handle_add_score)
+        threading.Thread(
+            target=self.forwarder.serve,
+            args=(lambda message: self.handle_add_score(message['sid'], *message['args']), lambda message: None, {}),
+            daemon=True,
+        ).start()
+
+    def handle_add_score(self, sid: str, data: dict) -> None:
+        room = data['game_id']
+        if not self.affinity.is_local(room):
+            self.forwarder.forward_event(room, 'add_score', [data], sid, '/', {})
+            return
+        self.executor.run(room, self._apply, room, data['player'])
+
+    def _apply(self, room: str, player: str) -> None:
+        game = self.games[room]
+        game.add_score(player, 1)
+        game.bump_state_version()
+        self.server.emit('game_state', game.to_snapshot(), to=room)
+        self.applied()
+
+
+def measure(worker_count: int, rooms: int, events_per_room: int, routed: bool) -> float:
+    done = threading.Condition()
+    count = [0]
+
+    def applied() -> None:
+        with done:
+            count[0] += 1
+            done.notify_all()
+
+    bus = LocalMessageBus()
+    workers = [Worker(worker_id, worker_count, bus, rooms, applied) for worker_id in range(worker_count)]
+    affinity = workers[0].affinity
+    entry = {
+        room: workers[(affinity.owner_of(room) + (1 if routed else 0)) % worker_count]
+        for room in map(str, range(rooms))
+    }
+    expected = rooms * events_per_room
+
+    started = time.perf_counter()
+    for event in range(events_per_room):
+        for room, worker in entry.items():
+            worker.handle_add_score(f'sid-{room}', {'game_id': room, 'player': f'player{event % 5}'})
+    with done:
+        if not done.wait_for(lambda: count[0] == expected, timeout=120):
+            raise RuntimeError(f'only {count[0]} of {expected} events were applied')
+    return expected / (time.perf_counter() - started)
+
+
+def main() -> None:
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    rooms = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    events_per_room = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+    for worker_count in range(2, max_workers + 1):
+        direct = measure(worker_count, rooms, events_per_room, routed=False)
+        routed = measure(worker_count, rooms, events_per_room, routed=True)
+        overhead_us = (1 / routed - 1 / direct) * 1e6
+        print(f'{worker_count} workers: direct {direct:,.0f} events/s, routed {routed:,.0f} events/s '
+              f'(forwarding adds {overhead_us:,.0f} us/event)')
+
+
+if __name__ == '__main__':
+    main()
@@ -10,10 +10,18 @@ import pytest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+@pytest.fixture(autouse=True, scope='session')
+def http_cache_dir(tmp_path_factory):
+    """Fetchers cache responses in a scratch directory instead of http_cache/."""
+    os.environ['FAMILY_GAMES_HTTP_CACHE_DIR'] = str(tmp_path_factory.mktemp('http_cache'))
+
+
 @pytest.fixture
 def app():
     """Create a Flask test application with SocketIO."""
     os.environ['FAMILY_GAMES_SKIP_EVENTLET_PATCH'] = '1'
+    # Broadcast state inline so test clients see it before the handler returns
+    os.environ['FAMILY_GAMES_STATE_FLUSH_MS'] = '0'
 
     from app import app as flask_app, socketio, game_rooms
     flask_app.config['TESTING'] = True
@@ -27,6 +35,7 @@ def app():
     # Cleanup
     game_rooms.clear()
     os.environ.pop('FAMILY_GAMES_SKIP_EVENTLET_PATCH', None)
+    os.environ.pop('FAMILY_GAMES_STATE_FLUSH_MS', None)
 
 
 @pytest.fixture
@@ -51,6 +60,27 @@ def game_rooms():
     rooms.clear()
 
 
+@pytest.fixture
+def data_manager(tmp_path, monkeypatch):
+    """DataManager on a scratch SQLite database instead of game_data.db."""
+    from sqlalchemy import create_engine
+    import models.game_items as game_items
+    from services import data_service
+    from services.data_manager import DataManager
+
+    # Background refills from earlier tests must not land in the scratch database
+    if data_service._data_service is not None:
+        data_service._data_service.prefetcher.wait_idle(timeout=60)
+    original = game_items.engine
+    engine = create_engine(f"sqlite:///{tmp_path / 'items.db'}")
+    monkeypatch.setattr(game_items, 'engine', engine)
+    game_items.SessionLocal.configure(bind=engine)
+    try:
+        yield DataManager()
+    finally:
+        game_items.SessionLocal.configure(bind=original)
+
+
 # ── Sample Data Fixtures ──────────────────────────────────────────────
 
 
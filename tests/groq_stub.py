@@ -0,0 +1,76 @@
+"""
+Local stand-in for the Groq chat completions endpoint.
+
+Answers Bus Complete judging prompts by echoing every word back with a
+verdict from ``judge(category, word)``. Point ``GroqJudge`` at it with
+``base_url=stub.url``. With ``chars_per_token`` set, replies longer than
+the request's ``max_tokens`` allow are cut off there, as the API does.
+"""
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+ITEM_LINE = re.compile(r'^\s*"(?P<word>[^"]+)" -> category "(?P<category>[^"]+)"', re.MULTILINE)
+
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 64
+
+
+class GroqStubServer:
+    def __init__(self, judge: Callable[[str, str], bool] = lambda category, word: True, latency: float = 0.0,
+                 chars_per_token: Optional[float] = None) -> None:
+        self.judge = judge
+        self.latency = latency
+        self.chars_per_token = chars_per_token
+        self.requests: list[list[tuple[str, str]]] = []
+        self.max_tokens: list[int] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                prompt = body['messages'][-1]['content']
+                pairs = [(m['category'], m['word']) for m in ITEM_LINE.finditer(prompt)]
+                stub.requests.append(pairs)
+                stub.max_tokens.append(body.get('max_tokens'))
+                if stub.latency:
+                    time.sleep(stub.latency)
+                content = json.dumps({'results': [
+                    {'word': word, 'category': category, 'valid': stub.judge(category, word)}
+                    for category, word in pairs
+                ]}, ensure_ascii=False)
+                finish_reason = 'stop'
+                if stub.chars_per_token and body.get('max_tokens'):
+                    limit = int(body['max_tokens'] * stub.chars_per_token)
+                    if len(content) > limit:
+                        content, finish_reason = content[:limit], 'length'
+                payload = json.dumps({
+                    'id': 'stub', 'object': 'chat.completion', 'created': int(time.time()), 'model': body['model'],
+                    'choices': [{'index': 0, 'finish_reason': finish_reason,
+                                 'message': {'role': 'assistant', 'content': content}}],
+                }).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _Server(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def __enter__(self) -> 'GroqStubServer':
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,98 @@
+"""
+Tests for per-category Bus Complete answer patches and the per-player throttle.
+"""
+from services.answer_patches import AnswerPatchThrottle
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_patch_updates_only_its_category(make_bus_game):
+    game = make_bus_game()
+    game.submit_answers('host', {'حيوان': 'أسد', 'نبات': 'أرز'})
+
+    assert game.patch_answer('host', 'بلاد', 'الأردن', seq=1)
+    assert game.player_submissions['host'] == {'حيوان': 'أسد', 'نبات': 'أرز', 'بلاد': 'الأردن'}
+    assert game.partial_submissions['host']['بلاد'] == 'الأردن'
+
+
+def test_unchanged_and_stale_patches_are_dropped(make_bus_game):
+    game = make_bus_game()
+
+    assert game.patch_answer('host', 'حيوان', 'أسد', seq=5)
+    assert not game.patch_answer('host', 'حيوان', ' أسد ', seq=6)
+    assert not game.patch_answer('host', 'حيوان', 'أرنب', seq=4)
+    assert game.patch_answer('host', 'نبات', 'أرز', seq=3)  # sequences are per category
+    assert game.player_submissions['host'] == {'حيوان': 'أسد', 'نبات': 'أرز'}
+
+
+def test_patch_tracks_wrong_letter_answers(make_bus_game):
+    game = make_bus_game()
+
+    assert game.patch_answer('host', 'حيوان', 'نمر', seq=1)
+    assert game.wrong_letter_answers['host'] == {'حيوان': 'نمر'}
+    assert game.player_submissions['host']['حيوان'] == ''
+
+    assert game.patch_answer('host', 'حيوان', 'أسد', seq=2)
+    assert game.wrong_letter_answers['host'] == {}
+    assert not game.patch_answer('host', 'كوكب', 'أرض', seq=3)
+
+
+def test_clearing_an_answer_keeps_the_partial_submission(make_bus_game):
+    game = make_bus_game()
+    game.patch_answer('host', 'حيوان', 'أسد', seq=1)
+    game.patch_answer('host', 'حيوان', '', seq=2)
+
+    assert game.player_submissions['host']['حيوان'] == ''
+    assert game.partial_submissions['host']['حيوان'] == 'أسد'
+
+
+def test_next_round_resets_sequences(make_bus_game):
+    game = make_bus_game()
+    game.patch_answer('host', 'حيوان', 'أسد', seq=9)
+    game.next_round()
+    game.current_letter = 'ا'
+
+    assert game.patch_answer('host', 'حيوان', 'أرنب', seq=1)
+
+
+def test_throttle_holds_patches_within_the_interval():
+    clock = FakeClock()
+    throttle = AnswerPatchThrottle(interval=0.2, clock=clock)
+    key = ('room', 'host')
+
+    assert throttle.admit(key, 'حيوان', 'أ', 1)
+    assert not throttle.admit(key, 'حيوان', 'أس', 2)
+    assert not throttle.admit(key, 'حيوان', 'أسد', 3)
+    assert not throttle.admit(key, 'نبات', 'أرز', 4)
+    assert throttle.delay(key) == 0.2
+
+    clock.now += 0.2
+    assert sorted(throttle.drain(key)) == [('حيوان', 'أسد', 3), ('نبات', 'أرز', 4)]
+    assert throttle.drain(key) == []
+    assert not throttle.admit(key, 'حيوان', 'أسدي', 5)  # just drained: the next interval has started
+
+
+def test_stop_bus_applies_held_patches(app, client, game_rooms, make_bus_game):
+    from app import socketio
+
+    game = make_bus_game(game_id='bus123')
+    game_rooms['bus123'] = game
+    with client.session_transaction() as flask_session:
+        flask_session['player_name'] = 'host'
+    socket_client = socketio.test_client(app, flask_test_client=client)
+    socket_client.emit('verify_game', {'game_id': 'bus123', 'player_name': 'host'})
+    socket_client.get_received()
+
+    socket_client.emit('patch_bus_answer', {'game_id': 'bus123', 'category': 'حيوان', 'answer': 'أسد', 'seq': 1})
+    socket_client.emit('patch_bus_answer', {'game_id': 'bus123', 'category': 'نبات', 'answer': 'أرز', 'seq': 2})
+    assert socket_client.get_received() == []  # patches are not broadcast
+    assert game.player_submissions['host'] == {'حيوان': 'أسد'}
+
+    socket_client.emit('stop_bus', {'game_id': 'bus123'})
+    assert game.player_submissions['host'] == {'حيوان': 'أسد', 'نبات': 'أرز'}
@@ -0,0 +1,120 @@
+"""
+Tests for cross-room AI answer validation against the local Groq stub.
+"""
+import threading
+
+import pytest
+
+from services.answer_validation import AnswerValidationService, GroqJudge, VerdictCache
+from tests.groq_stub import GroqStubServer
+
+
+@pytest.fixture
+def verdict_cache():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from models.game_items import Base
+    from models.answer_verdicts import AnswerVerdict
+
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[AnswerVerdict.__table__])
+    return lambda: VerdictCache(session_factory=sessionmaker(bind=engine))
+
+
+def make_service(stub, cache):
+    # The loop is driven by hand through flush(); nothing is spawned
+    return AnswerValidationService(GroqJudge(api_key='test', base_url=stub.url), cache, spawn=lambda run: None)
+
+
+def test_judge_talks_to_the_stub():
+    with GroqStubServer(judge=lambda category, word: word != 'زرافة') as stub:
+        verdicts = GroqJudge(api_key='test', base_url=stub.url)([('حيوان', 'أسد'), ('نبات', 'زرافة')])
+
+    assert verdicts == {('حيوان', 'أسد'): True, ('نبات', 'زرافة'): False}
+
+
+def test_full_batch_fits_the_completion_budget():
+    pairs = [('حيوان', f'كلمة{i}') for i in range(60)]
+    # Arabic runs about two characters per token
+    with GroqStubServer(chars_per_token=2) as stub:
+        verdicts = GroqJudge(api_key='test', base_url=stub.url)(pairs)
+
+    assert len(verdicts) == 60
+    assert stub.max_tokens[0] > 1024
+
+
+def test_truncated_response_keeps_the_complete_verdicts(verdict_cache):
+    pairs = [('حيوان', f'كلمة{i}', f'كلمة{i}') for i in range(10)]
+    # Room for roughly half of the verdicts before the reply is cut off
+    with GroqStubServer(chars_per_token=0.5) as stub:
+        service = make_service(stub, verdict_cache())
+        verdicts = service.flush([(pairs, lambda share: None)])
+
+    assert 0 < len(verdicts) < len(pairs)
+    assert all(verdicts.values())
+    assert len(stub.requests) == 1
+    # Only the verdicts that arrived are cached; the rest are asked again
+    assert service.cache.get_many((cat, norm) for cat, norm, _ in pairs) == verdicts
+
+
+def test_judge_without_key_is_unavailable():
+    judge = GroqJudge(api_key='')
+
+    assert not judge.available()
+    assert judge([('حيوان', 'أسد')]) == {}
+
+
+def test_rooms_share_one_request_per_batch(verdict_cache):
+    with GroqStubServer() as stub:
+        service = make_service(stub, verdict_cache())
+        delivered = {}
+        service.submit([('حيوان', 'اسد', 'أسد')], lambda v: delivered.setdefault('room1', v))
+        service.submit([('حيوان', 'اسد', 'أسد'), ('نبات', 'ورد', 'ورد')], lambda v: delivered.setdefault('room2', v))
+
+        batch = [service._queue.get_nowait(), service._queue.get_nowait()]
+        service.flush(batch)
+
+    assert len(stub.requests) == 1
+    assert sorted(stub.requests[0]) == [('حيوان', 'أسد'), ('نبات', 'ورد')]
+    assert delivered['room1'] == {('حيوان', 'اسد'): True}
+    assert delivered['room2'] == {('حيوان', 'اسد'): True, ('نبات', 'ورد'): True}
+
+
+def test_verdicts_persist_across_service_instances(verdict_cache):
+    with GroqStubServer() as stub:
+        first = make_service(stub, verdict_cache())
+        first.submit([('حيوان', 'اسد', 'أسد')], lambda v: None)
+        first.flush([first._queue.get_nowait()])
+
+        second = make_service(stub, verdict_cache())
+        cached = second.submit([('حيوان', 'اسد', 'أسد')], lambda v: None)
+
+    assert cached == {('حيوان', 'اسد'): True}
+    assert second._queue.empty()
+    assert len(stub.requests) == 1
+
+
+def test_background_loop_delivers_verdicts(verdict_cache):
+    delivered = threading.Event()
+    with GroqStubServer() as stub:
+        service = AnswerValidationService(
+            GroqJudge(api_key='test', base_url=stub.url), verdict_cache(),
+            spawn=lambda run: threading.Thread(target=run, daemon=True).start(), window=0.01,
+        )
+        service.submit([('مهنة', 'طبيب', 'طبيب')], lambda v: delivered.set())
+
+        assert delivered.wait(5)
+    assert service.stats()['requests'] == 1
+
+
+def test_game_attaches_ai_verdicts_to_rows(make_bus_game):
+    game = make_bus_game()
+    game.validate_answers = game.use_online_validation = True
+    game.submit_answers('host', {'حيوان': 'أسد'})
+    game.stop_bus('host')
+
+    assert game.ai_validation_pairs() == [('حيوان', 'اسد', 'أسد')]
+    assert game.apply_ai_verdicts({('حيوان', 'اسد'): False}) == ['حيوان|اسد']
+    assert game.get_all_validation_statuses()['حيوان|اسد']['ai_valid'] is False
+    assert game.ai_validation_pairs() == []
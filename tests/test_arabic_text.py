@@ -0,0 +1,35 @@
+"""
+Tests for the shared Arabic normalization.
+"""
+from games.arabic_text import normalize_arabic
+from games.riddles.models import RiddlesGame
+from games.twenty_questions.models import TwentyQuestionsGame
+
+
+def test_folds_letter_variants():
+    assert normalize_arabic(' أإآٱ ') == 'اااا'
+    assert normalize_arabic('مدرسة') == 'مدرسه'
+    assert normalize_arabic('مستشفى') == 'مستشفي'
+    assert normalize_arabic('مؤمن بئر') == 'مومن بير'
+
+
+def test_strips_tashkeel_and_tatweel():
+    assert normalize_arabic('كِتَابٌ') == 'كتاب'
+    assert normalize_arabic('جـــمل') == 'جمل'
+    assert normalize_arabic('رحمٰن') == 'رحمن'
+
+
+def test_empty_and_non_string_input():
+    assert normalize_arabic(None) == ''
+    assert normalize_arabic('') == ''
+    assert normalize_arabic(42) == '42'
+
+
+def test_punctuation_is_only_stripped_on_request():
+    assert normalize_arabic('قمر!') == 'قمر!'
+    assert normalize_arabic('قمر!', strip_punctuation=True) == 'قمر'
+
+
+def test_games_share_the_same_rules():
+    assert RiddlesGame._normalize('القَمَر؟') == 'القمر'
+    assert TwentyQuestionsGame._normalize('Cat قطّة') == 'cat قطه'
@@ -0,0 +1,45 @@
+"""
+Tests for the Bus Complete validation-status table.
+"""
+
+
+def stopped_bus_game(make_bus_game):
+    game = make_bus_game()
+    game.submit_answers('host', {'حيوان': 'أسد', 'نبات': 'أرز'})
+    game.submit_answers('player2', {'حيوان': 'أسد'})
+    game.stop_bus('host')
+    return game
+
+
+def test_validation_table_is_built_once_at_stop_bus(make_bus_game):
+    game = stopped_bus_game(make_bus_game)
+    table = game.get_all_validation_statuses()
+
+    assert set(table) == {'حيوان|اسد', 'نبات|ارز'}
+    assert table['حيوان|اسد']['players'] == ['host', 'player2']
+    assert game.get_all_validation_statuses() is table
+
+
+def test_votes_update_counts_incrementally(make_bus_game):
+    game = stopped_bus_game(make_bus_game)
+
+    game.submit_validation_vote('host', 'حيوان|اسد', True)
+    row = game.submit_validation_vote('player2', 'حيوان|اسد', True)
+    assert (row['valid_count'], row['invalid_count'], row['is_valid']) == (2, 0, True)
+
+    row = game.submit_validation_vote('player2', 'حيوان|اسد', False)
+    assert (row['valid_count'], row['invalid_count'], row['is_valid']) == (1, 1, None)
+
+    row = game.submit_validation_vote('player2', 'حيوان|اسد', False)  # same vote again withdraws it
+    assert (row['valid_count'], row['invalid_count']) == (1, 0)
+    assert game.get_all_validation_statuses()['حيوان|اسد'] is row
+
+
+def test_player_count_change_rechecks_majorities(make_bus_game):
+    game = stopped_bus_game(make_bus_game)
+    game.submit_validation_vote('host', 'نبات|ارز', True)
+    assert game.get_all_validation_statuses()['نبات|ارز']['is_valid'] is None
+
+    game.players = [p for p in game.players if p['name'] == 'host']
+
+    assert game.get_all_validation_statuses()['نبات|ارز']['is_valid'] is True
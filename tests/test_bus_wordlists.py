@@ -0,0 +1,129 @@
+"""
+Tests for the shared Bus Complete word lists.
+"""
+import json
+import threading
+import time
+
+from games.bus_complete.wordlists import (
+    LetterIndex, ValidatedWordsStore, get_letter_index, get_validated_words_store, load_answer_dictionary,
+    load_general_wordlist,
+)
+
+
+def test_word_lists_are_loaded_once_and_shared(tmp_path):
+    wordlist = tmp_path / 'words.txt'
+    wordlist.write_text('أسد\nقطة\n\n', encoding='utf-8')
+    dictionary = tmp_path / 'dictionary.json'
+    dictionary.write_text(json.dumps({'حيوان': ['أسد']}, ensure_ascii=False), encoding='utf-8')
+
+    words = load_general_wordlist(str(wordlist))
+
+    assert words == frozenset({'اسد', 'قطه'})
+    assert load_general_wordlist(str(wordlist)) is words
+    assert load_answer_dictionary(str(dictionary)) is load_answer_dictionary(str(dictionary))
+    assert load_answer_dictionary(str(dictionary))['حيوان'] == frozenset({'اسد'})
+
+
+def test_missing_files_give_empty_lists(tmp_path):
+    assert load_general_wordlist(str(tmp_path / 'missing.txt')) == frozenset()
+    assert dict(load_answer_dictionary(str(tmp_path / 'missing.json'))) == {}
+
+
+def test_validated_words_update_swaps_a_new_mapping(tmp_path):
+    path = tmp_path / 'validated.json'
+    path.write_text(json.dumps({'حيوان': ['اسد']}, ensure_ascii=False), encoding='utf-8')
+    store = ValidatedWordsStore(str(path), ['حيوان', 'نبات'])
+    before = store.words
+
+    store.update({'حيوان': ['قطه']}, {'حيوان': ['اسد']})
+
+    assert before['حيوان'] == frozenset({'اسد'})
+    assert store.words['حيوان'] == frozenset({'قطه'})
+
+
+def test_updates_are_journaled_and_replayed(tmp_path):
+    path = tmp_path / 'validated.json'
+    path.write_text(json.dumps({'حيوان': ['اسد']}, ensure_ascii=False), encoding='utf-8')
+    store = ValidatedWordsStore(str(path), ['حيوان'])
+
+    store.update({'حيوان': ['قطه']}, {})
+    store.update({}, {'حيوان': ['اسد']})
+
+    assert json.loads(path.read_text(encoding='utf-8')) == {'حيوان': ['اسد']}
+    assert len(open(store.journal_path, encoding='utf-8').readlines()) == 2
+    assert ValidatedWordsStore(str(path), ['حيوان']).words['حيوان'] == frozenset({'قطه'})
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    path = tmp_path / 'validated.json'
+    store = ValidatedWordsStore(str(path), ['حيوان', 'نبات'])
+    store.update({'حيوان': ['قطه', 'اسد'], 'نبات': ['ورد']}, {})
+    # Another process journaled an event this store has not seen
+    with open(store.journal_path, 'a', encoding='utf-8') as handle:
+        handle.write(json.dumps({'op': 'add', 'category': 'نبات', 'words': ['فل']}, ensure_ascii=False) + '\n')
+
+    assert store.compact() is True
+
+    assert json.loads(path.read_text(encoding='utf-8')) == {'حيوان': ['اسد', 'قطه'], 'نبات': ['فل', 'ورد']}
+    assert not (tmp_path / 'validated.json.journal').exists()
+    assert store.words['نبات'] == frozenset({'ورد', 'فل'})
+    assert store.compact() is False
+
+
+def test_appends_during_compaction_are_not_lost(tmp_path, monkeypatch):
+    path = tmp_path / 'validated.json'
+    compacting, other_worker = ValidatedWordsStore(str(path), ['حيوان']), ValidatedWordsStore(str(path), ['حيوان'])
+    compacting.update({'حيوان': ['قطه']}, {})
+    appender = threading.Thread(target=other_worker.update, args=({'حيوان': ['اسد']}, {}))
+    read_file, reads = compacting._read_file, []
+
+    def read_then_let_the_other_worker_append():
+        reads.append(read_file())
+        if len(reads) == 2:  # compaction has replayed the journal and is about to write
+            appender.start()
+            time.sleep(0.1)  # the append waits for the compaction to finish
+        return reads[-1]
+
+    monkeypatch.setattr(compacting, '_read_file', read_then_let_the_other_worker_append)
+    assert compacting.compact() is True
+    appender.join()
+
+    assert ValidatedWordsStore(str(path), ['حيوان']).words['حيوان'] == frozenset({'قطه', 'اسد'})
+
+
+def test_rooms_on_the_same_file_share_a_store(tmp_path):
+    path = str(tmp_path / 'validated.json')
+
+    assert get_validated_words_store(path, ['حيوان']) is get_validated_words_store(path, ['حيوان'])
+
+
+def test_letter_index_partitions_by_first_letter():
+    dictionary = {'حيوان': frozenset({'اسد', 'ارنب', 'قطه'}), 'نبات': frozenset({'ورد'})}
+    index = LetterIndex(dictionary, frozenset({'اسد', 'بيت'}))
+
+    assert index.in_category('حيوان', 'اسد')
+    assert not index.in_category('نبات', 'اسد')
+    assert index.in_wordlist('بيت') and not index.in_wordlist('ورد')
+    assert dict(index.words_for('ا')) == {'حيوان': frozenset({'اسد', 'ارنب'})}
+    assert index.coverage('ا') == 2 and index.coverage('ظ') == 0
+
+
+def test_letter_index_is_shared_per_word_list_pair():
+    dictionary, wordlist = {'حيوان': frozenset({'اسد'})}, frozenset()
+
+    assert get_letter_index(dictionary, wordlist) is get_letter_index(dictionary, wordlist)
+    assert get_letter_index(dictionary, frozenset({'بيت'})) is not get_letter_index(dictionary, wordlist)
+
+
+def test_rounds_skip_letters_without_enough_words(make_bus_game):
+    game = make_bus_game()
+    game.answer_dictionary = {'حيوان': frozenset({'اسد', 'ارنب', 'بطه'})}
+    game.settings['min_letter_words'] = 2
+
+    assert game.playable_letters() == ['أ']
+    game.next_round()
+    assert game.current_letter == 'أ'
+
+    game.settings['min_letter_words'] = 5
+    assert game.playable_letters() == game.alphabet
@@ -0,0 +1,53 @@
+"""
+Tests for ConnectionRegistry: per-room sid lookups and cleanup.
+"""
+from services.connection_registry import ConnectionRegistry
+
+
+def test_same_name_in_two_rooms_keeps_both_sids():
+    connections = ConnectionRegistry()
+    connections.bind('sid-1', 'r1', 'Ahmed')
+    connections.bind('sid-2', 'r2', 'Ahmed')
+
+    assert connections.sid_for('r1', 'Ahmed') == 'sid-1'
+    assert connections.sid_for('r2', 'Ahmed') == 'sid-2'
+    assert connections.binding_for('sid-2') == ('r2', 'Ahmed')
+
+
+def test_reconnect_replaces_the_old_sid():
+    connections = ConnectionRegistry()
+    connections.bind('old', 'r1', 'Ahmed')
+    connections.bind('new', 'r1', 'Ahmed')
+
+    assert connections.sid_for('r1', 'Ahmed') == 'new'
+    assert connections.binding_for('old') is None
+    assert connections.count('r1') == 1
+
+    # The stale socket disconnecting late must not drop the new one
+    assert connections.unbind('old') is None
+    assert connections.sid_for('r1', 'Ahmed') == 'new'
+
+
+def test_unbind_returns_binding_and_updates_counts():
+    connections = ConnectionRegistry()
+    connections.bind('sid-1', 'r1', 'a')
+    connections.bind('sid-2', 'r1', 'b')
+
+    assert connections.unbind('sid-1') == ('r1', 'a')
+    assert connections.count('r1') == 1
+    assert len(connections) == 1
+
+
+def test_forget_room_and_player():
+    connections = ConnectionRegistry()
+    connections.bind('sid-1', 'r1', 'a')
+    connections.bind('sid-2', 'r1', 'b')
+    connections.bind('sid-3', 'r2', 'a')
+
+    connections.forget_player('r1', 'a')
+    connections.forget_room('r1')
+
+    assert connections.count('r1') == 0
+    assert connections.binding_for('sid-2') is None
+    assert connections.sid_for('r2', 'a') == 'sid-3'
+    assert len(connections) == 1
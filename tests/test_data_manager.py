@@ -0,0 +1,136 @@
+"""
+Tests for DataManager item distribution, against a scratch SQLite database.
+"""
+
+
+def add_words(manager, count, category='عام'):
+    manager.add_items('pictionary', category, [
+        {'word': f'كلمة {i}', 'category': category} for i in range(count)
+    ], source='test')
+
+
+def test_room_never_gets_an_item_twice(data_manager):
+    add_words(data_manager, 12)
+
+    served = [item['word'] for _ in range(4) for item in data_manager.get_items_for_room('room1', 'pictionary', count=3)]
+
+    assert len(served) == 12
+    assert len(set(served)) == 12
+    assert data_manager.get_items_for_room('room1', 'pictionary') == []
+
+
+def test_rooms_are_independent_and_prefer_least_recent(data_manager):
+    add_words(data_manager, 3)
+    first = data_manager.get_items_for_room('room1', 'pictionary', count=2)
+
+    # room2 gets the item room1 has not used yet before the used ones
+    assert data_manager.get_items_for_room('room2', 'pictionary') == [
+        item for item in [{'word': f'كلمة {i}', 'category': 'عام'} for i in range(3)] if item not in first
+    ]
+    assert len(data_manager.get_items_for_room('room2', 'pictionary', count=5)) == 2
+
+
+def test_serving_updates_usage(data_manager):
+    from models.game_items import GameItem, RoomItemUsage, get_session
+
+    add_words(data_manager, 2)
+    data_manager.get_items_for_room('room1', 'pictionary', count=2)
+    data_manager.get_items_for_room('room2', 'pictionary', count=1)
+
+    session = get_session()
+    try:
+        assert sorted(item.use_count for item in session.query(GameItem)) == [1, 2]
+        assert session.query(RoomItemUsage).filter(RoomItemUsage.room_id == 'room1').count() == 2
+    finally:
+        session.close()
+
+    data_manager.clear_room_usage('room1')
+    assert len(data_manager.get_items_for_room('room1', 'pictionary', count=2)) == 2
+
+
+def test_cache_status_counters_follow_adds_and_serves(data_manager):
+    add_words(data_manager, 3)
+    assert data_manager.get_cache_status('pictionary')['total_items'] == 3
+
+    add_words(data_manager, 2, category='حيوانات')
+    data_manager.get_items_for_room('room1', 'pictionary', count=2)
+    status = data_manager.get_cache_status('pictionary')
+
+    assert (status['total_items'], status['unused_items'], status['needs_refetch']) == (5, 3, True)
+    assert data_manager.reconcile_cache_status() == {}
+
+
+def test_cache_status_counts_write_behind_usage(data_manager):
+    add_words(data_manager, 2)
+    data_manager.get_cache_status('pictionary', 'عام')
+    ids = [item_id for item_id, _, _ in data_manager.load_items('pictionary')]
+
+    from datetime import datetime
+    data_manager.record_usage([('room1', ids[0], datetime.utcnow()), ('room2', ids[0], datetime.utcnow())])
+
+    assert data_manager.get_cache_status('pictionary', 'عام')['unused_items'] == 1
+    assert data_manager.reconcile_cache_status() == {}
+
+
+def test_reconciliation_reports_drift(data_manager):
+    add_words(data_manager, 2)
+    data_manager.get_cache_status('pictionary')
+
+    # Another process adds an item behind this manager's back
+    from services.data_manager import DataManager
+    DataManager().add_items('pictionary', 'عام', [{'word': 'جديد', 'category': 'عام'}], source='test')
+
+    drift = data_manager.reconcile_cache_status()
+    assert drift['pictionary/*']['total_items'] == {'cached': 2, 'actual': 3}
+    assert data_manager.get_cache_status('pictionary')['total_items'] == 3
+    assert data_manager.cache_status_report()['drift'] == drift
+
+
+def test_ingest_skips_duplicates_in_one_transaction(data_manager):
+    add_words(data_manager, 2)
+    batch = [('عام', {'word': f'كلمة {i}', 'category': 'عام'}) for i in range(4)]
+    batch.append(('عام', {'word': 'كلمة 3', 'category': 'عام'}))
+
+    assert data_manager.ingest_items('pictionary', batch, source='test') == {'added': 2, 'skipped': 3}
+    assert data_manager.get_cache_status('pictionary')['total_items'] == 4
+    assert data_manager.add_items('trivia', 'عام', [{'word': 'كلمة 0', 'category': 'عام'}], source='test') == 1
+
+
+def test_migration_makes_content_hash_unique(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine, text
+    import models.game_items as game_items
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE game_items (id INTEGER PRIMARY KEY, game_type VARCHAR(50) NOT NULL, category VARCHAR(100), "
+            "item_data JSON NOT NULL, source VARCHAR(200), content_hash VARCHAR(64), last_used DATETIME, "
+            "use_count INTEGER, created_at DATETIME)"
+        ))
+        connection.execute(text("CREATE INDEX idx_game_type_content_hash ON game_items (game_type, content_hash)"))
+        connection.execute(text(
+            "CREATE TABLE room_item_usage (id INTEGER PRIMARY KEY, room_id VARCHAR(50) NOT NULL, "
+            "item_id INTEGER NOT NULL, used_at DATETIME)"
+        ))
+        for item_id in (1, 2, 3):
+            connection.execute(text(
+                "INSERT INTO game_items (id, game_type, item_data, content_hash) VALUES (:id, 'trivia', '{}', :hash)"
+            ), {'id': item_id, 'hash': 'same' if item_id < 3 else 'other'})
+            connection.execute(text(
+                "INSERT INTO room_item_usage (room_id, item_id) VALUES ('room1', :id)"
+            ), {'id': item_id})
+    monkeypatch.setattr(game_items, 'engine', engine)
+    original_bind = game_items.SessionLocal.kw['bind']
+    game_items.SessionLocal.configure(bind=engine)
+    try:
+        game_items.init_db()
+    finally:
+        game_items.SessionLocal.configure(bind=original_bind)
+
+    with engine.connect() as connection:
+        assert [row[0] for row in connection.execute(text("SELECT id FROM game_items ORDER BY id"))] == [1, 3]
+        # The removed copy's room history moved to the kept one
+        assert [row[0] for row in connection.execute(text("SELECT item_id FROM room_item_usage ORDER BY id"))] == [1, 1, 3]
+        indexes = {row[1]: row[2] for row in connection.execute(text("PRAGMA index_list(game_items)"))}
+    assert indexes['uq_game_type_content_hash'] == 1
+    assert 'idx_game_type_content_hash' not in indexes
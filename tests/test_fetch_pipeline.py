@@ -0,0 +1,146 @@
+"""
+Tests for the per-host token buckets and the concurrent fetch pipeline.
+"""
+import time
+
+from services.fetchers.fetch_pipeline import FetchSource, HostRateLimiter, TokenBucket, fetch_concurrently
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+
+
+def test_bucket_allows_a_burst_then_spaces_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock, sleep=clock.sleep)
+
+    assert [bucket.acquire() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    clock.now += 5
+    assert bucket.acquire() == 0.0
+
+
+def test_hosts_are_limited_independently():
+    clock = FakeClock()
+    limiter = HostRateLimiter(rate=1, rates={'api.groq.com': 4}, clock=clock, sleep=clock.sleep)
+
+    assert limiter.acquire('https://opentdb.com/api.php') == 0.0
+    assert limiter.acquire('https://raw.githubusercontent.com/a.json') == 0.0
+    assert limiter.acquire('https://opentdb.com/api.php?amount=5') == 1.0
+    assert limiter.acquire('https://api.groq.com/v1') == 0.0
+    assert limiter.acquire('https://api.groq.com/v1') == 0.25
+    assert HostRateLimiter(rate=None).acquire('https://opentdb.com') == 0.0
+
+
+def test_shared_limiters_draw_from_one_bucket_per_host():
+    clock = FakeClock()
+    first = HostRateLimiter(rate=1, clock=clock, sleep=clock.sleep, shared=True)
+    second = HostRateLimiter(rate=2, clock=clock, sleep=clock.sleep, shared=True)
+
+    assert first.acquire('https://shared-limit.example/a') == 0.0
+    # Another fetcher calling the same host waits its turn
+    assert second.acquire('https://shared-limit.example/b') == 1.0
+    assert HostRateLimiter(rate=1, clock=clock, sleep=clock.sleep).acquire('https://shared-limit.example/') == 0.0
+
+
+def test_batch_returns_once_enough_items_arrive():
+    def slow():
+        time.sleep(2)
+        return [{'n': 'slow'}]
+
+    started = time.monotonic()
+    items = fetch_concurrently([FetchSource('slow', slow), FetchSource('fast', lambda: [{'n': i} for i in range(3)])], want=3)
+
+    assert time.monotonic() - started < 1
+    assert items == [{'n': 0}, {'n': 1}, {'n': 2}]
+
+
+def test_late_and_failing_sources_are_dropped():
+    def late():
+        time.sleep(1)
+        return [{'n': 'late'}]
+
+    def broken():
+        raise ValueError('bad json')
+
+    started = time.monotonic()
+    items = fetch_concurrently([
+        FetchSource('late', late, deadline=0.1),
+        FetchSource('broken', broken),
+        FetchSource('ok', lambda: [{'n': 'ok'}]),
+    ], want=5)
+
+    assert time.monotonic() - started < 0.5
+    assert items == [{'n': 'ok'}]
+
+
+def make_trivia_fetcher(opentdb, groq):
+    from services.fetchers.translation import GroqTranslator
+    from services.fetchers.trivia_fetcher import TriviaFetcher
+
+    fetcher = TriviaFetcher(ai_api_key='test')
+    fetcher.opentdb_url = f'{opentdb.url}/api.php'
+    fetcher.translator.translator = GroqTranslator(api_key='test', base_url=groq.url)
+    fetcher.translator.translator._get_client()
+    return fetcher
+
+
+def test_trivia_batch_uses_network_sources_concurrently(data_manager):
+    from tests.trivia_stub import TriviaStubServer
+
+    with TriviaStubServer(latency=0.3) as islamic, TriviaStubServer(latency=0.3) as opentdb, \
+            TriviaStubServer() as groq:
+        fetcher = make_trivia_fetcher(opentdb, groq)
+        fetcher.islamic_quiz_url = islamic.url
+
+        started = time.monotonic()
+        items = fetcher.fetch_batch(30)
+        elapsed = time.monotonic() - started
+
+    assert len(items) == 30
+    assert 'إسلاميات' in {item['category'] for item in items}
+    assert opentdb.requests == ['/api.php']
+    assert groq.translation_batches == [30 - 7 * 4]  # what the seven categories leave short
+    assert elapsed < 0.55  # both 0.3 s sources at once, not one after the other
+
+
+def test_trivia_batch_tops_up_from_opentdb_when_a_source_fails(data_manager):
+    from tests.trivia_stub import TriviaStubServer
+
+    with TriviaStubServer() as opentdb, TriviaStubServer() as groq:
+        fetcher = make_trivia_fetcher(opentdb, groq)
+        fetcher.islamic_quiz_url = 'http://127.0.0.1:9'  # nothing listens on the discard port
+        fetcher.rate_limiter.rate = None
+
+        items = fetcher.fetch_batch(30)
+
+    assert len(items) == 30
+    assert opentdb.requests == ['/api.php', '/api.php']
+    # The stand-in's top-up repeats its first two questions, which are remembered
+    assert groq.translation_batches == [2, 2]
+
+
+def test_trivia_top_up_keeps_to_the_opentdb_deadline(data_manager):
+    from tests.trivia_stub import TriviaStubServer
+
+    with TriviaStubServer(latency=1.0) as opentdb, TriviaStubServer() as groq:
+        fetcher = make_trivia_fetcher(opentdb, groq)
+        fetcher.islamic_quiz_url = 'http://127.0.0.1:9'  # nothing listens on the discard port
+        fetcher.rate_limiter.rate = None
+        fetcher.SOURCE_DEADLINES = {'islamic_quiz': 1.5, 'opentdb': 1.5}
+
+        started = time.monotonic()
+        items = fetcher.fetch_batch(30)
+        elapsed = time.monotonic() - started
+        time.sleep(1.2)  # let the abandoned top-up finish against the stubs
+
+    # The top-up only had what the first OpenTDB call left of the 1.5 s
+    assert elapsed < 1.9
+    assert len(items) < 30
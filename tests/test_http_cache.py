@@ -0,0 +1,116 @@
+"""
+Tests for the on-disk HTTP cache under BaseFetcher._get.
+"""
+import pytest
+
+from services.fetchers.http_cache import HttpCache
+from services.fetchers.trivia_fetcher import TriviaFetcher
+from tests.trivia_stub import TriviaStubServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def stub():
+    with TriviaStubServer() as server:
+        yield server
+
+
+def make_fetcher(stub, cache):
+    fetcher = TriviaFetcher()
+    fetcher.http_cache = cache
+    fetcher.rate_limiter.rate = None
+    fetcher.islamic_quiz_url = stub.url
+    fetcher.opentdb_url = f'{stub.url}/api.php'
+    return fetcher
+
+
+def test_fresh_response_is_read_from_disk(stub, tmp_path):
+    cache = HttpCache(tmp_path)
+    first = make_fetcher(stub, cache)._fetch_islamic_quiz(5)
+
+    # A new fetcher (as after a restart) shares the store on disk
+    second = make_fetcher(stub, HttpCache(tmp_path))
+    assert len(second._fetch_islamic_quiz(5)) == len(first) == 5
+    assert stub.requests == ['/questions_ar.json']
+    assert second.http_cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_expired_response_is_revalidated_with_its_etag(stub, tmp_path):
+    clock = FakeClock()
+    fetcher = make_fetcher(stub, HttpCache(tmp_path, clock=clock))
+    fetcher._fetch_islamic_quiz(5)
+
+    clock.now += fetcher.cache_ttl + 1
+    assert len(fetcher._fetch_islamic_quiz(5)) == 5
+    assert stub.not_modified == 1
+    assert len(fetcher._fetch_islamic_quiz(5)) == 5  # the 304 restarted the TTL
+    assert len(stub.requests) == 2
+    assert fetcher.http_cache.stats() == {'hits': 1, 'revalidated': 1, 'misses': 1, 'stale_served': 0, 'uncached': 0,
+                                         'pruned': 0}
+
+
+def test_expired_response_is_served_when_the_source_is_down(tmp_path):
+    clock = FakeClock()
+    cache = HttpCache(tmp_path, clock=clock)
+    with TriviaStubServer() as server:
+        fetcher = make_fetcher(server, cache)
+        fetcher._fetch_islamic_quiz(5)
+
+    clock.now += fetcher.cache_ttl + 1
+    assert len(fetcher._fetch_islamic_quiz(5)) == 5
+    assert cache.stats()['stale_served'] == 1
+
+
+def test_bodies_are_stored_once_per_content(stub, tmp_path):
+    cache = HttpCache(tmp_path)
+    fetcher = make_fetcher(stub, cache)
+    fetcher._get(f'{stub.url}/a/questions_ar.json')
+    fetcher._get(f'{stub.url}/b/questions_ar.json')
+
+    assert len(list((tmp_path / 'entries').iterdir())) == 2
+    assert len([path for path in (tmp_path / 'blobs').rglob('*') if path.is_file()]) == 1
+
+
+def cached_response(body):
+    import requests
+
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    return response
+
+
+def test_replaced_bodies_are_pruned_once_unreferenced(tmp_path):
+    cache = HttpCache(tmp_path)
+    cache.store('https://a.example/page', cached_response(b'v1'))
+    cache.store('https://b.example/page', cached_response(b'v1'))
+
+    # b still points at v1, so it stays
+    cache.store('https://a.example/page', cached_response(b'v2'))
+    assert len([path for path in (tmp_path / 'blobs').rglob('*') if path.is_file()]) == 2
+    # Now nothing does
+    cache.store('https://b.example/page', cached_response(b'v2'))
+    cache.store('https://a.example/page', cached_response(b'v3'))
+
+    blobs = [path for path in (tmp_path / 'blobs').rglob('*') if path.is_file()]
+    assert sorted(path.read_bytes() for path in blobs) == [b'v2', b'v3']
+    assert cache.stats()['pruned'] == 1
+    assert cache.response(cache.lookup('https://b.example/page')).content == b'v2'
+
+
+def test_random_endpoints_bypass_the_cache(stub, tmp_path):
+    fetcher = make_fetcher(stub, HttpCache(tmp_path))
+    fetcher._get(fetcher.opentdb_url, params={'amount': 3}, cached=False)
+    fetcher._get(fetcher.opentdb_url, params={'amount': 3}, cached=False)
+
+    assert stub.requests == ['/api.php', '/api.php']
+    assert fetcher.http_cache.stats()['uncached'] == 2
+    assert not (tmp_path / 'entries').exists()
@@ -0,0 +1,84 @@
+"""
+Tests for the in-memory item pool with per-room cursors and write-behind usage.
+"""
+import random
+
+from services.item_pool import ItemPool
+
+
+def add_words(manager, words, category='عام'):
+    manager.add_items('pictionary', category, [{'word': word, 'category': category} for word in words], source='test')
+
+
+def usage_rows(room_id):
+    from models.game_items import RoomItemUsage, get_session
+
+    session = get_session()
+    try:
+        return session.query(RoomItemUsage).filter(RoomItemUsage.room_id == room_id).count()
+    finally:
+        session.close()
+
+
+def test_room_walks_the_pool_without_repeats(data_manager):
+    add_words(data_manager, [f'كلمة {i}' for i in range(10)])
+    pool = ItemPool(data_manager, rng=random.Random(1))
+
+    served = [item['word'] for _ in range(5) for item in pool.next_items('room1', 'pictionary', count=2)]
+
+    assert sorted(served) == sorted(f'كلمة {i}' for i in range(10))
+    assert pool.next_items('room1', 'pictionary') == []
+    assert len(pool.next_items('room2', 'pictionary', count=3)) == 3
+
+
+def test_usage_is_written_behind_in_one_flush(data_manager):
+    from models.game_items import GameItem, get_session
+
+    add_words(data_manager, ['أسد', 'نمر'])
+    pool = ItemPool(data_manager)
+    pool.next_items('room1', 'pictionary', count=2)
+    pool.next_items('room2', 'pictionary', count=1)
+    assert usage_rows('room1') == 0
+
+    assert pool.flush_usage() == 3
+    assert usage_rows('room1') == 2
+    session = get_session()
+    try:
+        assert sorted(item.use_count for item in session.query(GameItem)) == [1, 2]
+    finally:
+        session.close()
+    assert pool.flush_usage() == 0
+
+
+def test_least_recently_used_items_come_first(data_manager):
+    add_words(data_manager, ['أسد', 'نمر', 'فهد'])
+    pool = ItemPool(data_manager)
+    first = pool.next_items('room1', 'pictionary', count=2)
+
+    assert pool.next_items('room2', 'pictionary') == [
+        item for item in [{'word': word, 'category': 'عام'} for word in ['أسد', 'نمر', 'فهد']] if item not in first
+    ]
+
+
+def test_refresh_adds_new_items_to_open_cursors(data_manager):
+    add_words(data_manager, ['أسد'])
+    pool = ItemPool(data_manager)
+    assert len(pool.next_items('room1', 'pictionary', count=5)) == 1
+
+    add_words(data_manager, ['نمر', 'فهد'])
+    pool.refresh('pictionary')
+
+    assert sorted(item['word'] for item in pool.next_items('room1', 'pictionary', count=5)) == ['فهد', 'نمر']
+
+
+def test_restored_room_keeps_its_history(data_manager):
+    add_words(data_manager, ['أسد', 'نمر'])
+    before_restart = ItemPool(data_manager)
+    served = before_restart.next_items('room1', 'pictionary')
+    before_restart.flush_usage()
+
+    after_restart = ItemPool(data_manager)
+    remaining = after_restart.next_items('room1', 'pictionary', count=2)
+
+    assert len(remaining) == 1
+    assert remaining[0] != served[0]
@@ -0,0 +1,157 @@
+"""
+Tests for the background item-cache refill worker.
+"""
+import threading
+import time
+
+from services.prefetch_worker import PrefetchWorker
+
+
+class FakeCache:
+    def __init__(self, **sizes):
+        self.sizes = dict(sizes)
+        self.refills = []
+
+    def size(self, game_type, category=None):
+        return self.sizes.get(game_type, 0)
+
+    def refill(self, game_type, category=None, count=30):
+        self.refills.append((game_type, category, count))
+        self.sizes[game_type] = self.sizes.get(game_type, 0) + count
+
+
+def test_low_pool_is_queued_once_and_topped_up_to_the_high_watermark():
+    cache = FakeCache(charades=3, trivia=40)
+    spawned = []
+    worker = PrefetchWorker(cache.refill, cache.size, spawn=spawned.append, low=10, high=60)
+
+    assert worker.request('charades')
+    assert worker.request('charades')
+    assert not worker.request('trivia')
+    assert len(spawned) == 1
+    assert cache.refills == []  # nothing runs on the caller
+
+    spawned[0]()
+    assert cache.refills == [('charades', None, 57)]
+    assert worker.stats()['requests'] == 1
+    assert worker.stats()['items_added'] == 57
+    assert worker.stats()['queued'] == 0
+
+
+def test_minimum_raises_the_watermarks_for_one_request():
+    cache = FakeCache(pictionary=13)
+    spawned = []
+    worker = PrefetchWorker(cache.refill, cache.size, spawn=spawned.append, low=10, high=20)
+
+    assert worker.request('pictionary', minimum=30)
+    spawned[0]()
+    assert cache.refills == [('pictionary', None, 17)]
+
+
+def test_failed_refill_is_counted_and_can_be_requested_again():
+    cache = FakeCache()
+    spawned = []
+
+    def refill(game_type, category=None, count=30):
+        raise RuntimeError('offline')
+
+    worker = PrefetchWorker(refill, cache.size, spawn=spawned.append)
+    worker.request('riddles')
+    spawned.pop()()
+
+    assert worker.stats()['failures'] == 1
+    assert worker.request('riddles')
+    assert len(spawned) == 1
+
+
+def test_waiting_room_gets_the_refill_and_is_counted():
+    cache = FakeCache()
+    release = threading.Event()
+
+    def slow_refill(game_type, category=None, count=30):
+        release.wait(5)
+        cache.refill(game_type, category, count)
+
+    worker = PrefetchWorker(slow_refill, cache.size, low=10, high=20)
+    threading.Timer(0.05, release.set).start()
+
+    assert worker.wait('trivia')
+    assert cache.sizes['trivia'] == 20
+    assert not worker.wait('trivia')  # above the low watermark: no wait
+    stats = worker.stats()
+    assert (stats['waits'], stats['wait_timeouts']) == (1, 0)
+    assert stats['wait_seconds'] > 0
+
+
+def test_wait_gives_up_after_the_timeout():
+    cache = FakeCache()
+    release = threading.Event()
+    worker = PrefetchWorker(lambda *args, **kwargs: release.wait(5), cache.size)
+
+    assert not worker.wait('trivia', timeout=0.05)
+    assert worker.stats()['wait_timeouts'] == 1
+    release.set()
+    assert worker.wait_idle(timeout=5)
+
+
+def test_room_creation_does_not_block_on_a_cold_cache(data_manager):
+    from services.data_service import DataService
+
+    service = DataService()
+    release = threading.Event()
+
+    def refill(game_type, category=None, count=30):
+        release.wait(5)
+        service.data_manager.add_items(game_type, 'عام', [
+            {'word': f'كلمة {i}', 'category': 'عام'} for i in range(count)
+        ], source='test')
+        service.item_pool.refresh(game_type)
+
+    service._refetch_items = refill
+    service.configure_prefetch(low=10, high=20)
+
+    started = time.monotonic()
+    service.prefetch_for_room('room1', 'pictionary', count=15)
+    assert time.monotonic() - started < 1
+
+    release.set()
+    assert service.get_item_for_room('room1', 'pictionary')['word'].startswith('كلمة')
+    assert service.prefetcher.stats()['items_added'] == 20
+    service.prefetcher.wait_idle(timeout=5)
+
+
+def test_pictionary_prefetches_only_its_own_pool(monkeypatch):
+    import games.charades.models as charades_models
+    from games.pictionary.models import PictionaryGame
+
+    class RecordingService:
+        def __init__(self):
+            self.prefetched = []
+
+        def prefetch_for_room(self, room_id, game_type, category=None, count=30):
+            self.prefetched.append(game_type)
+
+    service = RecordingService()
+    monkeypatch.setattr(charades_models, 'get_data_service', lambda: service)
+    PictionaryGame('room1', 'host')
+
+    assert service.prefetched == ['pictionary']
+
+
+def test_failed_fetch_is_counted_as_a_refill_failure(data_manager):
+    from services.data_service import DataService
+
+    class BrokenFetcher:
+        def fetch_batch(self, count):
+            raise ConnectionError('source is down')
+
+        def get_source_name(self):
+            return 'broken'
+
+    service = DataService()
+    service.pictionary_fetcher = BrokenFetcher()
+    service.configure_prefetch(spawn=lambda run: run(), low=10, high=20)
+
+    assert service.get_items_for_room('room1', 'pictionary', wait=False) == []
+    assert service.prefetcher.stats()['failures'] == 1
+    assert service.prefetcher.stats()['refills'] == 0
@@ -0,0 +1,314 @@
+"""
+Tests for RealtimeSyncService state broadcasting (full snapshots and patches).
+"""
+import copy
+import json
+
+from services.realtime_sync import EncodedPayload, PreEncodedJSON, RealtimeSyncService, diff_state
+
+
+class FakeGame:
+    """Minimal game object exposing the surface RealtimeSyncService relies on."""
+
+    def __init__(self):
+        self.game_type = 'trivia'
+        self.state_version = 0
+        self.players = [{'name': 'host', 'isHost': True, 'team': 1}]
+        self.scores = {}
+        self.status = 'waiting'
+        self.to_dict_calls = 0
+
+    def bump_state_version(self):
+        self.state_version += 1
+        return self.state_version
+
+    def to_dict(self, include_answer=False):
+        self.to_dict_calls += 1
+        return {
+            'game_type': self.game_type,
+            'players': self.players,
+            'scores': self.scores,
+            'status': self.status,
+            'state_version': self.state_version,
+        }
+
+
+def apply_ops(state, ops):
+    """Reference implementation of the client-side patch apply step."""
+    doc = copy.deepcopy(state)
+    for op in ops:
+        if op['path'] == '':
+            doc = op['value']
+            continue
+        tokens = [t.replace('~1', '/').replace('~0', '~') for t in op['path'].split('/')[1:]]
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent.setdefault(token, {})
+        if op['op'] == 'remove':
+            del parent[tokens[-1]]
+        else:
+            parent[tokens[-1]] = op['value']
+    return doc
+
+
+def make_service():
+    game = FakeGame()
+    service = RealtimeSyncService({'r1': game})
+    return service, game
+
+
+def test_first_update_is_full_snapshot():
+    service, game = make_service()
+    service.bump_game_version(game)
+
+    event, payload = service.build_state_update('r1')
+
+    assert event == 'game_state'
+    assert isinstance(payload, EncodedPayload)
+    assert json.loads(payload)['state_version'] == 1
+
+
+def test_second_update_is_patch_from_previous_version():
+    service, game = make_service()
+    service.bump_game_version(game)
+    _, encoded_full = service.build_state_update('r1')
+    full = json.loads(encoded_full)
+
+    game.scores['host'] = 10
+    game.status = 'round_active'
+    service.bump_game_version(game)
+    event, patch = service.build_state_update('r1')
+
+    assert event == 'game_state_patch'
+    assert patch['base_version'] == 1
+    assert patch['state_version'] == 2
+    paths = {op['path'] for op in patch['ops']}
+    assert paths == {'/scores/host', '/status', '/state_version'}
+    assert apply_ops(full, patch['ops']) == service.build_public_state('r1')
+
+
+def test_snapshot_is_detached_from_live_state():
+    service, game = make_service()
+    service.bump_game_version(game)
+    service.build_state_update('r1')
+
+    # Mutating the live dict must not silently update the stored snapshot
+    game.scores['host'] = 5
+    service.bump_game_version(game)
+    _, patch = service.build_state_update('r1')
+
+    assert {'op': 'add', 'path': '/scores/host', 'value': 5} in patch['ops']
+
+
+def test_same_version_sends_nothing():
+    service, game = make_service()
+    service.bump_game_version(game)
+    service.build_state_update('r1')
+
+    assert service.build_state_update('r1') is None
+
+
+def test_restored_older_version_restarts_with_full_snapshot():
+    service, game = make_service()
+    game.state_version = 5
+    service.build_state_update('r1')
+    game.state_version = 2
+    service.bump_game_version(game)
+
+    event, _ = service.build_state_update('r1')
+
+    assert event == 'game_state'
+
+
+def test_patch_mode_disabled_always_sends_full_state():
+    game = FakeGame()
+    service = RealtimeSyncService({'r1': game}, patch_mode=False)
+    service.bump_game_version(game)
+    service.build_state_update('r1')
+    service.bump_game_version(game)
+
+    event, _ = service.build_state_update('r1')
+
+    assert event == 'game_state'
+
+
+def test_forget_room_restarts_with_full_snapshot():
+    service, game = make_service()
+    service.bump_game_version(game)
+    service.build_state_update('r1')
+    service.forget_room('r1')
+    service.bump_game_version(game)
+
+    event, _ = service.build_state_update('r1')
+
+    assert event == 'game_state'
+
+
+def test_diff_state_escapes_pointer_tokens_and_removes_keys():
+    previous = {'scores': {'a/b': 1, 'gone': 2}}
+    current = {'scores': {'a/b': 3}}
+
+    ops = diff_state(previous, current)
+
+    assert {'op': 'remove', 'path': '/scores/gone'} in ops
+    assert {'op': 'replace', 'path': '/scores/a~1b', 'value': 3} in ops
+    assert apply_ops(previous, ops) == current
+
+
+def test_diff_state_replaces_lists_wholesale():
+    ops = diff_state({'players': [1, 2]}, {'players': [1, 2, 3]})
+
+    assert ops == [{'op': 'replace', 'path': '/players', 'value': [1, 2, 3]}]
+
+
+def test_public_state_is_encoded_once_per_version():
+    service, game = make_service()
+    service.bump_game_version(game)
+
+    first = service.get_encoded_public_state('r1')
+    service.build_state_update('r1')
+    second = service.get_encoded_public_state('r1')
+
+    assert first is second
+    assert game.to_dict_calls == 1
+
+
+def test_bump_invalidates_encoded_state():
+    service, game = make_service()
+    game.game_id = 'r1'
+    service.get_encoded_public_state('r1')
+
+    game.status = 'round_active'
+    service.bump_game_version(game)
+
+    assert json.loads(service.get_encoded_public_state('r1'))['status'] == 'round_active'
+    assert game.to_dict_calls == 2
+
+
+def test_room_preview_cached_alongside_state():
+    service, game = make_service()
+    calls = []
+
+    def build_preview(game_id):
+        calls.append(game_id)
+        return {'game_id': game_id, 'players_count': len(game.players)}
+
+    service.get_encoded_room_preview('r1', build_preview)
+    service.get_encoded_room_preview('r1', build_preview)
+    service.bump_game_version(game)
+    service.get_encoded_room_preview('r1', build_preview)
+
+    assert calls == ['r1', 'r1']
+
+
+def test_pre_encoded_json_splices_payload_verbatim():
+    payload = EncodedPayload('{"a":1}')
+
+    encoded = PreEncodedJSON.dumps(['game_state', payload], separators=(',', ':'))
+
+    assert encoded == '["game_state",{"a":1}]'
+    assert PreEncodedJSON.loads(encoded) == ['game_state', {'a': 1}]
+    assert PreEncodedJSON.dumps(['x', {'b': 2}], separators=(',', ':')) == '["x",{"b":2}]'
+
+
+def test_dirty_room_schedules_a_single_flush():
+    service, game = make_service()
+
+    assert service.mark_dirty('r1') is True
+    assert service.mark_dirty('r1') is False
+    assert service.take_dirty('r1') is True
+    assert service.take_dirty('r1') is False
+    assert service.mark_dirty('r1') is True
+
+
+def test_coalesced_flush_sends_latest_version_once():
+    service, game = make_service()
+    service.bump_game_version(game)
+    service.build_state_update('r1')
+
+    for _ in range(3):
+        service.bump_game_version(game)
+        service.mark_dirty('r1')
+    game.status = 'round_active'
+
+    assert service.take_dirty('r1')
+    event, payload = service.build_state_update('r1')
+    assert event == 'game_state_patch'
+    assert payload['base_version'] == 1
+    assert payload['state_version'] == 4
+
+
+def test_forget_room_clears_pending_flush():
+    service, game = make_service()
+    service.mark_dirty('r1')
+
+    service.forget_room('r1')
+
+    assert service.take_dirty('r1') is False
+
+
+class TestStatePatchSocketFlow:
+    """Patch stream as seen by a connected Socket.IO client."""
+
+    def _joined_client(self, socket_client, game_rooms):
+        from games.rapid_fire.models import RapidFireGame
+
+        game = RapidFireGame('rfp1', 'host')
+        game.add_player('player2')
+        game_rooms['rfp1'] = game
+        socket_client.emit('verify_game', {'game_id': 'rfp1', 'player_name': 'host'})
+        return game
+
+    def test_verify_sends_full_state_then_room_receives_patches(self, app, socket_client, game_rooms):
+        from app import bump_and_emit_game_state
+
+        game = self._joined_client(socket_client, game_rooms)
+        received = socket_client.get_received()
+        assert [r['name'] for r in received].count('game_state') == 1
+
+        bump_and_emit_game_state('rfp1')  # first broadcast seeds the room snapshot
+        game.add_score('host', 10)
+        bump_and_emit_game_state('rfp1')
+
+        received = socket_client.get_received()
+        patches = [r['args'][0] for r in received if r['name'] == 'game_state_patch']
+        assert len(patches) == 1
+        assert {'op': 'add', 'path': '/scores/host', 'value': 10} in patches[0]['ops']
+
+    def test_emit_without_a_state_change_sends_nothing(self, app, socket_client, game_rooms):
+        from app import bump_and_emit_game_state, emit_game_state
+
+        self._joined_client(socket_client, game_rooms)
+        bump_and_emit_game_state('rfp1')
+        socket_client.get_received()
+
+        emit_game_state('rfp1')
+
+        received = [r['name'] for r in socket_client.get_received()]
+        assert 'game_state' not in received
+        assert 'game_state_patch' not in received
+
+    def test_reconnect_mid_round_resends_question_without_answer(self, app, socket_client, game_rooms):
+        from games.rapid_fire.models import RapidFireGame
+
+        game = RapidFireGame('rfq1', 'host')
+        game.add_player('player2')
+        game.current_question = {'question': 'سؤال', 'options': ['أ', 'ب'], 'answer': 1}
+        game.status = 'round_active'
+        game_rooms['rfq1'] = game
+
+        socket_client.emit('verify_game', {'game_id': 'rfq1', 'player_name': 'host'})
+
+        questions = [r['args'][0] for r in socket_client.get_received() if r['name'] == 'new_question']
+        assert questions == [{'question': 'سؤال', 'options': ['أ', 'ب']}]
+
+    def test_request_game_state_returns_full_snapshot(self, app, socket_client, game_rooms):
+        self._joined_client(socket_client, game_rooms)
+        socket_client.get_received()
+
+        socket_client.emit('request_game_state', {'game_id': 'rfp1', 'player_name': 'host'})
+
+        received = socket_client.get_received()
+        states = [r for r in received if r['name'] == 'game_state']
+        assert len(states) == 1
+        assert states[0]['args'][0]['game_id'] == 'rfp1'
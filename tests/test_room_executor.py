@@ -0,0 +1,124 @@
+"""
+Tests for RoomExecutor: per-room ordering, reentrancy and metrics.
+"""
+import threading
+import time
+
+from services.room_executor import RoomExecutor
+
+
+def test_tasks_for_one_room_never_interleave():
+    executor = RoomExecutor()
+    log = []
+    started = threading.Event()
+
+    def slow_task():
+        log.append('slow start')
+        started.set()
+        time.sleep(0.05)
+        log.append('slow end')
+
+    worker = threading.Thread(target=executor.run, args=('r1', slow_task))
+    worker.start()
+    started.wait()
+    executor.run('r1', log.append, 'second')
+    worker.join()
+
+    assert log == ['slow start', 'slow end', 'second']
+
+
+def test_other_rooms_are_not_blocked():
+    executor = RoomExecutor()
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking_task():
+        started.set()
+        release.wait(1)
+
+    worker = threading.Thread(target=executor.run, args=('r1', blocking_task))
+    worker.start()
+    started.wait()
+
+    assert executor.run('r2', lambda: 'done') == 'done'
+    assert executor.stats('r1')['depth'] == 1
+    release.set()
+    worker.join()
+
+
+def test_nested_task_for_same_room_runs_immediately():
+    executor = RoomExecutor()
+
+    result = executor.run('r1', lambda: executor.run('r1', lambda: 42))
+
+    assert result == 42
+    assert executor.stats('r1')['tasks'] == 1
+
+
+def test_stats_track_depth_and_wait():
+    executor = RoomExecutor()
+    started = threading.Event()
+
+    def slow_task():
+        started.set()
+        time.sleep(0.05)
+
+    worker = threading.Thread(target=executor.run, args=('r1', slow_task))
+    worker.start()
+    started.wait()
+    executor.run('r1', lambda: None)
+    worker.join()
+
+    stats = executor.stats('r1')
+    assert stats['tasks'] == 2
+    assert stats['max_depth'] == 2
+    assert stats['depth'] == 0
+    assert stats['max_wait_ms'] > 0
+    assert set(executor.stats()) == {'r1'}
+
+
+def test_exception_releases_the_room():
+    executor = RoomExecutor()
+
+    def boom():
+        raise RuntimeError('boom')
+
+    try:
+        executor.run('r1', boom)
+    except RuntimeError:
+        pass
+
+    assert executor.run('r1', lambda: 'next') == 'next'
+
+
+def test_forget_room_drops_metrics():
+    executor = RoomExecutor()
+    executor.run('r1', lambda: None)
+
+    executor.forget_room('r1')
+
+    assert executor.stats() == {}
+
+
+def test_untracked_rooms_leave_no_metrics():
+    rooms = {'r1'}
+    executor = RoomExecutor(is_tracked=lambda game_id: game_id in rooms)
+
+    executor.run('r1', lambda: None)
+    executor.run('made-up', lambda: None)
+
+    assert set(executor.stats()) == {'r1'}
+
+
+def test_room_metrics_report_executor_stats_for_live_rooms_only(app, client, socket_client, game_rooms):
+    from app import room_executor
+    from games.rapid_fire.models import RapidFireGame
+
+    game_rooms['live1'] = RapidFireGame('live1', 'host')
+    socket_client.emit('preview_room', {'game_id': 'live1'})
+    socket_client.emit('preview_room', {'game_id': 'no-such-room'})
+
+    executor_stats = client.get('/metrics/rooms').get_json()['executor']
+    assert executor_stats['live1']['tasks'] == 1
+    assert 'no-such-room' not in executor_stats
+    room_executor.forget_room('live1')
@@ -0,0 +1,116 @@
+"""
+Tests for RoomReaper: TTL expiry, LRU budget eviction and counters.
+"""
+from datetime import datetime, timedelta
+
+from games.base import BaseGame
+from services.room_reaper import RoomReaper
+
+NOW = datetime(2024, 5, 1, 12, 0)
+
+
+def make_rooms(**idle_minutes):
+    rooms = {}
+    for game_id, minutes in idle_minutes.items():
+        game = BaseGame(game_id, 'host', 'counter')
+        game.updated_at = NOW - timedelta(minutes=minutes)
+        rooms[game_id] = game
+    return rooms
+
+
+def make_reaper(rooms, **kwargs):
+    return RoomReaper(rooms, rooms.pop, clock=lambda: NOW, **kwargs)
+
+
+def test_rooms_past_ttl_are_evicted():
+    rooms = make_rooms(old=90, fresh=5)
+    reaper = make_reaper(rooms, ttl_seconds=3600)
+
+    assert reaper.sweep() == ['old']
+    assert set(rooms) == {'fresh'}
+    assert reaper.stats()['evicted_idle'] == 1
+
+
+def test_rooms_owned_by_another_worker_are_left_alone():
+    rooms = make_rooms(mine=90, theirs=90)
+    reaper = make_reaper(rooms, ttl_seconds=3600, owns=lambda game_id: game_id == 'mine')
+
+    assert reaper.sweep() == ['mine']
+    assert set(rooms) == {'theirs'}
+
+
+def test_room_budget_evicts_least_recently_used_idle_rooms():
+    rooms = make_rooms(a=30, b=50, c=10, active=0)
+    reaper = make_reaper(rooms, max_rooms=2, min_idle_seconds=60)
+
+    assert reaper.sweep() == ['b', 'a']
+    assert set(rooms) == {'c', 'active'}
+    assert reaper.stats()['evicted_budget'] == 2
+
+
+def test_budget_never_evicts_recently_active_rooms():
+    rooms = make_rooms(a=0, b=0, c=0)
+    reaper = make_reaper(rooms, max_rooms=1, min_idle_seconds=60)
+
+    assert reaper.sweep() == []
+    assert len(rooms) == 3
+
+
+def test_memory_budget_uses_estimated_room_size():
+    rooms = make_rooms(big=20, small=10)
+    rooms['big'].scores = {f'player{i}': i for i in range(500)}
+    small_size = RoomReaper.estimate_size(rooms['small'])
+    reaper = make_reaper(rooms, max_bytes=small_size + 10, min_idle_seconds=60)
+
+    assert reaper.sweep() == ['big']
+    assert reaper.stats()['evicted_bytes'] > small_size
+
+
+def test_failed_eviction_is_not_counted():
+    rooms = make_rooms(old=90)
+
+    def evict(game_id):
+        raise RuntimeError('busy')
+
+    reaper = RoomReaper(rooms, evict, ttl_seconds=60, clock=lambda: NOW)
+
+    assert reaper.sweep() == []
+    assert reaper.stats()['evicted_idle'] == 0
+    assert reaper.stats()['rooms'] == 1
+
+
+def test_room_active_again_before_its_eviction_runs_is_kept():
+    rooms = make_rooms(old=90, other=90)
+
+    def evict(game_id):
+        # An event queued ahead of the eviction touches the room first
+        if game_id == 'old':
+            rooms['old'].bump_state_version()
+        if not reaper.still_idle(game_id):
+            return False
+        rooms.pop(game_id)
+
+    reaper = RoomReaper(rooms, evict, ttl_seconds=3600, clock=lambda: NOW)
+
+    assert reaper.sweep() == ['other']
+    assert 'old' in rooms
+    assert reaper.stats()['evicted_idle'] == 1
+    assert reaper.stats()['skipped_active'] == 1
+
+
+def test_app_keeps_a_room_that_saw_activity_while_its_eviction_was_queued(app, game_rooms, monkeypatch):
+    import app as app_module
+
+    game = BaseGame('busy', 'host', 'counter')
+    game.updated_at = datetime.now() - timedelta(seconds=app_module.ROOM_TTL + 60)
+    game_rooms['busy'] = game
+    run = app_module.room_executor.run
+
+    def run_after_activity(game_id, task, *args):
+        game_rooms[game_id].bump_state_version()  # handled ahead of the eviction
+        return run(game_id, task, *args)
+
+    monkeypatch.setattr(app_module.room_executor, 'run', run_after_activity)
+
+    assert app_module.room_reaper.sweep() == []
+    assert 'busy' in game_rooms
@@ -0,0 +1,156 @@
+"""
+Tests for RoomScheduler: per-room named timers fired by a single loop.
+"""
+from services.room_scheduler import RoomScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler():
+    clock = FakeClock()
+    spawned = []
+    scheduler = RoomScheduler(sleep=lambda seconds: None, spawn=spawned.append, clock=clock)
+    return scheduler, clock, spawned
+
+
+def test_timer_fires_once_after_its_delay():
+    scheduler, clock, _ = make_scheduler()
+    fired = []
+    scheduler.schedule('r1', 'round', 30, fired.append, 'r1')
+
+    clock.now += 29
+    assert scheduler.run_due() == 0
+    clock.now += 1
+    assert scheduler.run_due() == 1
+    assert scheduler.run_due() == 0
+
+    assert fired == ['r1']
+    assert not scheduler.is_pending('r1', 'round')
+
+
+def test_rescheduling_a_name_replaces_the_pending_timer():
+    scheduler, clock, _ = make_scheduler()
+    fired = []
+    scheduler.schedule('r1', 'round', 5, fired.append, 'first')
+    scheduler.schedule('r1', 'round', 10, fired.append, 'second')
+
+    clock.now += 5
+    scheduler.run_due()
+    assert fired == []
+    clock.now += 5
+    scheduler.run_due()
+    assert fired == ['second']
+
+
+def test_cancel_single_timer_and_whole_room():
+    scheduler, clock, _ = make_scheduler()
+    fired = []
+    scheduler.schedule('r1', 'round', 1, fired.append, 'round')
+    scheduler.schedule('r1', 'buzz', 1, fired.append, 'buzz')
+    scheduler.schedule('r2', 'round', 1, fired.append, 'other room')
+
+    scheduler.cancel('r1', 'buzz')
+    assert scheduler.is_pending('r1', 'round')
+    scheduler.cancel('r1')
+    assert not scheduler.is_pending('r1', 'round')
+
+    clock.now += 1
+    scheduler.run_due()
+    assert fired == ['other room']
+
+
+def test_remaining_reports_time_left():
+    scheduler, clock, _ = make_scheduler()
+    scheduler.schedule('r1', 'round', 30, lambda: None)
+
+    clock.now += 12
+    assert scheduler.remaining('r1', 'round') == 18
+    assert scheduler.remaining('r1', 'buzz') is None
+
+
+def test_loop_is_spawned_once_and_callbacks_go_through_dispatch():
+    clock = FakeClock()
+    spawned = []
+    dispatched = []
+    scheduler = RoomScheduler(
+        sleep=lambda seconds: None,
+        spawn=spawned.append,
+        dispatch=lambda game_id, callback, *args: dispatched.append((game_id, args)),
+        clock=clock,
+    )
+    scheduler.schedule('r1', 'round', 1, print, 'a')
+    scheduler.schedule('r2', 'round', 1, print, 'b')
+
+    clock.now += 1
+    scheduler.run_due()
+
+    assert len(spawned) == 1
+    assert sorted(dispatched) == [('r1', ('a',)), ('r2', ('b',))]
+
+
+def test_failing_callback_does_not_stop_other_timers():
+    scheduler, clock, _ = make_scheduler()
+    fired = []
+
+    def boom():
+        raise RuntimeError('boom')
+
+    scheduler.schedule('r1', 'round', 1, boom)
+    scheduler.schedule('r2', 'round', 1, fired.append, 'r2')
+
+    clock.now += 1
+    assert scheduler.run_due() == 2
+    assert fired == ['r2']
+
+
+def test_cancel_queued_ahead_of_a_dispatched_timer_stops_it():
+    clock = FakeClock()
+    queued = []
+    # Like the room executor: due timers wait behind the room's pending events
+    scheduler = RoomScheduler(
+        sleep=lambda seconds: None,
+        spawn=lambda run: None,
+        dispatch=lambda game_id, callback, *args: queued.append(lambda: callback(*args)),
+        clock=clock,
+    )
+    fired = []
+    scheduler.schedule('r1', 'round', 1, fired.append, 'stale expiry')
+    scheduler.schedule('r1', 'buzz', 1, fired.append, 'buzz')
+
+    clock.now += 1
+    assert scheduler.run_due() == 2
+    assert scheduler.is_pending('r1', 'round')
+    # e.g. a correct guess handled before the expiry reaches the room
+    queued.insert(0, lambda: scheduler.cancel('r1', 'round'))
+    for task in queued:
+        task()
+
+    assert fired == ['buzz']
+    assert not scheduler.is_pending('r1', 'round')
+
+
+def test_timer_rescheduled_before_a_dispatched_one_runs_replaces_it():
+    clock = FakeClock()
+    queued = []
+    scheduler = RoomScheduler(
+        sleep=lambda seconds: None,
+        spawn=lambda run: None,
+        dispatch=lambda game_id, callback, *args: queued.append(lambda: callback(*args)),
+        clock=clock,
+    )
+    fired = []
+    scheduler.schedule('r1', 'round', 1, fired.append, 'old round')
+    clock.now += 1
+    scheduler.run_due()
+    scheduler.schedule('r1', 'round', 30, fired.append, 'new round')
+    for task in queued:
+        task()
+
+    assert fired == []
+    assert scheduler.remaining('r1', 'round') == 30
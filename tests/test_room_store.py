@@ -0,0 +1,277 @@
+"""
+Tests for room snapshots and the RoomStore backends.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from games.base import BaseGame
+from games.bus_complete.models import BusCompleteGame
+from games.pictionary.models import PictionaryGame
+from games.rapid_fire.models import RapidFireGame
+from games.riddles.models import RiddlesGame
+from games.trivia.models import TriviaGame
+from games.twenty_questions.models import TwentyQuestionsGame
+from services.room_store import InMemoryRoomStore, SqliteRoomStore, create_room_store
+
+
+class CounterGame(BaseGame):
+    SNAPSHOT_FIELDS = ('seen', 'started_at')
+
+    def __init__(self, game_id, host, settings=None):
+        super().__init__(game_id, host, 'counter', settings)
+        self.seen = set()
+        self.started_at = None
+
+
+def test_snapshot_round_trips_sets_and_datetimes():
+    game = CounterGame('r1', 'host', {'teams': True})
+    game.add_player('guest')
+    game.add_score('guest', 5)
+    game.seen = {'a', 'b'}
+    game.started_at = datetime(2024, 5, 1, 12, 30)
+    game.status = 'playing'
+    game.bump_state_version()
+
+    restored = CounterGame.from_snapshot(game.to_snapshot())
+
+    assert restored.seen == {'a', 'b'}
+    assert restored.started_at == datetime(2024, 5, 1, 12, 30)
+    assert restored.players == game.players
+    assert restored.scores == {'guest': 5}
+    assert restored.team_scores == game.team_scores
+    assert restored.settings == {'teams': True}
+    assert restored.status == 'playing'
+    assert restored.state_version == 1
+
+
+def test_twenty_questions_round_state_survives_snapshot():
+    game = TwentyQuestionsGame('r1', 'host')
+    game.add_player('guest')
+    game.start_game()
+    game.set_secret('host', 'قطة', 'حيوان')
+    game.ask_question('guest', 'هل هو حيوان؟')
+
+    restored = TwentyQuestionsGame.from_snapshot(game.to_snapshot())
+
+    assert restored.to_dict(for_player='host') == game.to_dict(for_player='host')
+    assert restored.thinker_index == game.thinker_index
+
+
+def test_pictionary_canvas_survives_snapshot():
+    game = PictionaryGame('r1', 'host')
+    game.add_player('guest')
+    game.current_item = {'item': 'قطة', 'category': 'حيوانات'}
+    game.add_stroke({'x': 1, 'y': 2, 'color': '#000'})
+    game.add_stroke({'x': 3, 'y': 4, 'color': '#f00'})
+
+    restored = PictionaryGame.from_snapshot(game.to_snapshot())
+
+    assert restored.game_type == 'pictionary'
+    assert restored.canvas_data == game.canvas_data
+    assert restored.current_item == game.current_item
+
+
+def test_bus_complete_votes_and_validation_table_survive_snapshot(make_bus_game):
+    game = make_bus_game(letter='ب')
+    game.patch_answer('host', 'حيوان', 'بقرة')
+    game.patch_answer('player2', 'حيوان', 'بطة')
+    game.stop_bus('host')
+    game.submit_validation_vote('player2', 'حيوان|بقره', False)
+    game.apply_ai_verdicts({('حيوان', 'بطه'): True})
+
+    restored = BusCompleteGame.from_snapshot(game.to_snapshot())
+
+    assert restored.status == 'validating'
+    assert restored.player_votes == game.player_votes
+    assert restored._validation_table is None  # rebuilt on first use from the restored votes
+    assert restored.get_all_validation_statuses() == game.get_all_validation_statuses()
+
+
+def test_trivia_question_survives_snapshot():
+    game = TriviaGame('r1', 'host')
+    game.add_player('guest')
+    game.status = 'playing'
+    game.current_question = {'question': 'سؤال', 'options': ['أ', 'ب'], 'answer': 0}
+    game.question_active = True
+    game.round_start_time = datetime(2024, 5, 1, 12, 30)
+    game.players_answered = {'guest'}
+    game.players_answered_wrong = {'guest'}
+
+    restored = TriviaGame.from_snapshot(game.to_snapshot())
+
+    assert restored.to_dict(include_answer=True) == game.to_dict(include_answer=True)
+    assert restored.players_answered_wrong == {'guest'}
+    assert restored.round_start_time == game.round_start_time
+
+
+def test_rapid_fire_buzz_survives_snapshot():
+    game = RapidFireGame('r1', 'host')
+    game.add_player('guest')
+    game.current_question = {'question': 'سؤال', 'options': ['أ', 'ب'], 'answer': 1}
+    game.status = 'round_active'
+    game.question_active = True
+    game.buzz('guest')
+    game.players_buzzed_wrong = {'host'}
+
+    restored = RapidFireGame.from_snapshot(game.to_snapshot())
+
+    assert restored.to_dict(include_answer=True) == game.to_dict(include_answer=True)
+    assert restored.buzz_time == game.buzz_time
+
+
+def test_riddles_pool_survives_snapshot(sample_riddles):
+    game = RiddlesGame('r1', 'host')
+    game.add_player('guest')
+    game.riddle_pool = sample_riddles
+    game.start_game()
+    game.reveal_hint()
+    game.submit_answer('guest', 'خطأ')
+
+    restored = RiddlesGame.from_snapshot(game.to_snapshot())
+
+    assert restored.to_dict() == game.to_dict()
+    assert restored.riddle_pool == game.riddle_pool
+    assert restored.used_riddles == game.used_riddles
+
+
+def test_restoring_skips_per_room_warm_up(monkeypatch):
+    from services.data_service import get_data_service
+
+    prefetched = []
+    monkeypatch.setattr(get_data_service(), 'prefetch_for_room', lambda *args, **kwargs: prefetched.append(args))
+    snapshots = [game.to_snapshot() for game in (TriviaGame('r1', 'host'), RapidFireGame('r2', 'host'))]
+    prefetched.clear()
+
+    for snapshot, factory in zip(snapshots, (TriviaGame, RapidFireGame)):
+        factory.from_snapshot(snapshot)
+
+    assert prefetched == []
+
+
+def test_in_memory_store_behaves_like_a_dict():
+    store = create_room_store('memory')
+    game = CounterGame('r1', 'host')
+
+    store['r1'] = game
+    store.touch(game)
+
+    assert isinstance(store, InMemoryRoomStore)
+    assert store.get('r1') is game
+    assert 'r1' in store and len(store) == 1
+    assert store.flush() == 0
+    assert store.pop('r1') is game
+    assert store.get('r1') is None
+
+
+def make_sqlite_store(**kwargs):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from models.game_items import Base
+    from models.room_snapshots import RoomSnapshot
+
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine, tables=[RoomSnapshot.__table__])
+    return SqliteRoomStore(session_factory=sessionmaker(bind=engine), **kwargs), RoomSnapshot
+
+
+def test_sqlite_store_writes_transitions_and_flushes_the_rest():
+    store, RoomSnapshot = make_sqlite_store()
+    game = CounterGame('r1', 'host')
+    store['r1'] = game
+
+    game.status = 'playing'
+    game.bump_state_version()
+    store.touch(game)  # status transition: written immediately
+    game.add_score('host', 3)
+    game.bump_state_version()
+    store.touch(game)  # same status: waits for flush
+
+    session = store._session_factory()
+    assert session.get(RoomSnapshot, 'r1').state_version == 1
+    session.close()
+
+    assert store.flush() == 1
+    session = store._session_factory()
+    assert session.get(RoomSnapshot, 'r1').snapshot['scores'] == {'host': 3}
+    session.close()
+
+
+def test_sqlite_store_deletes_snapshot_with_room():
+    store, RoomSnapshot = make_sqlite_store()
+    store['r1'] = CounterGame('r1', 'host')
+
+    store.pop('r1')
+
+    session = store._session_factory()
+    assert session.query(RoomSnapshot).count() == 0
+    session.close()
+
+
+def test_sqlite_store_restores_rooms_and_rearms_their_timers():
+    saved_at = datetime(2024, 5, 1, 12, 0)
+    store, _ = make_sqlite_store(timers=lambda game_id: {'round': 20.0}, clock=lambda: saved_at)
+    game = RapidFireGame('r1', 'host')
+    game.add_player('guest')
+    game.current_question = {'question': 'سؤال', 'options': ['أ', 'ب'], 'answer': 1}
+    game.status = 'round_active'
+    store['r1'] = game
+
+    # A new process five seconds later, on the same database
+    later = SqliteRoomStore(session_factory=store._session_factory, clock=lambda: saved_at + timedelta(seconds=5))
+    rearmed = []
+    assert later.restore(rearm=lambda room, timers: rearmed.append((room.game_id, timers))) == 1
+
+    assert later['r1'].to_dict(include_answer=True) == game.to_dict(include_answer=True)
+    assert rearmed == [('r1', {'round': pytest.approx(15.0)})]
+
+
+def test_restored_round_timer_is_armed_on_the_room_scheduler(app):
+    from app import RESTORABLE_TIMERS, rearm_room_timers, room_scheduler
+
+    game = TriviaGame('rt1', 'host')
+    rearm_room_timers(game, {'round': 12.0, 'answers:host': 1.0})
+
+    assert room_scheduler.remaining('rt1', 'round') == pytest.approx(12.0, abs=0.5)
+    assert not room_scheduler.is_pending('rt1', 'answers:host')
+    assert set(RESTORABLE_TIMERS) == {'round', 'buzz', 'advance'}
+    room_scheduler.cancel('rt1')
+
+
+def test_sqlite_store_restores_only_accepted_rooms():
+    store, _ = make_sqlite_store()
+    store['mine'] = TriviaGame('mine', 'host')
+    store['theirs'] = TriviaGame('theirs', 'host')
+
+    later = SqliteRoomStore(session_factory=store._session_factory)
+
+    assert later.restore(accept=lambda game_id: game_id == 'mine') == 1
+    assert list(later) == ['mine']
+
+
+def test_drawn_strokes_are_snapshotted_and_restored(app, client, monkeypatch):
+    import app as app_module
+
+    with client.session_transaction() as flask_session:
+        flask_session['player_name'] = 'host'
+    socket_client = app_module.socketio.test_client(app, flask_test_client=client)
+    store, _ = make_sqlite_store()
+    monkeypatch.setattr(app_module, 'game_rooms', store)
+    game = PictionaryGame('pd1', 'host')
+    game.add_player('guest')
+    game.current_player = 'host'
+    store['pd1'] = game
+
+    strokes = [{'points': [[0, 0], [5, 5]], 'color': '#000'}, {'points': [[1, 1]], 'color': '#f00'}]
+    for stroke in strokes:
+        socket_client.emit('draw', {'game_id': 'pd1', 'stroke': stroke})
+    assert store.flush() == 1
+    later = SqliteRoomStore(session_factory=store._session_factory)
+    assert later.restore() == 1
+    assert later['pd1'].canvas_data == strokes
+
+    socket_client.emit('clear_canvas', {'game_id': 'pd1'})
+    assert store.flush() == 1
+    cleared = SqliteRoomStore(session_factory=store._session_factory)
+    cleared.restore()
+    assert cleared['pd1'].canvas_data == []
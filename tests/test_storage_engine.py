@@ -0,0 +1,130 @@
+"""
+Tests for the tuned SQLite storage engine in models/game_items.py.
+"""
+import threading
+
+import pytest
+from sqlalchemy import text
+
+
+def test_write_connections_use_wal_and_busy_timeout(tmp_path):
+    from models.game_items import DB_BUSY_TIMEOUT_MS, create_storage_engine
+
+    engine = create_storage_engine(str(tmp_path / 'tuned.db'), pool_size=2)
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == 'wal'
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == DB_BUSY_TIMEOUT_MS
+    engine.dispose()
+
+
+def test_read_only_connections_reject_writes(tmp_path):
+    from sqlalchemy.exc import OperationalError
+    from models.game_items import create_storage_engine
+
+    path = str(tmp_path / 'tuned.db')
+    writer = create_storage_engine(path, pool_size=2)
+    with writer.begin() as connection:
+        connection.execute(text("CREATE TABLE t (x INTEGER)"))
+        connection.execute(text("INSERT INTO t VALUES (1)"))
+    reader = create_storage_engine(path, read_only=True, pool_size=2)
+
+    with reader.connect() as connection:
+        assert connection.execute(text("SELECT x FROM t")).scalar() == 1
+        with pytest.raises(OperationalError):
+            connection.execute(text("INSERT INTO t VALUES (2)"))
+    reader.dispose()
+    writer.dispose()
+
+
+def test_concurrent_writers_queue_instead_of_failing(tmp_path):
+    from models.game_items import create_storage_engine
+
+    engine = create_storage_engine(str(tmp_path / 'tuned.db'), pool_size=20)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE counter (n INTEGER)"))
+        connection.execute(text("INSERT INTO counter VALUES (0)"))
+    errors = []
+
+    def increment():
+        for _ in range(20):
+            try:
+                with engine.begin() as connection:
+                    n = connection.execute(text("SELECT n FROM counter")).scalar()
+                    connection.execute(text("UPDATE counter SET n = :n"), {'n': n + 1})
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=increment) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT n FROM counter")).scalar() == 400
+    engine.dispose()
+
+
+def test_read_sessions_follow_the_write_database(data_manager):
+    import models.game_items as game_items
+
+    data_manager.add_items('pictionary', 'عام', [{'word': 'أسد', 'category': 'عام'}], source='test')
+    session = game_items.get_read_session()
+    try:
+        assert session.get_bind().url.database.endswith('items.db')
+    finally:
+        session.close()
+
+
+def test_reads_do_not_wait_for_an_open_write(tmp_path):
+    from models.game_items import create_storage_engine
+
+    engine = create_storage_engine(str(tmp_path / 'tuned.db'), pool_size=4)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE t (x INTEGER)"))
+        connection.execute(text("INSERT INTO t VALUES (1)"))
+
+    with engine.begin() as writer:
+        writer.execute(text("INSERT INTO t VALUES (2)"))
+        # A write transaction is open, yet a deferred read starts straight away and sees the last commit
+        with engine.execution_options(deferred_begin=True).begin() as reader:
+            assert reader.execute(text("SELECT COUNT(*) FROM t")).scalar() == 1
+    engine.dispose()
+
+
+def test_nested_write_transaction_fails_fast(tmp_path):
+    from models.game_items import create_storage_engine
+
+    engine = create_storage_engine(str(tmp_path / 'tuned.db'), pool_size=4)
+    with engine.begin():
+        with pytest.raises(RuntimeError):
+            with engine.begin():
+                pass
+    # The outer transaction's lock is released; writes go on
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE t (x INTEGER)"))
+    engine.dispose()
+
+
+def test_write_lock_timeout_raises(tmp_path, monkeypatch):
+    import models.game_items as game_items
+
+    monkeypatch.setattr(game_items, 'DB_BUSY_TIMEOUT_MS', 50)
+    engine = game_items.create_storage_engine(str(tmp_path / 'tuned.db'), pool_size=4)
+    errors = []
+
+    def write():
+        try:
+            with engine.begin():
+                pass
+        except Exception as e:
+            errors.append(e)
+
+    with engine.begin():
+        thread = threading.Thread(target=write)
+        thread.start()
+        thread.join()
+    assert len(errors) == 1 and isinstance(errors[0], TimeoutError)
+    engine.dispose()
@@ -0,0 +1,92 @@
+"""
+Tests for batched, streamed question translation and the translation memory.
+"""
+import time
+
+from services.fetchers.translation import BatchTranslator, GroqTranslator, TranslationMemory, parse_lines, source_hash
+
+
+def questions(count, offset=0):
+    return [{'question': f'Question {i}?', 'correct_answer': 'Yes', 'wrong_answers': ['No', 'Maybe']}
+            for i in range(offset, offset + count)]
+
+
+class FakeTranslator:
+    def __init__(self, fail_after=None, short_at=None):
+        self.batches = []
+        self.fail_after = fail_after
+        self.short_at = short_at
+
+    def __call__(self, batch):
+        self.batches.append(len(batch))
+        for position, question in enumerate(batch):
+            if position == self.fail_after:
+                raise ConnectionError('stream cut')
+            wrong_answers = ['لا'] if position == self.short_at else ['لا', 'ربما']
+            yield {'id': position, 'question': f"ترجمة {question['question']}", 'correct_answer': 'نعم',
+                   'wrong_answers': wrong_answers}
+
+
+def test_questions_are_packed_into_batches(data_manager):
+    translator = FakeTranslator()
+    batch_translator = BatchTranslator(translator, TranslationMemory(), batch_size=2)
+
+    translated = dict(batch_translator.translate(questions(5)))
+
+    assert translator.batches == [2, 2, 1]
+    assert translated[4]['question'] == 'ترجمة Question 4?'
+    assert batch_translator.stats()['translated'] == 5
+
+
+def test_no_question_is_translated_twice(data_manager):
+    translator = FakeTranslator()
+    list(BatchTranslator(translator, TranslationMemory()).translate(questions(3)))
+
+    # A fresh memory (as after a restart) reads the table
+    later = BatchTranslator(translator, TranslationMemory())
+    translated = list(later.translate(questions(2, offset=2) + questions(2, offset=3)))
+
+    assert translator.batches == [3, 2]  # questions 3 and 4; question 3 is asked for twice but sent once
+    assert sorted(index for index, _ in translated) == [0, 1, 2, 3]
+    assert later.stats()['memory_hits'] == 1
+
+
+def test_a_cut_stream_keeps_what_already_parsed(data_manager):
+    translator = FakeTranslator(fail_after=2)
+    batch_translator = BatchTranslator(translator, TranslationMemory())
+
+    assert [index for index, _ in batch_translator.translate(questions(4))] == [0, 1]
+    assert batch_translator.stats()['failures'] == 1
+    assert len(TranslationMemory().get_many(source_hash(question) for question in questions(4))) == 2
+
+
+def test_translation_missing_a_wrong_answer_is_rejected(data_manager):
+    batch_translator = BatchTranslator(FakeTranslator(short_at=1), TranslationMemory())
+
+    assert [index for index, _ in batch_translator.translate(questions(3))] == [0, 2]
+    assert batch_translator.stats()['rejected'] == 1
+    remembered = TranslationMemory().get_many(source_hash(question) for question in questions(3))
+    assert source_hash(questions(3)[1]) not in remembered
+    assert len(remembered) == 2
+
+
+def test_stream_parser_skips_fences_and_joins_split_lines():
+    chunks = ['```json\n{"id": 0, "question": "س', 'ؤال"}\n', 'not json\n{"id": 1', ', "question": "ب"}']
+
+    assert list(parse_lines(chunks)) == [{'id': 0, 'question': 'سؤال'}, {'id': 1, 'question': 'ب'}]
+
+
+def test_translations_stream_from_the_groq_endpoint(data_manager):
+    from tests.trivia_stub import TriviaStubServer
+
+    with TriviaStubServer(item_latency=0.15) as groq:
+        translator = GroqTranslator(api_key='test', base_url=groq.url)
+        translator._get_client()
+        started = time.monotonic()
+        arrivals = []
+        for index, translation in BatchTranslator(translator, TranslationMemory()).translate(questions(5)):
+            arrivals.append((index, time.monotonic() - started))
+
+    assert groq.translation_batches == [5]
+    assert [index for index, _ in arrivals] == [0, 1, 2, 3, 4]
+    assert arrivals[0][1] < arrivals[-1][1] - 0.3  # the first arrived well before the batch finished
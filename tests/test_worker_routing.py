@@ -0,0 +1,212 @@
+"""
+Tests for room affinity, the local message bus and cross-worker forwarding.
+"""
+import threading
+
+import pytest
+
+from services.worker_routing import (
+    LocalMessageBus, LocalPubSubManager, RoomAffinity, RoomEventForwarder, create_message_bus, local_bus,
+)
+
+
+def test_affinity_is_deterministic_and_spreads_rooms():
+    workers = [RoomAffinity(worker_id, 4) for worker_id in range(4)]
+    rooms = [str(room) for room in range(400)]
+
+    owners = {room: workers[0].owner_of(room) for room in rooms}
+
+    assert all(worker.owner_of(room) == owners[room] for worker in workers for room in rooms)
+    assert all(sum(worker.is_local(room) for worker in workers) == 1 for room in rooms)
+    assert all(list(owners.values()).count(worker_id) > 50 for worker_id in range(4))
+
+
+def test_growing_the_pool_only_moves_rooms_to_the_new_worker():
+    before, after = RoomAffinity(0, 3), RoomAffinity(0, 4)
+
+    moved = [room for room in map(str, range(300)) if before.owner_of(room) != after.owner_of(room)]
+
+    assert moved and all(after.owner_of(room) == 3 for room in moved)
+
+
+def test_single_worker_owns_everything_and_assign_pins():
+    affinity = RoomAffinity()
+    assert affinity.is_local('anything')
+
+    pool = RoomAffinity(1, 2)
+    pool.assign('r1', 1)
+    assert pool.is_local('r1')
+
+
+def test_local_bus_delivers_to_every_listener():
+    bus = LocalMessageBus()
+    first, second = bus.listen('c'), bus.listen('c')
+
+    bus.publish('c', {'n': 1})
+
+    assert next(first) == {'n': 1}
+    assert next(second) == {'n': 1}
+
+
+def test_local_pubsub_manager_shares_emits():
+    bus = LocalMessageBus()
+    sender, receiver = LocalPubSubManager(bus=bus), LocalPubSubManager(bus=bus)
+
+    sender._publish({'method': 'emit', 'event': 'game_state'})
+
+    assert next(receiver._listen()) == {'method': 'emit', 'event': 'game_state'}
+
+
+def start_workers(bus, handled):
+    forwarders = [RoomEventForwarder(RoomAffinity(worker_id, 2), bus) for worker_id in range(2)]
+    for worker_id, forwarder in enumerate(forwarders):
+        threading.Thread(
+            target=forwarder.serve,
+            args=(
+                lambda message, worker_id=worker_id: handled.append((worker_id, message)),
+                lambda message: handled.append(('session', message)),
+                {'room_summary': lambda game_id, worker_id=worker_id: {'owner': worker_id, 'game_id': game_id}},
+            ),
+            daemon=True,
+        ).start()
+    return forwarders
+
+
+def remote_room(forwarder):
+    return next(room for room in map(str, range(100)) if not forwarder.affinity.is_local(room))
+
+
+def test_query_is_answered_by_the_owner():
+    forwarders = start_workers(LocalMessageBus(), [])
+    room = remote_room(forwarders[0])
+
+    assert forwarders[0].query(room, 'room_summary') == {'owner': 1, 'game_id': room}
+    assert forwarders[0].query(room, 'unknown', timeout=0.5) is None
+
+
+def test_unanswered_query_times_out_and_its_late_answer_is_dropped():
+    bus = LocalMessageBus()
+    owner_inbox = bus.listen('family-games-rooms')
+    forwarder = RoomEventForwarder(RoomAffinity(0, 2), bus)
+    caught_up = threading.Event()
+    threading.Thread(target=forwarder.serve, args=(lambda message: None, lambda message: caught_up.set(), {}),
+                     daemon=True).start()
+    room = remote_room(forwarder)
+
+    # Nobody serves worker 1, so the query gives up
+    assert forwarder.query(room, 'room_summary', timeout=0.1) is None
+    query = next(message for message in owner_inbox if message['kind'] == 'query')
+    # The owner answers anyway, too late; messages are handled in order
+    bus.publish('family-games-rooms', {'kind': 'answer', 'worker': 0, 'id': query['id'], 'result': {'late': True}})
+    forwarder.send_session(0, 'sid-1', '/', {})
+    assert caught_up.wait(2)
+
+    assert forwarder.stats() == {'forwarded_events': 0, 'queries': 1, 'query_timeouts': 1, 'late_answers': 1}
+
+
+def test_forwarded_event_runs_on_owner_and_session_returns():
+    bus = LocalMessageBus()
+    handled = []
+    forwarders = start_workers(bus, handled)
+    room = remote_room(forwarders[0])
+
+    forwarders[0].forward_event(room, 'submit_answer', [{'game_id': room}], 'sid-1', '/', {'player_name': 'a'})
+    forwarders[1].send_session(0, 'sid-1', '/', {'player_name': 'a', 'game_id': room})
+    forwarders[0].query(room, 'room_summary')  # messages are ordered: answered once the above are handled
+
+    worker_id, event = next(item for item in handled if item[0] != 'session')
+    assert worker_id == 1
+    assert event['handler'] == 'submit_answer'
+    assert event['origin'] == 0
+    assert event['session'] == {'player_name': 'a'}
+    assert ('session', {'kind': 'session', 'worker': 0, 'sid': 'sid-1', 'namespace': '/',
+                        'session': {'player_name': 'a', 'game_id': room}}) in handled
+
+
+
+class TestSocketForwarding:
+    """The app as worker 0 of 2 on a local bus; a peer forwarder stands in for worker 1."""
+
+    def _wire(self, app, monkeypatch):
+        import app as app_module
+
+        bus = LocalMessageBus()
+        # The test client refuses a message queue, so connect first, then move
+        # the connection state onto a pub/sub manager as a worker would run
+        client = app_module.socketio.test_client(app)
+        server = app_module.socketio.server
+        manager = LocalPubSubManager(bus=bus)
+        manager.set_server(server)
+        for state in ('rooms', 'eio_to_sid', 'callbacks', 'pending_disconnect'):
+            setattr(manager, state, getattr(server.manager, state))
+        manager.initialize()
+        monkeypatch.setattr(server, 'manager', manager)
+        local = RoomEventForwarder(RoomAffinity(0, 2), bus)
+        peer = RoomEventForwarder(RoomAffinity(1, 2), bus)
+        monkeypatch.setattr(app_module, 'room_affinity', local.affinity)
+        monkeypatch.setattr(app_module, 'room_forwarder', local)
+        received = {'event': [], 'session': []}
+        arrived = threading.Event()
+
+        def record(kind):
+            def handle(message):
+                received[kind].append(message)
+                arrived.set()
+            return handle
+
+        threading.Thread(target=local.serve, args=(
+            app_module.run_forwarded_event, app_module.apply_forwarded_session,
+            {'room_summary': app_module.get_room_summary},
+        ), daemon=True).start()
+        threading.Thread(target=peer.serve, args=(record('event'), record('session'), {}), daemon=True).start()
+        return bus, local, peer, received, arrived, client
+
+    def test_event_for_a_remote_room_goes_to_its_owner(self, app, game_rooms, monkeypatch):
+        from app import socketio
+
+        _, local, _, received, arrived, client = self._wire(app, monkeypatch)
+        room = remote_room(local)
+
+        client.emit('join_game', {'game_id': room, 'player_name': 'guest'})
+        assert arrived.wait(2)
+
+        event = received['event'][0]
+        assert event['handler'] == 'handle_join_game'
+        assert event['args'] == [{'game_id': room, 'player_name': 'guest'}]
+        assert event['origin'] == 0
+        assert event['sid'] == socketio.server.manager.sid_from_eio_sid(client.eio_sid, '/')
+        assert room not in game_rooms
+
+    def test_forwarded_event_runs_on_the_owner_and_sends_the_session_back(self, app, game_rooms, monkeypatch):
+        from games.rapid_fire.models import RapidFireGame
+
+        bus, local, peer, received, arrived, client = self._wire(app, monkeypatch)
+        room = next(room for room in map(str, range(100)) if local.affinity.is_local(room))
+        game_rooms[room] = RapidFireGame(room, 'host')
+        client.emit('verify_game', {'game_id': room, 'player_name': 'host'})
+        client.get_received()
+        socketio_messages = bus.listen('socketio')
+
+        # A player connected to worker 1 joins the room this worker owns
+        peer.forward_event(room, 'handle_join_game', [{'game_id': room, 'player_name': 'guest'}],
+                           'remote-sid', '/', {})
+        assert arrived.wait(2)
+
+        assert [player['name'] for player in game_rooms[room].players] == ['host', 'guest']
+        joined = [r['args'][0] for r in client.get_received() if r['name'] == 'player_joined']
+        assert [player['name'] for player in joined[0]['players']] == ['host', 'guest']
+        # The remote connection is put in the room by the worker that holds it
+        bus.publish('socketio', {'method': 'end'})
+        published = list(iter(lambda: next(socketio_messages), {'method': 'end'}))
+        assert {'method': 'enter_room', 'sid': 'remote-sid', 'room': room} in [
+            {key: message.get(key) for key in ('method', 'sid', 'room')} for message in published
+        ]
+        session = received['session'][0]
+        assert (session['worker'], session['sid']) == (1, 'remote-sid')
+        assert session['session']['player_name'] == 'guest'
+
+
+def test_message_bus_is_chosen_by_url_scheme():
+    assert create_message_bus('local://') is local_bus
+    with pytest.raises(ValueError):
+        create_message_bus('zmq+tcp://localhost:5555')
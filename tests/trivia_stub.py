@@ -0,0 +1,126 @@
+"""
+Local stand-in for the trivia sources TriviaFetcher talks to.
+
+Serves the Islamic Quiz ``questions_ar.json`` list and the OpenTDB
+``api.php`` endpoint, each after ``latency`` seconds. GET responses carry
+an ETag and a matching ``If-None-Match`` gets a 304. Run one instance per
+host being stood in for, since the fetchers rate-limit per host:
+
+    fetcher.islamic_quiz_url = islamic.url
+    fetcher.opentdb_url = f'{opentdb.url}/api.php'
+
+It also stands in for the Groq chat endpoint used for translation: every
+JSON line of the prompt comes back "translated" (prefixed with ترجمة),
+streamed one line per ``item_latency`` seconds when the request streams.
+Point ``GroqTranslator`` at it with ``base_url=stub.url``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 64
+    daemon_threads = True
+
+
+class TriviaStubServer:
+    def __init__(self, latency: float = 0.0, item_latency: float = 0.0) -> None:
+        self.latency = latency
+        self.item_latency = item_latency
+        self.requests: list[str] = []
+        self.translation_batches: list[int] = []
+        self.not_modified = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, body, etag: bool = False) -> None:
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                tag = f'"{hashlib.sha256(payload).hexdigest()[:16]}"'
+                if etag and self.headers.get('If-None-Match') == tag:
+                    stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', tag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                if etag:
+                    self.send_header('ETag', tag)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                stub.requests.append(url.path)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if url.path.endswith('/questions_ar.json'):
+                    self._reply([
+                        {'question': f'سؤال إسلامي {i}', 'correct_answer': 'نعم', 'wrong_answers': ['لا', 'ربما', 'أبدا']}
+                        for i in range(50)
+                    ], etag=True)
+                elif url.path.endswith('/api.php'):
+                    amount = int(parse_qs(url.query).get('amount', ['10'])[0])
+                    self._reply({'response_code': 0, 'results': [
+                        {'question': f'Question {i}?', 'correct_answer': 'Yes', 'incorrect_answers': ['No', 'Maybe', 'Never'],
+                         'difficulty': 'easy'}
+                        for i in range(amount)
+                    ]}, etag=True)
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                stub.requests.append(urlsplit(self.path).path)
+                sources = [json.loads(line) for line in body['messages'][-1]['content'].splitlines()
+                           if line.startswith('{')]
+                stub.translation_batches.append(len(sources))
+                lines = [json.dumps({
+                    'id': source['id'],
+                    'question': f"ترجمة {source['question']}",
+                    'correct_answer': f"ترجمة {source['correct_answer']}",
+                    'wrong_answers': [f'ترجمة {answer}' for answer in source['wrong_answers']],
+                }, ensure_ascii=False) + '\n' for source in sources]
+                if stub.latency:
+                    time.sleep(stub.latency)
+                completion = {'id': 'stub', 'created': int(time.time()), 'model': body['model']}
+                if not body.get('stream'):
+                    time.sleep(stub.item_latency * len(lines))
+                    self._reply({**completion, 'object': 'chat.completion', 'choices': [{
+                        'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': ''.join(lines)},
+                    }]})
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.end_headers()
+                for line in lines:
+                    time.sleep(stub.item_latency)
+                    # Split each line across two chunks, as tokens would be
+                    for piece in (line[:len(line) // 2], line[len(line) // 2:]):
+                        chunk = {**completion, 'object': 'chat.completion.chunk', 'choices': [{
+                            'index': 0, 'finish_reason': None, 'delta': {'content': piece},
+                        }]}
+                        self.wfile.write(f'data: {json.dumps(chunk, ensure_ascii=False)}\n\n'.encode('utf-8'))
+                        self.wfile.flush()
+                self.wfile.write(b'data: [DONE]\n\n')
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _Server(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def __enter__(self) -> 'TriviaStubServer':
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()